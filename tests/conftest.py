@@ -0,0 +1,31 @@
+"""
+Shared setup for the v007b tests.
+
+v007b modules import each other by flat name ("from parser import ..."),
+so v007b goes first on sys.path, and the repo's clue file is used (config
+reads CLUES_FILE on first access). Guarded parses write to a quarantine
+file: tests that make them use the `quarantine` fixture so nothing lands
+in v007b/output.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+V007B = PROJECT_ROOT / "v007b"
+SAMPLE_MEDIA = PROJECT_ROOT / "sample_media"
+
+sys.path.insert(0, str(V007B))
+os.environ["CLUES_FILE"] = str(PROJECT_ROOT / "data" / "clues.json")
+
+
+@pytest.fixture
+def quarantine(tmp_path, monkeypatch):
+    """config.PARSE_QUARANTINE_FILE, pointed into tmp_path for the test."""
+    import config
+    path = tmp_path / "quarantine.jsonl"
+    monkeypatch.setattr(config, "PARSE_QUARANTINE_FILE", path, raising=False)
+    return path
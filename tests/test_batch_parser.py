@@ -0,0 +1,45 @@
+"""
+batch_parser.parse_siblings must return exactly what parse_filename returns per name.
+
+Run with: pytest -q tests/test_batch_parser.py
+"""
+
+import json
+import os
+from pathlib import Path
+
+from batch_parser import parse_siblings
+from parser import parse_filename
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _season_pack(title, seasons, episodes, tail):
+    return [f"{title}.S{s:02d}E{e:02d}.{tail}.mkv" for s in seasons for e in episodes]
+
+
+def _listings():
+    sample = PROJECT_ROOT / "sample_media"
+    listings = [sorted(os.listdir(sample))]
+    listings += [sorted(os.listdir(p)) for p in sample.rglob("*") if p.is_dir()]
+    listings.append(_season_pack("Attack.on.Titan", (1, 2), range(1, 26), "1080p.BluRay.x264-HORRIBLESUBS"))
+    listings.append(_season_pack("Show.2019", (1,), range(8, 12), "720p.WEB-DL.AAC2.0-GRP"))
+    listings.append([f"[SubsPlease] Frieren - {n:02d} (1080p) [ABCD{n:04d}].mkv" for n in range(1, 30)])
+    listings.append([f"Movie.{y}.1080p.BluRay.x264-GRP.mkv" for y in range(1995, 2005)])
+    # changed digits inside possible_title
+    listings.append([f"Show E{n:02d} www.tamilblasters.com 1080p.mkv" for n in (1, 2)])
+    # an extension with clues is merged back into the name: "EP02" occurs twice there
+    listings.append(["BluRay.ep02.world.-.(001-500).dts.ep02", "BluRay.ep46.world.-.(001-801).dts.ep02"])
+    return listings
+
+
+def test_parse_siblings_matches_parse_filename():
+    stats, mismatches = {}, []
+    for names in _listings():
+        for name, got in zip(names, parse_siblings(names, stats=stats)):
+            # compared serialized: key order is part of the output (JSON reports)
+            if json.dumps(got) != json.dumps(parse_filename(name, quiet=True)):
+                mismatches.append(name)
+    assert mismatches == []
+    # most of the 50-episode season pack is derived, not fully parsed
+    assert stats["derived"] >= 45
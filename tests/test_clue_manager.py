@@ -0,0 +1,55 @@
+"""
+UnknownStore keeps cumulative unknown-token counts in sqlite; ClueManager
+opens it only on first use and closes it with close() or a with block.
+
+Run with: pytest -q tests/test_clue_manager.py
+"""
+
+import json
+from collections import Counter
+
+from clue_manager import ClueManager
+from unknown_store import UnknownStore
+
+
+def test_store_counts_are_cumulative(tmp_path):
+    store = UnknownStore(tmp_path / "lib.sqlite")
+    store.add(Counter({"GRP": 2, "XYZ": 1, "NONE": 0}))
+    store.add(Counter({"XYZ": 3}))
+    assert len(store) == 2 and "NONE" not in store
+    assert store.top_k(1) == [("XYZ", 4)]
+    assert store.get("GRP")[0] == 2
+    store.remove(["XYZ"])
+    assert sorted(store) == [("GRP", 2)]
+    store.close()
+    reopened = UnknownStore(tmp_path / "lib.sqlite")
+    assert reopened.top_k() == [("GRP", 2)]
+    reopened.close()
+
+
+def test_manager_opens_the_store_on_first_use(tmp_path):
+    db = tmp_path / "lib.sqlite"
+    cm = ClueManager(unknown_file=tmp_path / "unknown_clues.json", db_path=db)
+    cm.collect_from_parsed({"/a": {"words": ["ZZTOKEN", "ZZTOKEN", "1080p"]}, "/b": {"words": ["ZZTOKEN"]}})
+    assert cm.unknown == Counter({"ZZTOKEN": 3})  # "1080p" is a known clue
+    assert cm._store is None and not db.exists()
+    cm.close()  # nothing opened, nothing to close
+
+    with cm:
+        assert cm.top_k() == [("ZZTOKEN", 3)]  # unsaved counts only
+        cm.save_unknowns()
+        assert cm._store is not None and not cm.unknown
+    assert cm._store is None
+    with cm:  # a closed manager reopens the store
+        cm.collect_from_parsed({"/c": {"words": ["ZZTOKEN"]}})
+        assert cm.top_k() == [("ZZTOKEN", 4)]
+    assert cm.unknown == Counter({"ZZTOKEN": 1})  # closing doesn't drop unsaved counts
+
+
+def test_legacy_unknown_file_is_imported_into_an_empty_store(tmp_path):
+    legacy = tmp_path / "unknown_clues.json"
+    legacy.write_text(json.dumps(["OLDTOKEN", "OTHER", 3]), encoding="utf-8")
+    with ClueManager(unknown_file=legacy, db_path=tmp_path / "lib.sqlite") as cm:
+        assert sorted(cm.store) == [("OLDTOKEN", 1), ("OTHER", 1)]
+    with ClueManager(unknown_file=legacy, db_path=tmp_path / "lib.sqlite") as cm:
+        assert len(cm.store) == 2  # not imported twice
@@ -0,0 +1,55 @@
+"""
+ClueSuggester proposes categories for unknown tokens from where they sit in
+the names (last after a hyphen, bracketed prefix, ...), and keeps a bounded
+candidate table.
+
+Run with: pytest -q tests/test_clue_suggester.py
+"""
+
+import math
+
+import pytest
+
+from clue_suggester import ClueSuggester, Suggestion
+from parser import parse_filename
+
+NAMES = ([f"Show.{i}.S01E0{i}.1080p.WEB-DL.x264-ZORGRP.mkv" for i in range(1, 6)]
+         + [f"Movie{i}.2010.720p.BluRay.x264-RARBG.mkv" for i in range(3)]
+         + [f"[Quuxsubs] Anime {i} - 0{i} [1080p].mkv" for i in range(1, 5)]
+         + ["Other.2011.1080p.ONCE.x264.mkv"])
+
+
+def _results(names=NAMES):
+    return [parse_filename(n, quiet=True) for n in names]
+
+
+def test_suggests_categories_from_position():
+    suggester = ClueSuggester().feed(_results())
+    assert suggester.results == len(NAMES)
+    # known (RARBG), title and clue tokens are not candidates
+    assert sorted(suggester.tokens) == ["ONCE", "Quuxsubs", "ZORGRP"]
+    suggestions = suggester.suggest(min_confidence=0.6)
+    assert [(s.token, s.category, s.count) for s in suggestions] == [
+        ("ZORGRP", "release_groups", 5), ("Quuxsubs", "release_groups_anime", 4)]
+    assert all(isinstance(s, Suggestion) and 0.6 <= s.confidence <= 1 for s in suggestions)
+    # seen once: below min_count
+    assert "ONCE" not in [s.token for s in suggester.suggest(min_confidence=0)]
+    assert suggester.suggest(min_confidence=0.6, limit=1) == suggestions[:1]
+
+
+def test_candidate_table_is_bounded():
+    names = ["Movie.2010.x264-KEEPME.mkv"] * 20 + [f"Movie.2010.1080p.x264-GRPX{i % 40:02d}.mkv" for i in range(200)]
+    suggester = ClueSuggester(max_tokens=16).feed(_results(names))
+    assert len(suggester.tokens) <= 16
+    assert suggester.tokens["KEEPME"]["#"] == 20  # pruning keeps the frequent tokens
+
+
+def test_occurrence_count_is_not_a_feature():
+    suggester = ClueSuggester().feed(_results())
+    tables = suggester._log_likelihoods()
+    assert all("#" not in table for table in tables.values())
+    # smoothing spreads over the real features only: every table is a distribution over them
+    features = set().union(*suggester.tokens.values(), *suggester.profiles.values()) - {"#"}
+    for cat, table in tables.items():
+        assert set(table) >= features
+        assert sum(math.exp(v) for v in table.values()) == pytest.approx(1.0), cat
@@ -0,0 +1,61 @@
+"""
+Disk usage measured during a scan must match the bytes on disk: subtrees
+are summed whether or not the scan descends into them, symlinks don't
+hide the real size, and nested paths of a group aren't counted twice.
+
+Run with: pytest -q tests/test_disk_usage.py
+"""
+
+import os
+
+import pytest
+
+from dir_processor import parse_directory
+from disk_usage import group_bytes, tree_bytes
+
+
+@pytest.fixture
+def library(tmp_path):
+    show = tmp_path / "Show.S01.1080p"
+    (show / "Subs").mkdir(parents=True)
+    (show / "Show.S01E01.mkv").write_bytes(b"x" * 100)
+    (show / "Show.S01E02.mkv").write_bytes(b"x" * 200)
+    (show / "Subs" / "eng.srt").write_bytes(b"x" * 10)
+    (tmp_path / "Movie.2010.1080p.mkv").write_bytes(b"x" * 1000)
+    try:
+        os.symlink("Movie.2010.1080p.mkv", tmp_path / "Movie.2010.1080p.link.mkv")
+    except OSError:
+        pass  # no symlinks here (Windows without privileges)
+    return tmp_path
+
+
+def _sizes(root, **kwargs):
+    result = parse_directory(str(root), quiet=True, sizes=True, **kwargs)
+    sizes = {os.path.relpath(p, root): n for p, n in result["sizes"].items()}
+    groups = {key[0]: n for key, n in group_bytes(result["grouped"], result["sizes"]).items()}
+    return sizes, groups
+
+
+def test_folder_sizes(library):
+    assert tree_bytes(str(library)) == 1310
+    # not descended into: measured when the root is listed
+    assert _sizes(library, mode="dirs") == ({"Show.S01.1080p": 310}, {"Show": 310})
+    assert _sizes(library, mode="dirs", recursive=True)[0] == {"Show.S01.1080p": 310,
+                                                               os.path.join("Show.S01.1080p", "Subs"): 10}
+
+
+def test_file_sizes(library):
+    sizes, groups = _sizes(library, mode="files", recursive=True)
+    # the symlink resolves to the movie and doesn't replace its size with 0
+    assert sizes == {"Movie.2010.1080p.mkv": 1000,
+                     os.path.join("Show.S01.1080p", "Show.S01E01.mkv"): 100,
+                     os.path.join("Show.S01.1080p", "Show.S01E02.mkv"): 200,
+                     os.path.join("Show.S01.1080p", "Subs", "eng.srt"): 10}
+    assert groups == {"Movie": 1000, "Show": 300, "eng": 10}
+
+
+def test_nested_paths_of_a_group_count_once():
+    grouped = {("Show", "tv", None): {"paths": ["/tv/Show", "/tv/Show/Season 01", "/tv/Show 2"]},
+               ("Other", "tv", None): {"paths": ["/tv/Other", "/tv/missing"]}}
+    sizes = {"/tv/Show": 500, "/tv/Show/Season 01": 300, "/tv/Show 2": 50, "/tv/Other": 7}
+    assert group_bytes(grouped, sizes) == {("Show", "tv", None): 550, ("Other", "tv", None): 7}
@@ -0,0 +1,55 @@
+"""
+merge_near_duplicates must merge near-duplicate titles, and merge the same
+ones in every run: LSH bucketing must not depend on PYTHONHASHSEED.
+
+Runs in fresh interpreters inside v007b (flat imports), one per hash seed.
+
+Run with: pytest -q tests/test_fuzzy_grouping.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+V007B = PROJECT_ROOT / "v007b"
+
+MERGE = r"""
+import json, random
+from fuzzy_grouping import merge_near_duplicates
+
+rnd = random.Random(7)
+letters = "abcdefghijklmnopqrstuvwxyz"
+titles = ["The Lord of the Rings The Fellowship of the Ring", "The.Lord.of.the.Rings.The.Fellowship.of.the.Ring",
+          "The Lord of the Rings The Fellowship of the Rings", "The Mandalorian"]
+for _ in range(300):
+    base = " ".join("".join(rnd.choice(letters) for _ in range(rnd.randint(3, 8))) for _ in range(rnd.randint(2, 4)))
+    titles.append(base)
+    for _ in range(2):  # variants from near-identical to borderline
+        chars = list(base)
+        for _ in range(rnd.randint(1, 4)):
+            chars[rnd.randrange(len(chars))] = rnd.choice(letters)
+        titles.append("".join(chars))
+grouped = {(t, "tv", None): {"paths": [f"/tv/{i}"]} for i, t in enumerate(dict.fromkeys(titles))}
+merged = merge_near_duplicates(grouped)
+print(json.dumps(sorted([key[0], sorted(info.get("aliases", []))] for key, info in merged.items())))
+"""
+
+
+def _merge(seed):
+    env = dict(os.environ, PYTHONHASHSEED=str(seed))
+    proc = subprocess.run([sys.executable, "-c", MERGE], cwd=str(V007B), env=env,
+                          capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout)
+
+
+def test_merges_are_independent_of_the_hash_seed():
+    first = _merge(1)
+    assert _merge(2) == first
+    merged = dict(first)
+    lotr = "The Lord of the Rings The Fellowship of the Ring"
+    assert sorted(merged[lotr]) == [lotr + "s", "The.Lord.of.the.Rings.The.Fellowship.of.the.Ring"]
+    assert merged["The Mandalorian"] == []
+    assert len(first) < 904  # some generated variants were merged as well
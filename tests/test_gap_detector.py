@@ -0,0 +1,74 @@
+"""
+find_gaps must report the missing episodes and seasons of a show, and
+nothing for samples, subtitles, extras or absolute numbering inside a
+season tag.
+
+Run with: pytest -q tests/test_gap_detector.py
+"""
+
+from episode_index import build_episode_index, is_auxiliary
+from gap_detector import Gap, detect_gaps, find_gaps
+
+KEY = ("Show", "tv", None)
+
+
+def _shows(clues_by_path, media_type="tv", key=KEY):
+    """build_episode_index() of one group whose paths carry the given tv clues."""
+    raw = {path: {"tv_clues": clues, "anime_clues": [], "original": path.rsplit("/", 1)[-1]}
+           for path, clues in clues_by_path.items()}
+    return build_episode_index({"raw": raw, "grouped": {key: {"media_type": media_type, "paths": list(raw)}}})
+
+
+def _gaps(clues_by_path):
+    return find_gaps(_shows(clues_by_path)[KEY])
+
+
+def test_missing_episodes_and_seasons():
+    assert _gaps({
+        "/tv/Show.S01E01.mkv": ["S01E01"],
+        "/tv/Show.S01E02.mkv": ["S01E02"],
+        "/tv/Show.S01E05.mkv": ["S01E05"],
+        "/tv/Show.S03E02.mkv": ["S03E02"],
+    }) == [Gap(1, 3, 4), Gap(2, None, None), Gap(3, 1, 1)]
+
+
+def test_season_pack_is_complete():
+    assert _gaps({"/tv/Show.S01.1080p": ["S01"], "/tv/Show.S01E04.mkv": ["S01E04"]}) == []
+
+
+def test_absolute_ranges():
+    assert _gaps({"/tv/Show - 01.mkv": ["EP01"], "/tv/Show - 04.mkv": ["EP04"]}) == [Gap(None, 2, 3)]
+    # a run far beyond the previous one is not preceded by a gap
+    assert _gaps({"/tv/Show (001-500)": ["001-500"], "/tv/Show - 1050.mkv": ["EP1050"]}) == []
+
+
+def test_far_episode_in_a_season_is_absolute_numbering():
+    shows = _shows({
+        "/tv/One Piece/Season 01/One.Piece.S01E01.mkv": ["S01E01"],
+        "/tv/One Piece/Season 01/One.Piece.S01E02.mkv": ["S01E02"],
+        "/tv/One.Piece.S01E1116.Title.2160p.mkv": ["S01E1116"],
+    })
+    index = shows[KEY]
+    assert find_gaps(index) == []
+    assert index.to_dict() == {"absolute": {"episodes": [[1116, 1116]], "pack": False},
+                               "S01": {"episodes": [[1, 2]], "pack": False}}
+    assert index.paths[(None, 1116)] == ["/tv/One.Piece.S01E1116.Title.2160p.mkv"]
+
+
+def test_samples_subtitles_and_extras_are_not_episodes():
+    assert _gaps({
+        "/tv/Show.S01E01.mkv": ["S01E01"],
+        "/tv/Show.S01E02.mkv": ["S01E02"],
+        "/tv/Show.S01E09.mkv/Show.S01E09.mkv.sample": ["S01E09"],
+        "/tv/Show.S01E07.Sample.mkv": ["S01E07"],
+        "/tv/Show.S01E06.eng.srt": ["S01E06"],
+        "/tv/Show/Extras/Show.S01E05.Making.Of.mkv": ["S01E05"],
+    }) == []
+    assert not is_auxiliary("/tv/Extras.S01E01.720p.mkv")  # the show, not an extras folder
+    assert is_auxiliary("D:\\TV\\Show\\Featurettes\\Show.S01E01.mkv")
+
+
+def test_untitled_groups_are_not_shows():
+    shows = _shows({"/tv/Season 01": ["SEASON 01"], "/tv/Season 04": ["SEASON 04"]}, key=(None, "tv", None))
+    assert shows == {}
+    assert detect_gaps(shows) == {}
@@ -0,0 +1,66 @@
+"""
+Import-time budget and side-effect checks for v007b.
+
+Import cost is measured with `python -X importtime` in a fresh interpreter
+(best of a few runs to damp noise); override the budgets with
+IMPORT_BUDGET_MS / PACKAGE_IMPORT_BUDGET_MS on slow machines.
+
+Run with: pytest -q tests/test_import_time.py
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+V007B = PROJECT_ROOT / "v007b"
+
+MODULES = ("config", "parser", "dir_processor", "clue_manager")
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "120"))
+PACKAGE_IMPORT_BUDGET_MS = float(os.getenv("PACKAGE_IMPORT_BUDGET_MS", "25"))
+
+
+def _cumulative_ms(stmt: str, cwd: Path, names, env=None, runs: int = 3) -> float:
+    """Best-of-`runs` sum of the cumulative import time of the top-level `names`."""
+    best = None
+    for _ in range(runs):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", stmt],
+                              cwd=str(cwd), env=env, capture_output=True, text=True, check=True)
+        total_us = 0
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _self, cumulative, name = line[len("import time:"):].split("|")
+            # nested imports are indented; only count the modules we asked for
+            if name.startswith("  ") or name.strip() not in names:
+                continue
+            total_us += int(cumulative)
+        best = total_us if best is None else min(best, total_us)
+    return best / 1000.0
+
+
+def test_module_import_budget():
+    ms = _cumulative_ms("import " + ", ".join(MODULES), V007B, MODULES)
+    assert ms <= IMPORT_BUDGET_MS, f"v007b modules import in {ms:.1f}ms (budget {IMPORT_BUDGET_MS}ms)"
+
+
+def test_package_import_is_lazy():
+    ms = _cumulative_ms("import v007b", PROJECT_ROOT, ("v007b",))
+    assert ms <= PACKAGE_IMPORT_BUDGET_MS, f"v007b imports in {ms:.1f}ms (budget {PACKAGE_IMPORT_BUDGET_MS}ms)"
+    proc = subprocess.run(
+        [sys.executable, "-c",
+         "import sys, v007b; print(any(m.startswith('v007b.') for m in sys.modules))"],
+        cwd=str(PROJECT_ROOT), capture_output=True, text=True, check=True)
+    assert proc.stdout.strip() == "False"
+
+
+def test_import_has_no_side_effects(tmp_path):
+    out_dir = tmp_path / "output"
+    env = dict(os.environ, OUTPUT_DIR=str(out_dir))
+    proc = subprocess.run(
+        [sys.executable, "-c",
+         "import " + ", ".join(MODULES) + "; print(sorted(k for k in ('CLUES', 'OUTPUT_DIR') if k in vars(config)))"],
+        cwd=str(V007B), env=env, capture_output=True, text=True, check=True)
+    assert proc.stdout.strip() == "[]"
+    assert not out_dir.exists()
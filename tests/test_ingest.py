@@ -0,0 +1,67 @@
+"""
+ingest() must write one JSON line per listed path, in input order: the
+parse result of the basename plus "path", however the listing is chunked
+and whether it is parsed in workers or in-process.
+
+Run with: pytest -q tests/test_ingest.py
+"""
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from ingest import file_chunks, ingest, stream_chunks
+from parser import parse_filename
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+PATHS = ([str(p) for p in sorted((PROJECT_ROOT / "sample_media").rglob("*"))]
+         + [f"/mnt/nas/tv/Show/Season 01/Show.S01E{n:02d}.1080p.WEB-DL.x264-GRP.mkv" for n in range(1, 30)]
+         + ["D:\\Movies\\Heat.1995.1080p.BluRay.x264.mkv", "/mnt/nas/tv/Show/Season 02/", "Ünïcødé.2020.mkv"])
+
+
+@pytest.fixture
+def listing(tmp_path):
+    path = tmp_path / "listing.txt"
+    # blank lines are skipped, the last line has no newline
+    path.write_bytes(("\n".join(PATHS[:5]) + "\n\n" + "\n".join(PATHS[5:])).encode("utf-8"))
+    return path
+
+
+def _expected():
+    names = [p.rstrip("/\\").replace("\\", "/").rsplit("/", 1)[-1] for p in PATHS]
+    return [{**parse_filename(n, quiet=True), "path": p} for n, p in zip(names, PATHS)]
+
+
+@pytest.mark.parametrize("workers,chunk_bytes", [(0, 1), (0, 300), (0, 1 << 20), (2, 200)])
+def test_ingest_matches_parse_filename(listing, quarantine, workers, chunk_bytes):
+    out = io.BytesIO()
+    stats = ingest(str(listing), out, workers=workers, chunk_bytes=chunk_bytes)
+    assert [json.loads(line) for line in out.getvalue().decode("utf-8").splitlines()] == _expected()
+    assert stats.lines == len(PATHS)
+    assert stats.bytes == listing.stat().st_size  # the listing read, not the JSON written
+
+
+def test_ingest_reads_stdin(listing, quarantine, monkeypatch):
+    stdin = io.TextIOWrapper(io.BytesIO(listing.read_bytes()))
+    monkeypatch.setattr("sys.stdin", stdin)
+    out, progress = io.BytesIO(), io.StringIO()
+    stats = ingest("-", out, workers=0, chunk_bytes=64, progress=progress)
+    assert [json.loads(line) for line in out.getvalue().decode("utf-8").splitlines()] == _expected()
+    assert (stats.lines, stats.bytes) == (len(PATHS), listing.stat().st_size)
+
+
+def test_chunks_split_at_line_boundaries(listing):
+    data = listing.read_bytes()
+    for chunk_bytes in (1, 7, 100, 1 << 20):
+        ranges = list(file_chunks(str(listing), chunk_bytes))
+        assert b"".join(data[start:end] for _path, start, end in ranges) == data
+        assert all(data[end - 1:end] == b"\n" for _path, _start, end in ranges[:-1])
+        chunks = list(stream_chunks(io.BytesIO(data), chunk_bytes))
+        assert b"".join(chunks) == data
+        assert all(chunk.endswith(b"\n") for chunk in chunks[:-1])
+    empty = listing.with_name("empty.txt")
+    empty.write_bytes(b"")
+    assert list(file_chunks(str(empty), 10)) == []
@@ -0,0 +1,40 @@
+"""
+Guarded parsing: long or runaway names get a degraded result and are
+quarantined, everything else parses exactly as before. Only callers that
+opt in (guarded=True, batch scans) are guarded.
+
+Run with: pytest -q tests/test_parse_guard.py
+"""
+
+import json
+import time
+from pathlib import Path
+
+from batch_parser import parse_siblings
+from parser import parse_filename, parse_filename_internal
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_guard_degrades_and_quarantines_only_pathological_names(quarantine):
+    names = [p.name for p in (PROJECT_ROOT / "sample_media").rglob("*")]
+    assert [n for n in names
+            if parse_filename(n, quiet=True, guarded=True) != parse_filename_internal(n, quiet=True)] == []
+
+    long_name = "Show." * 400 + "S01E01.mkv"
+    # every trailing year is stripped in its own pass over the whole title
+    runaway = ".".join(str(1900 + i % 200) for i in range(200)) + ".mkv"
+    started = time.perf_counter()
+    degraded = {"long": parse_filename(long_name, quiet=True, guarded=True),
+                "runaway": parse_filename(runaway, quiet=True, guarded=True)}
+    seconds = time.perf_counter() - started
+    degraded["siblings"] = parse_siblings([long_name], guarded=True)[0]
+    assert {k: [r.get("degraded"), r["media_type"], r["tv_clues"]] for k, r in degraded.items()} == {
+        "long": ["length", "unknown", []], "runaway": ["budget", "unknown", []],
+        "siblings": ["length", "unknown", []]}
+    assert parse_filename(long_name, quiet=True).get("degraded") is None
+    # unguarded, the runaway name alone takes tens of milliseconds
+    assert seconds < 0.5
+    records = [json.loads(line) for line in quarantine.read_text(encoding="utf-8").splitlines()]
+    assert [r["reason"] for r in records] == ["length", "budget", "length"]
+    assert records[0]["length"] == len(long_name)
@@ -0,0 +1,46 @@
+"""
+parse_with_context: episode files inside a show folder take the title,
+media type and quality from the folder; names that don't fit the folder get
+exactly what parse_filename returns.
+
+Run with: pytest -q tests/test_parse_with_context.py
+"""
+
+from parser import directory_context, parse_filename, parse_with_context
+
+SHOW = parse_filename("Breaking.Bad.S01.1080p.BluRay.x264-GRP", quiet=True)
+
+
+def test_episode_files_take_title_and_quality_from_the_folder():
+    r = parse_with_context("S01E03.mkv", SHOW)
+    assert (r["clean_title"], r["media_type"], r["tv_clues"]) == ("Breaking Bad", "tv", ["S01E03"])
+    assert r["extras_bits"] == ["1080p", "bluray"]
+    r = parse_with_context("Breaking.Bad.S01E02.Cats.in.the.Bag.mkv", SHOW)
+    assert (r["clean_title"], r["tv_clues"]) == ("Breaking Bad", ["S01E02"])
+    assert r["words"] == [".mkv", "Cats.in.the.Bag"]  # the episode title is a word, not the title
+    # the file's own quality wins over the folder's
+    assert parse_with_context("S01E04.720p.mkv", SHOW)["extras_bits"] == ["720p"]
+
+
+def test_bare_episode_takes_the_season_of_a_season_folder():
+    season = directory_context(parse_filename("Season 02", quiet=True), directory_context(SHOW))
+    assert (season["clean_title"], season["tv_clues"]) == ("Breaking Bad", ["SEASON 02"])
+    r = parse_with_context("E04.720p.mkv", season)
+    assert (r["clean_title"], r["tv_clues"]) == ("Breaking Bad", ["E04", "SEASON 02"])
+
+
+def test_names_that_dont_fit_the_folder_are_fully_parsed():
+    movie = parse_filename("Heat.1995.1080p.BluRay.mkv", quiet=True)
+    for name, context in (("Other.Show.S01E01.mkv", SHOW),           # another title
+                          ("Breaking.Bad.Extras.mkv", SHOW),         # no episode clue
+                          ("Breaking.Bad.S01E05.2008.mkv", SHOW),    # more clues after the episode
+                          ("Breaking.Bad.S01E05.mkv", movie),        # not a tv/anime folder
+                          ("Breaking.Bad.S01E05.mkv", None)):
+        assert parse_with_context(name, context) == parse_filename(name, quiet=True), name
+
+
+def test_guarded_long_name_is_degraded(quarantine):
+    name = "S01E01." + "x" * 2000 + ".mkv"
+    assert parse_with_context(name, SHOW, guarded=True)["degraded"] == "length"
+    assert "degraded" not in parse_with_context(name, SHOW)
+    assert quarantine.exists()
@@ -0,0 +1,42 @@
+"""
+The prefix stripping engine must strip exactly what PREFIX_PATTERNS (and
+the separator trims) strip, in linear time.
+
+Run with: pytest -q tests/test_prefix_strip.py
+"""
+
+import random
+import re
+import time
+
+from parser import PREFIX_PATTERNS, _strip_prefix_patterns, _trim_right_separators
+
+REGEX_RIGHT = re.compile(r"[.\-\s_\(\)\[\]]+$")
+PIECES = ["www.", "WwW.", "[www.", "ww.tamil", "Ww.TAMİL", "cam", "pics", "pıcs", "world", "phd", "ſbs",
+          "tamilblasters", "1tamilmv", "[", "]", " ", ".", "-", "_", "(", ")", "\n", "\t", "　", "a", "2", "[ab]"]
+
+
+def _regex_strip(name):
+    for pattern in PREFIX_PATTERNS:
+        name = pattern.sub('', name)
+    name = re.sub(r'^[.\-_ \[\]]+| [.\-_ \[\]]+$', '', name)
+    return re.sub(r'\s+', ' ', name).strip()
+
+
+def test_prefix_engine_matches_patterns_in_linear_time():
+    rng = random.Random(0)
+    mismatches = []
+    for _ in range(50000):
+        name = "".join(rng.choice(PIECES) for _ in range(rng.randint(0, 10)))
+        if (_strip_prefix_patterns(name) != _regex_strip(name)
+                or _trim_right_separators(name) != REGEX_RIGHT.sub("", name)):
+            mismatches.append(name)
+    assert mismatches[:10] == []
+
+    started = time.perf_counter()
+    for name in ("a" + " " * 50000 + "x", "a" + " .-_[]" * 10000 + "x", "[" * 50000,
+                 "www." + "a" * 50000 + " " * 50000):
+        _strip_prefix_patterns(name)
+        _trim_right_separators(name)
+    # the regex form takes tens of seconds on these; linear time is milliseconds
+    assert time.perf_counter() - started < 1.0
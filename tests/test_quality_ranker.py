@@ -0,0 +1,33 @@
+"""
+Release ranking must score the release part of a name, not its title or
+container extension.
+
+Run with: pytest -q tests/test_quality_ranker.py
+"""
+
+from parser import parse_filename_internal
+from quality_ranker import QualityRanker
+
+RANKER = QualityRanker({"weights": {"resolution": 1.0, "source": 1.0, "codec": 0.4},
+                        "scores": {"resolution": {"720P": 50},
+                                   "source": {"WEB": 65, "HDTV": 50, "TS": 5, "CAMRIP": 2},
+                                   "codec": {"X264": 60}}})
+
+
+def _rank(names):
+    ranks = {}
+    for name in names:
+        rank = RANKER.rank(name, parse_filename_internal(name, quiet=True))
+        ranks[name] = [rank.score, rank.features.get("source")]
+    return ranks
+
+
+def test_title_words_and_extension_are_not_scored():
+    ranks = _rank(["The.Web.2010.720p.CAMRip.x264.mkv", "The.Web.2010.720p.HDTV.x264.mkv",
+                   "Cam.2019.720p.HDTV.x264.mkv", "Movie.2010.720p.ts", "Movie.2010.720p.TS.x264.mkv"])
+    assert ranks["The.Web.2010.720p.CAMRip.x264.mkv"][1] == "CAMRIP"
+    assert ranks["The.Web.2010.720p.HDTV.x264.mkv"][1] == "HDTV"
+    assert ranks["The.Web.2010.720p.HDTV.x264.mkv"][0] > ranks["The.Web.2010.720p.CAMRip.x264.mkv"][0]
+    assert ranks["Cam.2019.720p.HDTV.x264.mkv"][1] == "HDTV"
+    assert ranks["Movie.2010.720p.ts"][1] is None
+    assert ranks["Movie.2010.720p.TS.x264.mkv"][1] == "TS"
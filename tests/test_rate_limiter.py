@@ -0,0 +1,81 @@
+"""
+TokenBucket: refill, reservation and wait accounting (on a fake clock), and
+shared buckets counting the operations of forked workers.
+
+Run with: pytest -q tests/test_rate_limiter.py
+"""
+
+import multiprocessing
+
+import pytest
+
+import rate_limiter
+from rate_limiter import IOScheduler, TokenBucket
+
+
+class FakeClock:
+    """monotonic()/sleep() of rate_limiter's `time`: sleeping advances the clock."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter, "time", fake)
+    return fake
+
+
+def test_bucket_refills_at_rate_up_to_capacity(clock):
+    bucket = TokenBucket(rate=10, capacity=5)
+    assert [bucket.acquire() for _ in range(5)] == [0.0] * 5  # starts full
+    assert bucket.acquire() == pytest.approx(0.1)
+    clock.now += 60  # refills to capacity, not beyond
+    assert [bucket.acquire() for _ in range(5)] == [0.0] * 5
+    assert bucket.acquire() == pytest.approx(0.1)
+    assert bucket.stats() == {"units": 12, "throttled": 2, "wait_seconds": pytest.approx(0.2)}
+
+
+def test_large_requests_reserve_ahead(clock):
+    bucket = TokenBucket(rate=100, capacity=10)
+    # more than the capacity: granted after the deficit refills, not starved
+    assert bucket.acquire(50) == pytest.approx(0.4)
+    assert clock.now == pytest.approx(100.4)
+    # the balance is back at 0: the next caller waits for its own tokens only
+    assert bucket.acquire(10) == pytest.approx(0.1)
+
+
+def test_zero_rate_is_unlimited(clock):
+    bucket = TokenBucket(rate=0, capacity=0)
+    assert bucket.acquire(10 ** 9) == 0.0
+    assert clock.now == 100.0
+    scheduler = IOScheduler(ops_per_second=1000, ops_capacity=1000)  # bytes unlimited by default
+    scheduler.read(10 ** 9)
+    scheduler.metadata(3)
+    assert scheduler.metrics()["metadata"]["units"] == 3
+    assert scheduler.metrics()["bytes"] == {"units": 0.0, "throttled": 0, "wait_seconds": 0.0}
+
+
+def _take(bucket, n):
+    for _ in range(n):
+        bucket.acquire()
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_shared_bucket_counts_all_processes():
+    bucket = TokenBucket(rate=1e6, capacity=1e6, shared=True)
+    ctx = multiprocessing.get_context("fork")
+    workers = [ctx.Process(target=_take, args=(bucket, 50)) for _ in range(2)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    _take(bucket, 5)
+    assert bucket.stats()["units"] == 105
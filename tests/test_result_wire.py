@@ -0,0 +1,38 @@
+"""
+A pickled result_wire batch must decode to exactly the results it encoded.
+
+Run with: pytest -q tests/test_result_wire.py
+"""
+
+import json
+import os
+import pickle
+from pathlib import Path
+
+from parser import guarded_parse, parse_filename_internal
+from result_wire import encode_results
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_result_batch_round_trip(quarantine):
+    names = sorted(os.listdir(PROJECT_ROOT / "sample_media")) + [
+        "Show.S01E01.1080p.mkv", "Show.S01E02.1080p.mkv", "x" * 5000 + ".mkv"]
+    results = [parse_filename_internal(n, quiet=True) for n in names]
+    results.append(guarded_parse("x" * 5000, quiet=True, max_length=100))  # degraded: extra key
+    results.append({"original": "odd", "nested": [["a", 1], [], {"k": ["v"]}], "n": 3, "f": 1.0,
+                    "flag": True, "none": None, "map": {"a": {"b": []}}, "mixed": ["a", None]})
+
+    batch = pickle.loads(pickle.dumps(encode_results(results), pickle.HIGHEST_PROTOCOL))
+    assert len(batch) > 10
+    decoded = list(batch)
+    assert json.dumps(decoded) == json.dumps(results)
+    assert [type(v) for r in decoded for v in r.values()] == [type(v) for r in results for v in r.values()]
+    assert batch[2:5] == results[2:5] and batch[-1] == results[-1]
+    assert [batch.field(i, "media_type") for i in range(len(batch))] == [r.get("media_type") for r in results]
+    keys = ("media_type", "words", "degraded")
+    assert list(batch.select(keys)) == [{k: r[k] for k in keys if k in r} for r in results]
+    # decoded rows share no state with the batch
+    batch[0]["tv_clues"].append("changed")
+    batch[0]["extra"] = 1
+    assert batch[0] == results[0]
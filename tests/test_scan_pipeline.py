@@ -0,0 +1,61 @@
+"""
+A pipelined scan must leave the database exactly as parse_directory +
+save_groups_to_db does, and a cancelled one must leave it untouched.
+
+Run with: pytest -q tests/test_scan_pipeline.py
+"""
+
+import io
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from database_manager import save_groups_to_db
+from dir_processor import parse_directory
+from scan_pipeline import ScanCancelled, ScanPipeline
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SOURCE = str(PROJECT_ROOT / "sample_media")
+
+
+def _dump(db):
+    conn = sqlite3.connect(db)
+    try:
+        return [conn.execute(f"SELECT * FROM {t} ORDER BY id").fetchall() for t in ("media_groups", "media_paths")]
+    finally:
+        conn.close()
+
+
+@pytest.mark.parametrize("mode", ["dirs", "files"])
+@pytest.mark.parametrize("recursive", [False, True])
+def test_pipeline_matches_phased_scan(tmp_path, quarantine, mode, recursive):
+    phased, inline, pooled = (str(tmp_path / f"{v}.sqlite") for v in ("a", "b", "c"))
+    for _ in range(2):  # the second scan hits existing rows
+        raw = parse_directory(SOURCE, mode=mode, recursive=recursive)
+        save_groups_to_db(raw["grouped"], phased, quiet=True)
+        out = io.BytesIO()
+        # tiny batches and queues: every stage blocks on the next one
+        ScanPipeline(SOURCE, mode=mode, recursive=recursive, db_path=inline, out=out,
+                     workers=0, batch_size=3, queue_size=1).run()
+        ScanPipeline(SOURCE, mode=mode, recursive=recursive, db_path=pooled,
+                     workers=2, batch_size=5, queue_size=2).run()
+    assert _dump(phased) == _dump(inline) == _dump(pooled)
+    conn = sqlite3.connect(phased)
+    # a rescan must reuse its groups, year-less ones included
+    assert conn.execute("SELECT COUNT(*) FROM media_groups GROUP BY clean_title, media_type, year "
+                        "HAVING COUNT(*) > 1").fetchall() == []
+    conn.close()
+    assert [json.loads(line) for line in out.getvalue().splitlines()] == list(raw["raw"].values())
+
+
+def test_cancelled_scan_writes_nothing(tmp_path, quarantine):
+    cancelled = str(tmp_path / "cancelled.sqlite")
+    scan = ScanPipeline(SOURCE, recursive=True, db_path=cancelled, workers=0, batch_size=1, queue_size=1,
+                        collect=lambda batch: scan.cancel())
+    with pytest.raises(ScanCancelled):
+        scan.run()
+    conn = sqlite3.connect(cancelled)
+    assert conn.execute("SELECT COUNT(*) FROM media_paths").fetchone()[0] == 0
+    conn.close()
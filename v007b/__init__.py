@@ -3,8 +3,32 @@ Parser package initialization.
 
 This module marks the directory as a Python package and can be used
 to expose commonly used functions or classes from submodules.
+
+Exports are resolved lazily (module __getattr__) so importing the package
+does not import the parser, directory processor or clue manager until one
+of them is used.
 """
 
-from .parser import parse_filename
-from .dir_processor import parse_directory
-from .clue_manager import ClueManager
+from importlib import import_module
+
+_EXPORTS = {
+    "parse_filename": ".parser",
+    "parse_directory": ".dir_processor",
+    "ClueManager": ".clue_manager",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    try:
+        module = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,230 @@
+"""
+Batch parsing of sibling files.
+
+Files of a season pack ("Attack.on.Titan.S01E01...", "...S01E02...", ...)
+differ only in a short run of digits between a long common prefix and an
+identical suffix. parse_siblings() groups names whose digit-masked forms are
+equal, fully parses one name per group (the template) and derives the other
+results from it, looking only at the variable segment.
+
+Replacing digits by digits keeps every \\d / \\w decision of the parser's
+patterns, so the template's matches keep their spans in a sibling; only the
+text of the matches covering the changed digits is re-read, and only the
+clue values containing digits are re-checked for matched_clues. Names are
+compared as the parser tokenizes them: prefix-stripped, with an extension
+that carries clues merged back in. A sibling is derived only if the changed
+digits lie inside episode/season/chapter matches after possible_title and
+every changed clue text occurs once in that string; otherwise it gets a
+full parse. Results are identical to calling parse_filename on every name
+(with the same guarded flag).
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import config
+from parser import (CHAPTER_RE, EPISODE_RE, EP_RANGE_RE, ANIME_EP_RE, SEASON_RE, TV_CLUE_RE,
+                    MATCHED_CLUE_KEYS, _collect_matches, _strip_prefix_patterns, parse_filename)
+
+_DIGIT_RE = re.compile(r"\d")
+_EXT_RE = re.compile(r"^(?P<name>.+?)(?P<ext>\.[^.]+)$")
+# match types whose text only ends up in tv_clues/anime_clues
+_EPISODE_PATTERNS = {
+    "episode": EPISODE_RE,
+    "tvclue": TV_CLUE_RE,
+    "tvseason": SEASON_RE,
+    "animerange": EP_RANGE_RE,
+    "animeep": ANIME_EP_RE,
+    "chapter": CHAPTER_RE,
+}
+# a standalone 4-digit run may turn into (or stop being) a movie year when its digits change
+_FOUR_DIGITS_RE = re.compile(r"(?<!\w)\d{4}(?!\w)")
+
+
+def _split_ext(filename: str) -> Tuple[str, str]:
+    m = _EXT_RE.match(filename)
+    return (m.group("name"), m.group("ext")) if m else (filename, "")
+
+
+def _parser_name(name: str, ext: str, merge_ext: bool) -> str:
+    """The string parse_filename tokenizes: the prefix-stripped name, plus a merged extension."""
+    stripped = _strip_prefix_patterns(name)
+    return stripped + ext if merge_ext else stripped
+
+
+class _Template:
+    """A fully parsed name plus what is needed to derive its siblings."""
+
+    def __init__(self, filename: str, quiet: bool, guarded: bool):
+        self.filename = filename
+        self.guarded = guarded
+        self.result = parse_filename(filename, quiet=quiet, guarded=guarded)
+        self.name, self.ext = _split_ext(filename)
+        # the parser merges an extension with clues (".E05", ".ep02") back into the name
+        self.merge_ext = bool(self.ext) and bool(_collect_matches(self.ext))
+        self.stripped = _parser_name(self.name, self.ext, self.merge_ext)
+        self.upper = self.stripped.upper()
+        # where possible_title ends in stripped; -1 if it isn't a prefix (never derive then)
+        title = self.result["possible_title"] or ""
+        self.title_end = len(title) if self.stripped.startswith(title) else -1
+        self._token_matches: Dict[Tuple[int, int], list] = {}
+        self._matched: Optional[Dict[str, Tuple[List[Tuple[int, str]], List[Tuple[int, str, str]]]]] = None
+
+    def token_matches(self, start: int, end: int) -> list:
+        key = (start, end)
+        if key not in self._token_matches:
+            self._token_matches[key] = _collect_matches(self.stripped[start:end])
+        return self._token_matches[key]
+
+    def matched_parts(self):
+        """
+        Per category: (clues found for every sibling, clues to check against the filename).
+
+        Only clue values containing digits can match a sibling's filename
+        differently; the other search-space parts are the same for all siblings.
+        """
+        if self._matched is None:
+            r = self.result
+            others = [s.lower() for s in r["extras_bits"] + r["words"] +
+                      ([r["possible_title"]] if r["possible_title"] else []) if s]
+            self._matched = {}
+            lowered = config.CLUE_INDEX.lowered
+            for key in MATCHED_CLUE_KEYS:
+                candidates = lowered.get(key, [])
+                found = set(r["matched_clues"].get(key, []))
+                fixed, check = [], []
+                for i, (c, low) in enumerate(candidates):
+                    if not _DIGIT_RE.search(low):
+                        if c in found:
+                            fixed.append((i, c))
+                    elif any(low in tok for tok in others):
+                        fixed.append((i, c))
+                    else:
+                        check.append((i, c, low))
+                self._matched[key] = (fixed, check)
+        return self._matched
+
+
+def _derive(t: _Template, filename: str) -> Optional[Dict[str, Any]]:
+    """Sibling result from the template, or None if identity with a full parse isn't guaranteed."""
+    if filename == t.filename:
+        return _copy(t.result)
+    name, ext = _split_ext(filename)
+    if ext != t.ext or t.result["movie_clues"] or "degraded" in t.result:
+        return None
+    if t.guarded and 0 < config.PARSE_MAX_LENGTH < len(filename):
+        return None  # the guard's decision, see parser.guarded_parse
+    # compare siblings on the string the parser tokenizes
+    stripped = _parser_name(name, ext, t.merge_ext)
+    if len(stripped) != len(t.stripped):
+        return None
+    diff = [i for i, (a, b) in enumerate(zip(t.stripped, stripped)) if a != b]
+
+    subst: Dict[str, str] = {}
+    if diff:
+        # possible_title is copied from the template: its text must not change
+        if diff[0] < t.title_end or t.title_end < 0:
+            return None
+        # all changed digits must lie in one token (stripped names are single-space separated) ...
+        start = t.stripped.rfind(" ", 0, diff[0]) + 1
+        end = t.stripped.find(" ", diff[0])
+        end = len(t.stripped) if end < 0 else end
+        if diff[-1] >= end:
+            return None
+        token = stripped[start:end]
+        for m in _FOUR_DIGITS_RE.finditer(token):
+            if any(m.start() <= d - start < m.end() for d in diff):
+                return None
+        # ... inside episode/season/chapter matches, whose texts are re-read for the sibling
+        covered = set()
+        upper = stripped.upper()
+        for m_start, m_end, typ, t_text in t.token_matches(start, end):
+            hit = [d for d in diff if m_start <= d - start < m_end]
+            if not hit:
+                continue
+            pattern = _EPISODE_PATTERNS.get(typ)
+            sm = pattern.match(token, m_start) if pattern is not None else None
+            if sm is None or sm.end() != m_end:
+                return None
+            covered.update(hit)
+            s_text = sm.group(1) if sm.lastindex else sm.group(0)
+            pieces = zip(t_text.split("-"), s_text.split("-")) if typ == "tvclue" else [(t_text, s_text)]
+            for a, b in pieces:
+                a, b = a.upper(), b.upper()
+                if a == b:
+                    continue
+                # clue texts are substrings of the upper-cased name; if the changed ones occur
+                # only once, no other match (e.g. from the title passes) produces or dedupes them
+                if subst.get(a, b) != b or t.upper.count(a) != 1 or upper.count(b) != 1:
+                    return None
+                subst[a] = b
+        if len(covered) != len(diff):
+            return None
+
+    result = _copy(t.result)
+    result["original"] = filename
+    if subst:
+        result["tv_clues"] = [subst.get(c, c) for c in result["tv_clues"]]
+        result["anime_clues"] = [subst.get(c, c) for c in result["anime_clues"]]
+    result["matched_clues"] = _matched_clues(t, filename)
+    for key in ("resolution_clues", "audio_clues", "quality_clues", "release_groups", "misc_clues"):
+        result[key] = result["matched_clues"].get(key, [])
+    return result
+
+
+def _copy(result: Dict[str, Any]) -> Dict[str, Any]:
+    out = {k: list(v) if isinstance(v, list) else v for k, v in result.items()}
+    out["matched_clues"] = {k: list(v) for k, v in result["matched_clues"].items()}
+    return out
+
+
+def _matched_clues(t: _Template, filename: str) -> Dict[str, List[str]]:
+    """matched_clues of a sibling (same candidate order and dedupe as the parser)."""
+    low_name = filename.lower()
+    matched: Dict[str, List[str]] = {}
+    for key, (fixed, check) in t.matched_parts().items():
+        found = fixed + [(i, c) for i, c, low in check if low in low_name] if check else fixed
+        if found:
+            seen: List[str] = []
+            for _i, c in sorted(found):
+                if c not in seen:
+                    seen.append(c)
+            matched[key] = seen
+    return matched
+
+
+def parse_siblings(filenames: Sequence[str], quiet: bool = True,
+                   stats: Optional[Dict[str, int]] = None, guarded: bool = False) -> List[Dict[str, Any]]:
+    """
+    Parse many names at once, sharing work between names that differ only in digits.
+
+    Args:
+        filenames: names to parse (e.g. one directory listing)
+        quiet: passed to parse_filename; with quiet=False every name gets a full parse
+        stats: optional dict; "full" and "derived" counts are added to it
+        guarded: parse through parser.guarded_parse (batch scans opt in)
+
+    Returns:
+        parse results in the order of filenames
+    """
+    templates: Dict[Tuple[str, int], _Template] = {}
+    results: List[Dict[str, Any]] = []
+    full = derived = 0
+    for filename in filenames:
+        key = (_DIGIT_RE.sub("#", filename), len(filename))
+        t = templates.get(key)
+        result = _derive(t, filename) if t is not None and quiet else None
+        if result is None:
+            if t is None:
+                t = templates[key] = _Template(filename, quiet, guarded)
+                result = _copy(t.result)
+            else:
+                result = parse_filename(filename, quiet=quiet, guarded=guarded)
+            full += 1
+        else:
+            derived += 1
+        results.append(result)
+    if stats is not None:
+        stats["full"] = stats.get("full", 0) + full
+        stats["derived"] = stats.get("derived", 0) + derived
+    return results
@@ -0,0 +1,59 @@
+"""
+Extractor work per name.
+
+Parses a few corpora and reports, per name, how many token extractors ran
+against how many the unfiltered loop would have run (every extractor on
+every classified token), plus names/s. The token memo is cleared before
+each name so the counts are the full per-name work, not memo hits.
+
+Run with: python bench_extractors.py [--repeat 3]
+"""
+
+import argparse
+import time
+from typing import Dict, List
+
+from config import PROJECT_ROOT
+from parser import (EXTRACTORS, clear_token_memo, extractor_stats, parse_filename_internal,
+                    reset_extractor_stats)
+
+
+def _corpora() -> Dict[str, List[str]]:
+    root = PROJECT_ROOT / "sample_media"
+    sample = [p.name for p in root.rglob("*")] if root.exists() else []
+    tv = [f"Show.Name.S{s:02d}E{e:02d}.1080p.WEB-DL.AAC2.0.H.264-GRP.mkv" for s in (1, 2) for e in range(1, 25)]
+    anime = [f"[SubsPlease] Frieren - {n:02d} (1080p) [ABCD{n:04d}].mkv" for n in range(1, 29)]
+    movies = [f"Movie.Title.{y}.2160p.BluRay.x265.10bit.HDR.DTS-HD.MA.7.1-GRP.mkv" for y in range(1990, 2020)]
+    return {"sample_media": sample, "tv_pack": tv, "anime_pack": anime, "movies": movies}
+
+
+def run(names: List[str], repeat: int) -> Dict[str, float]:
+    reset_extractor_stats()
+    for name in names:
+        clear_token_memo()
+        parse_filename_internal(name, quiet=True)
+    stats = extractor_stats()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for name in names:
+            clear_token_memo()
+            parse_filename_internal(name, quiet=True)
+    seconds = time.perf_counter() - started
+    n = len(names) or 1
+    return {"run": stats["run"] / n, "all": stats["tokens"] * len(EXTRACTORS) / n,
+            "names_per_s": repeat * len(names) / seconds if seconds else 0.0}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+    print(f"{'corpus':<14}{'names':>7}{'run/name':>10}{'all/name':>10}{'saved':>8}{'names/s':>10}")
+    for label, names in _corpora().items():
+        r = run(names, args.repeat)
+        saved = 1 - r["run"] / r["all"] if r["all"] else 0.0
+        print(f"{label:<14}{len(names):>7}{r['run']:>10.1f}{r['all']:>10.1f}{saved:>8.0%}{r['names_per_s']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Latency benchmark for the parser service.
+
+Compares a cold `python -c "import parser; ..."` per batch (what ingest
+scripts do today) against requests to a warm service, and reports
+p50/p95/p99 latency and throughput for concurrent clients.
+
+Run with: python bench_parser_service.py [--clients 8] [--requests 200] [--batch 16]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+from config import BASE_DIR, PROJECT_ROOT, PARSER_SOCKET
+from parser_client import ParserClient
+
+
+def _sample_names() -> List[str]:
+    """Names from the bundled sample_media tree (falls back to a few literals)."""
+    root = PROJECT_ROOT / "sample_media"
+    names = [p.name for p in root.rglob("*")] if root.exists() else []
+    return names or [
+        "Game of Thrones - S02E07 - A Man Without Honor [2160p].mkv",
+        "Pawn.Stars.S09E13.1080p.HEVC.x265-MeGusta.mkv",
+        "Naruto Shippuden (001-500) [Complete Series + Movies].mkv",
+        "Avatar.2009.1080p.BluRay.x264.DTS-HD.MA.5.1-FGT.mkv",
+    ]
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def _report(label: str, latencies: List[float], names: int, elapsed: float) -> None:
+    ms = [x * 1000 for x in latencies]
+    print(f"{label:<12} n={len(ms):<5} p50={_percentile(ms, 50):8.2f}ms "
+          f"p95={_percentile(ms, 95):8.2f}ms p99={_percentile(ms, 99):8.2f}ms "
+          f"mean={statistics.mean(ms):8.2f}ms  {names / elapsed:10.0f} names/s")
+
+
+def bench_cold(names: List[str], runs: int, batch: int) -> None:
+    """One interpreter per batch, as `python main.py` per batch would do."""
+    code = ("import sys, json; from parser import parse_filename_internal; "
+            "[parse_filename_internal(n, quiet=True) for n in json.load(sys.stdin)]")
+    latencies = []
+    start = time.perf_counter()
+    for i in range(runs):
+        chunk = [names[(i * batch + j) % len(names)] for j in range(batch)]
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], input=json.dumps(chunk).encode(),
+                       cwd=str(BASE_DIR), check=True)
+        latencies.append(time.perf_counter() - t0)
+    _report("cold", latencies, runs * batch, time.perf_counter() - start)
+
+
+def bench_service(names: List[str], socket_path: Path, clients: int, requests: int, batch: int) -> None:
+    """`clients` threads each send `requests` batches over their own connection."""
+    latencies: List[float] = []
+    lock = threading.Lock()
+
+    def worker(offset: int):
+        local = []
+        with ParserClient(socket_path) as client:
+            for i in range(requests):
+                chunk = [names[(offset + i * batch + j) % len(names)] for j in range(batch)]
+                t0 = time.perf_counter()
+                client.parse(chunk)
+                local.append(time.perf_counter() - t0)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(c * 7919,)) for c in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    _report(f"warm x{clients}", latencies, clients * requests * batch, elapsed)
+    with ParserClient(socket_path) as client:
+        stats = client.stats()
+    if stats["batches"]:
+        print(f"{'':<12} batches={stats['batches']} avg_batch={stats['batched_names'] / stats['batches']:.1f} "
+              f"rejected={stats['rejected']}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark the parser service")
+    ap.add_argument("--socket", default=str(PARSER_SOCKET))
+    ap.add_argument("--clients", type=int, default=8)
+    ap.add_argument("--requests", type=int, default=200)
+    ap.add_argument("--batch", type=int, default=16)
+    ap.add_argument("--cold-runs", type=int, default=10, help="0 to skip the cold baseline")
+    ap.add_argument("--spawn", action="store_true", help="Start a service for the benchmark")
+    args = ap.parse_args()
+
+    names = _sample_names()
+    socket_path = Path(args.socket)
+    proc = None
+    if args.spawn:
+        proc = subprocess.Popen([sys.executable, "parser_service.py", "--socket", str(socket_path)],
+                                cwd=str(BASE_DIR))
+        client = ParserClient(socket_path)
+        for _ in range(100):
+            try:
+                client.connect()
+                if client.ping():
+                    break
+            except OSError:
+                time.sleep(0.1)
+        client.close()
+    try:
+        if args.cold_runs:
+            bench_cold(names, args.cold_runs, args.batch)
+        bench_service(names, socket_path, 1, args.requests, args.batch)
+        if args.clients > 1:
+            bench_service(names, socket_path, args.clients, args.requests, args.batch)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Worst-case prefix stripping time by input length.
+
+Feeds _strip_prefix_patterns and _trim_right_separators adversarial inputs
+(long separator runs, unclosed brackets, site heads with long tails) and
+random mixes of the pieces PREFIX_PATTERNS look for, and reports the worst
+time per input character for each length, next to the regex form the
+engine replaced. Flat us/char means linear time.
+
+Run with: python bench_prefixes.py [--lengths 250,1000,4000,16000] [--random 30]
+"""
+
+import argparse
+import random
+import re
+import time
+from typing import Callable, Dict, List
+
+from parser import PREFIX_PATTERNS, _strip_prefix_patterns, _trim_right_separators
+
+_PIECES = ["www.", "[www.", "ww.tamil", "cam -", "sbs", "world", "1tamilmv", "[", "]", " ", ".", "-",
+           "_", "(", "a", "x", "\n", "[ab]"]
+
+_ADVERSARIAL: Dict[str, Callable[[int], str]] = {
+    "spaces": lambda n: "a" + " " * n + "x",
+    "separators": lambda n: "a" + " .-_[]" * (n // 6) + "x",
+    "unclosed": lambda n: "[" * n,
+    "groups": lambda n: "[a]" * (n // 3) + "x",
+    "site-tail": lambda n: "www." + "a" * n + " " * n + "x",
+    "bracket-site": lambda n: "[www." + "a" * n,
+    "keywords": lambda n: "sbs " * (n // 4),
+}
+
+
+def _regex_strip(name: str) -> str:
+    for pattern in PREFIX_PATTERNS:
+        name = pattern.sub('', name)
+    name = re.sub(r'^[.\-_ \[\]]+| [.\-_ \[\]]+$', '', name)
+    return re.sub(r'\s+', ' ', name).strip()
+
+
+_REGEX_RIGHT = re.compile(r"[.\-\s_\(\)\[\]]+$")
+
+
+def _inputs(n: int, randoms: int, rng: random.Random) -> List[str]:
+    out = [gen(n) for gen in _ADVERSARIAL.values()]
+    for _ in range(randoms):
+        name = ""
+        while len(name) < n:
+            name += rng.choice(_PIECES)
+        out.append(name)
+    return out
+
+
+def _worst_us_per_char(func: Callable[[str], str], names: List[str]) -> float:
+    worst = 0.0
+    for name in names:
+        started = time.perf_counter()
+        func(name)
+        worst = max(worst, (time.perf_counter() - started) / max(len(name), 1))
+    return worst * 1e6
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--lengths", default="250,1000,4000,16000")
+    ap.add_argument("--random", type=int, default=30, help="random inputs per length")
+    args = ap.parse_args()
+    rng = random.Random(0)
+    funcs = {
+        "strip": _strip_prefix_patterns,
+        "strip (regex)": _regex_strip,
+        "right trim": _trim_right_separators,
+        "right trim (regex)": lambda s: _REGEX_RIGHT.sub("", s),
+    }
+    lengths = [int(n) for n in args.lengths.split(",")]
+    print(f"{'worst us/char':<20}" + "".join(f"{n:>10}" for n in lengths))
+    inputs = {n: _inputs(n, args.random, rng) for n in lengths}
+    for label, func in funcs.items():
+        print(f"{label:<20}" + "".join(f"{_worst_us_per_char(func, inputs[n]):>10.3f}" for n in lengths))
+
+
+if __name__ == "__main__":
+    main()
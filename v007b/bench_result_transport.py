@@ -0,0 +1,88 @@
+"""
+Result transport cost: pickled result dicts vs result_wire batches.
+
+Parses a corpus once, then for several batch sizes measures moving a batch
+of results from a pool worker to the parent, in µs per result:
+
+    round trip   worker pickle.dumps (after encode_results) + parent loads
+                 + parent decoding every result
+    parent       pickle.loads only, the part the single collecting
+                 process pays for every worker
+    parent, all  loads + every result as a dict
+    parent, 1    loads + one field per result (media_type)
+
+plus pickled bytes per result.
+
+Run with: python bench_result_transport.py [--repeat 7]
+"""
+
+import argparse
+import json
+import pickle
+import time
+from typing import Callable, List
+
+from config import PROJECT_ROOT
+from parser import parse_filename_internal
+from result_wire import encode_results
+
+
+def _corpus() -> List[str]:
+    root = PROJECT_ROOT / "sample_media"
+    names = [p.name for p in root.rglob("*")] if root.exists() else []
+    names += [f"Show.Name.S{s:02d}E{e:02d}.1080p.WEB-DL.AAC2.0.H.264-GRP.mkv" for s in (1, 2) for e in range(1, 25)]
+    names += [f"[SubsPlease] Frieren - {n:02d} (1080p) [ABCD{n:04d}].mkv" for n in range(1, 29)]
+    names += [f"Movie.Title.{y}.2160p.BluRay.x265.10bit.HDR.DTS-HD.MA.7.1-GRP.mkv" for y in range(1990, 2020)]
+    return names
+
+
+def _best(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--repeat", type=int, default=7)
+    args = ap.parse_args()
+    results = [parse_filename_internal(n, quiet=True) for n in _corpus()]
+    proto = pickle.HIGHEST_PROTOCOL
+
+    for size in (16, 64, 256):
+        batches = [results[i:i + size] for i in range(0, len(results), size)]
+        plain = [pickle.dumps(b, proto) for b in batches]
+        wired = [pickle.dumps(encode_results(b), proto) for b in batches]
+        assert all(json.dumps(list(pickle.loads(w))) == json.dumps(b) for w, b in zip(wired, batches))
+
+        def one_field(blob: bytes) -> list:
+            batch = pickle.loads(blob)
+            return [batch.field(i, "media_type") for i in range(len(batch))]
+
+        modes = {
+            "pickle": {
+                "round trip": lambda: [pickle.loads(pickle.dumps(b, proto)) for b in batches],
+                "parent": lambda: [pickle.loads(p) for p in plain],
+                "parent, all": lambda: [pickle.loads(p) for p in plain],
+                "parent, 1": lambda: [[r["media_type"] for r in pickle.loads(p)] for p in plain],
+            },
+            "wire": {
+                "round trip": lambda: [list(pickle.loads(pickle.dumps(encode_results(b), proto))) for b in batches],
+                "parent": lambda: [pickle.loads(w) for w in wired],
+                "parent, all": lambda: [list(pickle.loads(w)) for w in wired],
+                "parent, 1": lambda: [one_field(w) for w in wired],
+            },
+        }
+        sizes = {"pickle": sum(map(len, plain)), "wire": sum(map(len, wired))}
+        print(f"batch {size}:")
+        for label, timings in modes.items():
+            cells = "  ".join(f"{name} {_best(fn, args.repeat) / len(results) * 1e6:5.2f}"
+                              for name, fn in timings.items())
+            print(f"  {label:<7} {cells}  bytes {sizes[label] / len(results):6.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Phased scan vs pipelined scan.
+
+Builds a synthetic library (show folders with season packs, plus loose
+movies) in a temporary directory and saves it to a fresh database twice per
+variant:
+
+    phased     parse_directory(recursive, mode="files") + save_groups_to_db
+    pipelined  ScanPipeline(recursive, mode="files", db_path=...)
+
+Reports wall time and entries/s, and, in a second run with tracemalloc
+(workers=0, so every allocation is in this process), the peak Python heap.
+Both variants must leave identical media_groups / media_paths tables.
+
+Run with: python bench_scan_pipeline.py [--shows 200] [--workers 2]
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List
+
+from database_manager import save_groups_to_db
+from dir_processor import parse_directory
+from scan_pipeline import ScanPipeline
+
+
+def _build_tree(root: Path, shows: int) -> int:
+    count = 0
+    for n in range(shows):
+        show = root / f"Show.Number.{n}"
+        for season in (1, 2):
+            pack = show / f"Season {season}"
+            pack.mkdir(parents=True)
+            for ep in range(1, 13):
+                (pack / f"Show.Number.{n}.S{season:02d}E{ep:02d}.1080p.WEB-DL.AAC2.0.H.264-GRP.mkv").touch()
+                count += 1
+        movie = root / f"Movie.Title.{n}.{1980 + n % 40}.2160p.BluRay.x265-GRP.mkv"
+        movie.touch()
+        count += 1
+    return count
+
+
+def _dump(db: str) -> List[list]:
+    conn = sqlite3.connect(db)
+    try:
+        return [conn.execute(f"SELECT * FROM {table} ORDER BY id").fetchall()
+                for table in ("media_groups", "media_paths")]
+    finally:
+        conn.close()
+
+
+def _phased(source: str, db: str, workers: int) -> None:
+    result = parse_directory(source, mode="files", recursive=True)
+    save_groups_to_db(result["grouped"], db, quiet=True)
+
+
+def _pipelined(source: str, db: str, workers: int) -> None:
+    ScanPipeline(source, mode="files", recursive=True, db_path=db, workers=workers).run()
+
+
+def _peak_heap(fn: Callable[[], None]) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--shows", type=int, default=200)
+    ap.add_argument("--workers", type=int, default=2)
+    args = ap.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "library"
+        entries = _build_tree(source, args.shows)
+        dumps = {}
+        for label, fn in (("phased", _phased), ("pipelined", _pipelined)):
+            db = os.path.join(tmp, f"{label}.sqlite")
+            started = time.perf_counter()
+            fn(str(source), db, args.workers)
+            seconds = time.perf_counter() - started
+            dumps[label] = _dump(db)
+            peak = _peak_heap(lambda: fn(str(source), os.path.join(tmp, f"{label}_heap.sqlite"), 0))
+            print(f"{label:<10} {entries} entries  {seconds:6.2f}s  {entries / seconds:8.0f} entries/s  "
+                  f"peak heap {peak / 1e6:6.1f} MB")
+        print("same database:", dumps["phased"] == dumps["pipelined"])
+
+
+if __name__ == "__main__":
+    main()
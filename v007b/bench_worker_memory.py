@@ -0,0 +1,78 @@
+"""
+Per-worker memory of the parse pool.
+
+Starts a pool of workers that each parse a share of a corpus, then reads
+/proc/<pid>/smaps_rollup for every worker and reports the average RSS,
+PSS (shared pages split between the processes mapping them) and USS
+(pages private to the worker). "isolated" is a pool where every worker
+loads its own parser; "shared" is parse_pool.worker_pool(), where the
+workers are forked from a parent that already holds the parser and clues.
+
+Linux only (smaps_rollup). Run with: python bench_worker_memory.py [--workers 4]
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+from config import PROJECT_ROOT
+from parse_pool import _warm_worker, worker_pool
+
+_FIELDS = ("Rss", "Pss", "Private_Clean", "Private_Dirty")
+
+
+def _corpus() -> List[str]:
+    root = PROJECT_ROOT / "sample_media"
+    names = [p.name for p in root.rglob("*")] if root.exists() else []
+    names += [f"Show.Name.S{s:02d}E{e:02d}.1080p.WEB-DL.AAC2.0.H.264-GRP.mkv" for s in (1, 2) for e in range(1, 25)]
+    names += [f"[SubsPlease] Frieren - {n:02d} (1080p) [ABCD{n:04d}].mkv" for n in range(1, 29)]
+    names += [f"Movie.Title.{y}.2160p.BluRay.x265.10bit.HDR.DTS-HD.MA.7.1-GRP.mkv" for y in range(1990, 2020)]
+    return names
+
+
+def _parse_share(names: List[str]) -> int:
+    from batch_parser import parse_siblings
+    parse_siblings(names, quiet=True)
+    time.sleep(0.2)  # keep the worker busy so every worker gets a share
+    return os.getpid()
+
+
+def _memory(pid: int) -> Dict[str, int]:
+    """smaps_rollup fields of a process, in KB."""
+    out = {}
+    with open(f"/proc/{pid}/smaps_rollup") as fh:
+        for line in fh:
+            key, _, value = line.partition(":")
+            if key in _FIELDS:
+                out[key] = int(value.split()[0])
+    out["USS"] = out.pop("Private_Clean") + out.pop("Private_Dirty")
+    return out
+
+
+def measure(pool: ProcessPoolExecutor, workers: int, names: List[str]) -> Dict[str, int]:
+    """Average per-worker memory (KB) after each worker parsed its share a few times."""
+    with pool:
+        pids = set()
+        for _ in range(3):
+            pids.update(pool.map(_parse_share, [names[i::workers] for i in range(workers)]))
+        stats = [_memory(pid) for pid in pids]
+    return {key: sum(s[key] for s in stats) // len(stats) for key in ("Rss", "Pss", "USS")}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--workers", type=int, default=4)
+    args = ap.parse_args()
+    names = _corpus()
+    # isolated first: worker_pool() loads the parser into this process
+    for label, make_pool in (("isolated", lambda n: ProcessPoolExecutor(max_workers=n, initializer=_warm_worker)),
+                             ("shared", worker_pool)):
+        kb = measure(make_pool(args.workers), args.workers, names)
+        print(f"{label:<9} {args.workers} workers, per worker: "
+              f"RSS {kb['Rss']:>6} KB  PSS {kb['Pss']:>6} KB  USS {kb['USS']:>6} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,9 +6,12 @@ and manage known clues.
 """
 
 import json
+from collections import Counter
 from pathlib import Path
-from typing import Dict, List
-from config import CLUES, UNKNOWN_FILE
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple, Union
+import config
+from unknown_store import UnknownStore
+from clue_suggester import ClueSuggester, Suggestion
 
 
 class ClueManager:
@@ -17,55 +20,83 @@ class ClueManager:
 
     Attributes:
         known (dict): loaded known clues (from config.CLUES)
-        unknown_file (Path): path where unknown tokens are stored
-        unknown (list): collected unknown tokens
+        unknown_file (Path): legacy JSON list of unknown tokens, imported into the store once
+        store (UnknownStore): persistent unknown tokens with cumulative counts,
+            opened on first use (close() or a with block closes it)
+        unknown (Counter): unknown tokens collected since the last save_unknowns()
     """
 
-    def __init__(self, unknown_file: Path = UNKNOWN_FILE):
-        self.known: Dict[str, List[str]] = CLUES
-        self.unknown_file = Path(unknown_file)
-        self.unknown: List[str] = []
-        self.load_unknowns()
+    def __init__(self, unknown_file: Optional[Path] = None, db_path: Optional[Path] = None):
+        self.known: Dict[str, List[str]] = config.CLUES
+        self.unknown_file = Path(unknown_file) if unknown_file is not None else config.UNKNOWN_FILE
+        self.unknown: Counter = Counter()
+        self._db_path = db_path
+        self._store: Optional[UnknownStore] = None
+        self._known_upper: Optional[Set[str]] = None
+
+    @property
+    def store(self) -> UnknownStore:
+        if self._store is None:
+            self._store = UnknownStore(self._db_path)
+            self.load_unknowns()
+        return self._store
+
+    def close(self) -> None:
+        """Close the store, if it was opened. Unsaved counts stay in self.unknown."""
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+
+    def __enter__(self) -> "ClueManager":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
 
     def load_unknowns(self):
-        """Load unknowns from disk (if present)."""
-        if self.unknown_file.exists():
+        """Import the legacy JSON unknown list into an empty store (if present); done when the store opens."""
+        if self.unknown_file.exists() and not len(self.store):
             try:
-                with self.unknown_file.open("r", encoding="utf-8") as fh:
-                    self.unknown = json.load(fh)
+                self.store.import_json(self.unknown_file)
             except Exception:
-                self.unknown = []
+                pass
 
     def save_unknowns(self):
-        """Persist unknown tokens to disk."""
-        self.unknown_file.parent.mkdir(parents=True, exist_ok=True)
-        with self.unknown_file.open("w", encoding="utf-8") as fh:
-            json.dump(self.unknown, fh, indent=2, ensure_ascii=False)
+        """Add the counts collected since the last save to the store."""
+        self.store.add(self.unknown)
+        self.unknown.clear()
 
     def collect_from_parsed(self, parsed_raw: Dict[str, Dict]):
         """
-        Scan the parsed results and collect unique unknown words (frequency-aware).
+        Count the unknown words of the parsed results (cumulative across calls).
 
         Args:
             parsed_raw: output from dir processor 'raw'
         """
-        freq = {}
-        for meta in parsed_raw.values():
-            for w in meta.get("words", []):
-                freq[w] = freq.get(w, 0) + 1
-        # sort by frequency desc and add new ones to unknown list
-        for w, _count in sorted(freq.items(), key=lambda kv: -kv[1]):
-            if w not in self.unknown and not self._is_known(w):
-                self.unknown.append(w)
+        freq = Counter(w for meta in parsed_raw.values() for w in meta.get("words", []))
+        for w, count in freq.items():
+            if not self._is_known(w):
+                self.unknown[w] += count
 
     def _is_known(self, token: str) -> bool:
         """Check if token exists in any known clue category (case-insensitive)."""
-        up = token.upper()
-        for lst in self.known.values():
-            for v in lst:
-                if up == v.upper():
-                    return True
-        return False
+        if self._known_upper is None:
+            self._known_upper = {v.upper() for lst in self.known.values() for v in lst}
+        return token.upper() in self._known_upper
+
+    def top_k(self, k: int = 20) -> List[Tuple[str, int]]:
+        """The k most frequent unknown tokens (saved counts plus unsaved ones) as (token, count)."""
+        if not self.unknown:
+            return self.store.top_k(k)
+        # a token without unsaved counts can only rank in the merged top k if it is in the stored top k
+        merged = Counter(dict(self.store.top_k(k)))
+        for token in self.unknown:
+            if token not in merged:
+                row = self.store.get(token)
+                if row:
+                    merged[token] = row[0]
+        merged.update(self.unknown)
+        return sorted(merged.items(), key=lambda kv: (-kv[1], kv[0]))[:k]
 
     def classify_unknown(self, token: str, category: str):
         """
@@ -75,12 +106,55 @@ class ClueManager:
             token: token to classify
             category: one of known CLUES keys (e.g., "quality_clues")
         """
-        token = token.strip()
-        if token in self.unknown:
-            self.unknown.remove(token)
-        self.known.setdefault(category, [])
-        if token not in self.known[category]:
-            self.known[category].append(token)
+        self.classify_many([(token, category)])
+
+    def classify_many(self, assignments: Union[Mapping[str, str], Iterable[Tuple[str, str]]]) -> int:
+        """
+        Move many tokens to known categories at once (one store write, one index rebuild).
+
+        Args:
+            assignments: token -> category mapping or (token, category) pairs
+
+        Returns:
+            number of tokens newly added to the known clues
+        """
+        pairs = assignments.items() if isinstance(assignments, Mapping) else assignments
+        added = 0
+        moved = []
+        for token, category in pairs:
+            token = token.strip()
+            moved.append(token)
+            self.unknown.pop(token, None)
+            values = self.known.setdefault(category, [])
+            if token not in values:
+                values.append(token)
+                added += 1
+        self.store.remove(moved)
+        if added:
+            self._known_upper = None
+            config.invalidate_clue_index()
+        return added
+
+    def suggest(self, parsed_results: Iterable[Dict], min_confidence: float = 0.6,
+                min_count: int = 2) -> List[Suggestion]:
+        """
+        Propose categories for unknown tokens from co-occurrence/position statistics.
+
+        Args:
+            parsed_results: parse result dicts (e.g. parse_directory()["raw"].values()), read once
+            min_confidence: drop suggestions below this confidence
+            min_count: ignore tokens seen fewer times
+
+        Returns:
+            list of clue_suggester.Suggestion(token, category, confidence, count)
+        """
+        suggester = ClueSuggester().feed(parsed_results)
+        return [s for s in suggester.suggest(min_confidence, min_count) if not self._is_known(s.token)]
+
+    def accept_suggestions(self, suggestions: Iterable[Suggestion], min_confidence: float = 0.0) -> int:
+        """classify_many() the suggestions with confidence >= min_confidence; returns tokens added."""
+        return self.classify_many([(s.token, s.category) for s in suggestions
+                                   if s.confidence >= min_confidence])
 
     def export_known_to_file(self, path: Path):
         """Dump current known clues to a JSON file (path)."""
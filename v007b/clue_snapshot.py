@@ -0,0 +1,163 @@
+"""
+Precompiled clue snapshots.
+
+Turns a clue JSON file into a ClueIndex (lookup tables the parser would
+otherwise rebuild on every call) and caches it as a versioned pickle keyed
+by the JSON's content hash. A changed JSON hashes differently, so the next
+load rebuilds the snapshot automatically; stale snapshots are removed.
+
+Compile ahead of time with: python clue_snapshot.py [clues.json ...]
+"""
+
+import hashlib
+import json
+import os
+import pickle
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Bump when ClueIndex layout changes; old snapshots are then ignored
+SNAPSHOT_VERSION = 1
+
+
+class ClueIndex:
+    """
+    Prebuilt lookup tables over a clues dict.
+
+    Attributes:
+        clues (dict): category -> list of clue strings (the loaded JSON)
+        version (str): content hash identifying this clue set
+        entries (tuple): (category, VALUE_UPPER) in file order
+        exact (dict): VALUE_UPPER -> lookup() answer, precomputed for every clue value
+        lowered (dict): category -> list of (value, value_lower)
+        anime_groups_lower (tuple): lower-cased release_groups_anime
+    """
+
+    __slots__ = ("clues", "version", "entries", "exact", "lowered", "anime_groups_lower")
+
+    def __init__(self, clues: Dict[str, List[str]], version: str):
+        self.clues = clues
+        self.version = version
+        self.entries: Tuple[Tuple[str, str], ...] = tuple(
+            (cat, v.upper()) for cat, lst in clues.items() for v in lst
+        )
+        self.lowered: Dict[str, List[Tuple[str, str]]] = {
+            cat: [(v, v.lower()) for v in lst] for cat, lst in clues.items()
+        }
+        self.anime_groups_lower = tuple(v.lower() for v in clues.get("release_groups_anime", []))
+        self.exact: Dict[str, Optional[str]] = {}
+        for _cat, up in self.entries:
+            if up not in self.exact:
+                self.exact[up] = self._scan(up)
+
+    def _scan(self, up: str) -> Optional[str]:
+        for cat, v in self.entries:
+            if up == v or v in up or up in v:
+                return cat
+        return None
+
+    def lookup(self, token: str) -> Optional[str]:
+        """
+        Category of the first clue equal to, contained in, or containing token
+        (case-insensitive); same answer as parser._token_in_clues(token, clues).
+        """
+        up = token.upper()
+        try:
+            return self.exact[up]
+        except KeyError:
+            pass
+        for cat, v in self.entries:
+            if v in up or up in v:
+                return cat
+        return None
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def build_index(clues: Dict[str, List[str]], version: Optional[str] = None) -> ClueIndex:
+    """Build an index for an in-memory clues dict (hashes its JSON form if no version given)."""
+    if version is None:
+        version = content_hash(json.dumps(clues, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+    return ClueIndex(clues, version)
+
+
+def snapshot_path(json_path: Path, digest: str, cache_dir: Path) -> Path:
+    return Path(cache_dir) / f"{Path(json_path).stem}-{digest[:16]}.v{SNAPSHOT_VERSION}.pickle"
+
+
+def _write_snapshot(path: Path, index: ClueIndex) -> None:
+    """Atomically write the snapshot and drop older ones for the same JSON file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with tmp.open("wb") as fh:
+        pickle.dump({"version": SNAPSHOT_VERSION, "index": index}, fh, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+    stem = path.name.rsplit("-", 1)[0]
+    for old in path.parent.glob(f"{stem}-*.pickle"):
+        if old != path:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+
+
+def _read_snapshot(path: Path, digest: str) -> Optional[ClueIndex]:
+    try:
+        with path.open("rb") as fh:
+            payload = pickle.load(fh)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, TypeError):
+        return None
+    if not isinstance(payload, dict):
+        return None
+    index = payload.get("index")
+    if payload.get("version") != SNAPSHOT_VERSION or not isinstance(index, ClueIndex):
+        return None
+    if index.version != digest:
+        return None
+    return index
+
+
+def compile_snapshot(json_path: Path, cache_dir: Path) -> Path:
+    """Compile json_path into a snapshot under cache_dir (no-op if current). Returns the snapshot path."""
+    json_path = Path(json_path)
+    data = json_path.read_bytes()
+    digest = content_hash(data)
+    path = snapshot_path(json_path, digest, cache_dir)
+    if _read_snapshot(path, digest) is None:
+        _write_snapshot(path, ClueIndex(json.loads(data), digest))
+    return path
+
+
+def load_clue_index(json_path: Path, cache_dir: Path, default: Optional[Dict[str, List[str]]] = None) -> ClueIndex:
+    """
+    Load the ClueIndex for json_path, from its snapshot when one matches the
+    file's content hash, otherwise by parsing the JSON and writing a fresh
+    snapshot. A missing file yields an index over `default`.
+    """
+    json_path = Path(json_path)
+    try:
+        data = json_path.read_bytes()
+    except FileNotFoundError:
+        return build_index(default if default is not None else {})
+    digest = content_hash(data)
+    path = snapshot_path(json_path, digest, cache_dir)
+    index = _read_snapshot(path, digest)
+    if index is None:
+        index = ClueIndex(json.loads(data), digest)
+        try:
+            _write_snapshot(path, index)
+        except OSError:
+            pass  # read-only cache dir: still usable, just not cached
+    return index
+
+
+if __name__ == "__main__":
+    import sys
+    import config
+
+    targets = [Path(p) for p in sys.argv[1:]] or [config.CLUES_FILE]
+    for target in targets:
+        out = compile_snapshot(target, config.CLUE_CACHE_DIR)
+        print(f"{target} -> {out}")
@@ -0,0 +1,220 @@
+"""
+Clue suggestions for unknown tokens.
+
+One streaming pass over parse results collects, for every token outside the
+title, where it appears and what surrounds it: before/after the title, last
+in the name, right after a hyphen, inside brackets, the categories of its
+neighbours and of the anchors seen to its left ("right of the resolution").
+Anchors are tokens the parser's own patterns recognise (resolution, codecs,
+AAC, BluRay) or that the clue index already knows.
+
+Known tokens train a feature profile per clue category, on top of small
+seed profiles encoding the usual naming conventions (release group = last
+token after a hyphen, anime group = bracketed prefix, ...). Unknown tokens
+are then scored against every profile (multinomial naive Bayes over their
+averaged features) and the best category is proposed with its posterior as
+confidence. Memory is bounded: only `max_tokens` candidate tokens are kept,
+pruning the least frequent ones when the table is full.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import config
+
+CATEGORIES = ("quality_clues", "release_groups", "release_groups_anime",
+              "audio_clues", "resolution_clues", "misc_clues")
+
+# pseudo-counts per category; learned counts from known tokens are added on top
+SEED_PROFILES: Dict[str, Dict[str, float]] = {
+    "release_groups": {"last": 4, "hyphen": 4, "side:after": 2, "shape:upper": 1, "left:quality_clues": 1},
+    "release_groups_anime": {"bracket": 4, "side:before": 4, "shape:mixed": 1},
+    "audio_clues": {"shape:channels": 4, "after:resolution_clues": 1, "shape:upper": 1, "side:after": 1},
+    "quality_clues": {"after:resolution_clues": 2, "left:resolution_clues": 2, "side:after": 2, "shape:upper": 1},
+    "resolution_clues": {"shape:digits": 3, "side:after": 1},
+    "misc_clues": {"side:after": 1, "shape:mixed": 1, "shape:upper": 1},
+}
+
+# tokens the parser recognises with its own regexes (see parser.PATTERNS)
+_ANCHORS = (
+    (re.compile(r"(?i)^\d{3,4}px?$"), "resolution_clues"),
+    (re.compile(r"(?i)^(?:[hx]\.?26[45]|hevc|avc|blu-?ray|bdrip|bdremux|bdr)$"), "quality_clues"),
+    (re.compile(r"(?i)^aac(?:2\.0|2)?$"), "audio_clues"),
+)
+# hyphens stay inside tokens ("WEB-DL", "DTS-HD"); "DDP5.1" / "7.1" are one token
+_TOKEN_RE = re.compile(r"[^\s._\[\](){}]*?(?<!\d)\d\.\d(?!\d)|[^\s._\[\](){}]+")
+_CHANNELS_RE = re.compile(r"^[A-Za-z]*\d\.\d$|^[A-Za-z]+\d$")
+_EXTENSIONS = {"mkv", "mp4", "avi", "m4v", "ts", "wmv", "mov", "torrent", "srt", "nfo", "sub", "idx"}
+_ALPHA = 1.0
+
+
+class Suggestion(NamedTuple):
+    token: str
+    category: str
+    confidence: float
+    count: int
+
+
+def _shape(token: str) -> str:
+    if _CHANNELS_RE.match(token):
+        return "shape:channels"
+    if token.isdigit() or (any(c.isdigit() for c in token) and len(token) <= 5):
+        return "shape:digits"
+    if token.isupper():
+        return "shape:upper"
+    return "shape:mixed"
+
+
+class ClueSuggester:
+    """
+    Streaming co-occurrence/position statistics and category suggestions.
+
+    Attributes:
+        profiles (dict): category -> Counter of features seen on known tokens
+        tokens (dict): candidate token -> Counter of features (plus "#" = occurrences)
+        results (int): parse results observed
+    """
+
+    def __init__(self, index=None, max_tokens: int = 50_000):
+        self.index = index if index is not None else config.CLUE_INDEX
+        self.max_tokens = max_tokens
+        self.profiles: Dict[str, Counter] = {c: Counter() for c in CATEGORIES}
+        self.tokens: Dict[str, Counter] = {}
+        self.results = 0
+
+    @staticmethod
+    def _anchor(token: str) -> Optional[str]:
+        for regex, cat in _ANCHORS:
+            if regex.match(token):
+                return cat
+        return None
+
+    def _category(self, token: str) -> Optional[str]:
+        return self._anchor(token) or self.index.lookup(token)
+
+    def observe(self, meta: Dict[str, Any]) -> None:
+        """Add one parse result (a value of parse_directory()["raw"])."""
+        self.results += 1
+        name = meta.get("original", "")
+        title = meta.get("possible_title") or ""
+        t_start = name.find(title) if title else -1
+        t_end = t_start + len(title) if t_start >= 0 else -1
+        title_words = {w.upper() for w in (meta.get("clean_title") or "").split()}
+        clue_words = {c.upper() for key in ("tv_clues", "anime_clues", "movie_clues")
+                      for c in meta.get(key, [])}
+
+        spans = []
+        matches = list(_TOKEN_RE.finditer(name))
+        for n, m in enumerate(matches):
+            tok, start = m.group(), m.start()
+            if tok.lower() in _EXTENSIONS and name[start - 1:start] == ".":
+                continue
+            # split "x264-REWARD" (the hyphen introduces a release group) but keep "WEB-DL", "DTS-HD"
+            parts = tok.split("-")
+            if len(parts) > 1 and (n == len(matches) - 1 or any(self._anchor(p) for p in parts)):
+                for part in parts:
+                    if part:
+                        spans.append((part, start))
+                    start += len(part) + 1
+            else:
+                spans.append((tok.strip("-"), start + len(tok) - len(tok.lstrip("-"))))
+        # (token, start, category or None, skip) ; skip = title words, numbers, parser clues
+        toks: List[Tuple[str, int, Optional[str], bool]] = []
+        for tok, start in spans:
+            in_title = t_start <= start < t_end if t_start >= 0 else tok.upper() in title_words
+            skip = in_title or tok.isdigit() or tok.upper() in clue_words or len(tok) < 2
+            toks.append((tok, start, None if skip else self._category(tok), skip))
+
+        seen: List[str] = []
+        last = len(toks) - 1
+        for i, (tok, start, cat, skip) in enumerate(toks):
+            if skip:
+                continue
+            feats = ["side:before" if 0 <= start < t_start else "side:after", _shape(tok)]
+            if i == last:
+                feats.append("last")
+            if start > 0 and name[start - 1] == "-":
+                feats.append("hyphen")
+            if name.rfind("[", 0, start) > name.rfind("]", 0, start) or \
+                    name.rfind("(", 0, start) > name.rfind(")", 0, start):
+                feats.append("bracket")
+            left = toks[i - 1][2] if i > 0 else None
+            right = toks[i + 1][2] if i < last else None
+            feats.append(f"left:{left}")
+            feats.append(f"right:{right}")
+            feats.extend(f"after:{c}" for c in seen)
+            if cat is not None:
+                self.profiles.setdefault(cat, Counter()).update(feats)
+                if cat not in seen:
+                    seen.append(cat)
+            else:
+                stats = self.tokens.get(tok)
+                if stats is None:
+                    if len(self.tokens) >= self.max_tokens:
+                        self._prune()
+                    stats = self.tokens[tok] = Counter()
+                stats["#"] += 1
+                stats.update(feats)
+
+    def feed(self, results: Iterable[Dict[str, Any]]) -> "ClueSuggester":
+        """observe() every parse result of an iterable (e.g. parse_directory()["raw"].values())."""
+        for meta in results:
+            self.observe(meta)
+        return self
+
+    def _prune(self) -> None:
+        """Keep the more frequent half of the candidate table."""
+        keep = sorted(self.tokens.items(), key=lambda kv: -kv[1]["#"])[: self.max_tokens // 2]
+        self.tokens = dict(keep)
+
+    def _log_likelihoods(self) -> Dict[str, Dict[str, float]]:
+        vocab = set()
+        totals = {}
+        merged = {}
+        for cat in CATEGORIES:
+            counts = Counter(SEED_PROFILES.get(cat, {}))
+            counts.update(self.profiles.get(cat, {}))
+            merged[cat] = counts
+            vocab.update(counts)
+            totals[cat] = sum(counts.values())
+        for stats in self.tokens.values():
+            vocab.update(stats)
+        vocab.discard("#")  # the occurrence count, not a feature
+        v = len(vocab)
+        return {cat: {f: math.log((merged[cat].get(f, 0) + _ALPHA) / (totals[cat] + _ALPHA * v))
+                      for f in vocab}
+                for cat in CATEGORIES}
+
+    def suggest(self, min_confidence: float = 0.6, min_count: int = 2,
+                limit: Optional[int] = None) -> List[Suggestion]:
+        """
+        Propose a category for every candidate token seen at least min_count times.
+
+        Returns:
+            suggestions with confidence >= min_confidence, most frequent tokens first
+        """
+        loglik = self._log_likelihoods()
+        out: List[Suggestion] = []
+        for tok, stats in self.tokens.items():
+            n = stats["#"]
+            if n < min_count:
+                continue
+            scores = {}
+            for cat, table in loglik.items():
+                scores[cat] = sum(c * table[f] for f, c in stats.items() if f != "#") / n
+            top = max(scores.values())
+            norm = sum(math.exp(s - top) for s in scores.values())
+            best = max(scores, key=scores.get)
+            confidence = 1.0 / norm
+            if confidence >= min_confidence:
+                out.append(Suggestion(tok, best, round(confidence, 3), n))
+        out.sort(key=lambda s: (-s.count, -s.confidence, s.token))
+        return out[:limit] if limit is not None else out
+
+
+def suggest_clues(parsed_raw: Dict[str, Dict], min_confidence: float = 0.6,
+                  min_count: int = 2) -> List[Suggestion]:
+    """Suggestions for one scan (parse_directory()["raw"])."""
+    return ClueSuggester().feed(parsed_raw.values()).suggest(min_confidence, min_count)
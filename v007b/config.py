@@ -3,24 +3,44 @@ Load configuration (env + clues JSON).
 
 Prefer .env for simple environment values and config/clues.json for
 the evolving list of known clues.
+
+Everything below BASE_DIR/PROJECT_ROOT is resolved lazily on first
+attribute access (module __getattr__), so `import config` does no I/O:
+.env is read, paths are resolved and clues.json is parsed only when a
+caller actually asks for them, and nothing is written to disk. Use
+ensure_output_dir() before writing into OUTPUT_DIR.
 """
 import os
-import json
 from pathlib import Path
 
-# Try to load .env if python-dotenv is available (optional)
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except Exception:
-    pass  # dotenv not installed; rely on environment vars
-
 # base dir = folder containing this file (v007b)
 BASE_DIR = Path(__file__).parent.resolve()
 PROJECT_ROOT = BASE_DIR.parent
 
+_dotenv_loaded = False
+
+
+def _load_dotenv():
+    """Load .env once, if python-dotenv is available (optional)."""
+    global _dotenv_loaded
+    if _dotenv_loaded:
+        return
+    _dotenv_loaded = True
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except Exception:
+        pass  # dotenv not installed; rely on environment vars
+
+
+def getenv(name: str, default: str) -> str:
+    """os.getenv after .env has been loaded."""
+    _load_dotenv()
+    return os.getenv(name, default)
+
+
 def resolve_env_path(name: str, default):
-    raw = os.getenv(name)
+    raw = getenv(name, "")
     if raw:
         p = Path(raw)
     else:
@@ -29,28 +49,113 @@ def resolve_env_path(name: str, default):
         return (BASE_DIR / p).resolve()
     return p.resolve()
 
-SOURCE_DIR = resolve_env_path("SOURCE_DIR", BASE_DIR / "sample_media")
-OUTPUT_DIR = resolve_env_path("OUTPUT_DIR", BASE_DIR / "output")
-CLUES_FILE = resolve_env_path("CLUES_FILE", BASE_DIR / "config" / "clues.json")
-UNKNOWN_FILE = resolve_env_path("UNKNOWN_FILE", BASE_DIR / "data" / "unknown_clues.json")
-
-# Token bucket defaults (if needed)
-TOKENS_PER_SECOND = float(os.getenv("TOKENS_PER_SECOND", "5"))
-TOKEN_BUCKET_CAPACITY = int(os.getenv("TOKEN_BUCKET_CAPACITY", "10"))
-
-# Load clues from CLUES_FILE (fallback to defaults if missing)
-if CLUES_FILE.exists():
-    with CLUES_FILE.open("r", encoding="utf-8") as fh:
-        CLUES = json.load(fh)
-else:
-    CLUES = {
-        "quality_clues": [],
-        "release_groups": [],
-        "release_groups_anime": [],
-        "audio_clues": [],
-        "resolution_clues": [],
-        "misc_clues": []
-    }
-
-# Ensure output directory exists
-OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+DEFAULT_CLUES = {
+    "quality_clues": [],
+    "release_groups": [],
+    "release_groups_anime": [],
+    "audio_clues": [],
+    "resolution_clues": [],
+    "misc_clues": []
+}
+
+
+def load_clues(path: Path = None) -> dict:
+    """Load clues from CLUES_FILE (fallback to defaults if missing)."""
+    return load_clue_index(path).clues
+
+
+def load_clue_index(path: Path = None):
+    """
+    ClueIndex for path (default CLUES_FILE), served from the precompiled
+    snapshot in CLUE_CACHE_DIR when it matches the file's content hash.
+    """
+    from clue_snapshot import load_clue_index as _load
+    path = Path(path) if path is not None else _get("CLUES_FILE")
+    return _load(path, _get("CLUE_CACHE_DIR"), default={k: list(v) for k, v in DEFAULT_CLUES.items()})
+
+
+def _clue_index():
+    # CLUES already loaded (and possibly edited by ClueManager): index that dict
+    if "CLUES" in globals():
+        from clue_snapshot import build_index
+        return build_index(globals()["CLUES"])
+    return load_clue_index()
+
+
+def invalidate_clue_index():
+    """Drop the cached CLUE_INDEX after CLUES was modified in place; rebuilt on next access."""
+    globals().pop("CLUE_INDEX", None)
+
+
+def ensure_output_dir() -> Path:
+    """Create OUTPUT_DIR if needed and return it."""
+    out = _get("OUTPUT_DIR")
+    out.mkdir(parents=True, exist_ok=True)
+    return out
+
+
+# name -> factory, evaluated on first access and then cached as a module global
+_LAZY = {
+    "SOURCE_DIR": lambda: resolve_env_path("SOURCE_DIR", BASE_DIR / "sample_media"),
+    "OUTPUT_DIR": lambda: resolve_env_path("OUTPUT_DIR", BASE_DIR / "output"),
+    "CLUES_FILE": lambda: resolve_env_path("CLUES_FILE", BASE_DIR / "config" / "clues.json"),
+    "UNKNOWN_FILE": lambda: resolve_env_path("UNKNOWN_FILE", BASE_DIR / "data" / "unknown_clues.json"),
+    "CLUE_CACHE_DIR": lambda: resolve_env_path("CLUE_CACHE_DIR", BASE_DIR / ".cache"),
+    "DB_FILE": lambda: resolve_env_path("DB_FILE", BASE_DIR / "data" / "media_library.sqlite"),
+    "RANK_WEIGHTS_FILE": lambda: resolve_env_path("RANK_WEIGHTS_FILE", BASE_DIR / "config" / "rank_weights.json"),
+
+    # Token bucket defaults for scan I/O throttling (see rate_limiter.py)
+    "TOKENS_PER_SECOND": lambda: float(getenv("TOKENS_PER_SECOND", "5")),
+    "TOKEN_BUCKET_CAPACITY": lambda: int(getenv("TOKEN_BUCKET_CAPACITY", "10")),
+    "BYTES_PER_SECOND": lambda: float(getenv("BYTES_PER_SECOND", "0")),  # 0 = unlimited
+    "BYTES_BUCKET_CAPACITY": lambda: int(getenv("BYTES_BUCKET_CAPACITY", "0")),
+
+    # Parser service (long-running daemon on a Unix socket)
+    "PARSER_SOCKET": lambda: resolve_env_path("PARSER_SOCKET", _get("OUTPUT_DIR") / "parser.sock"),
+    "SERVICE_WORKERS": lambda: int(getenv("SERVICE_WORKERS", str(os.cpu_count() or 2))),
+    "SERVICE_BATCH_SIZE": lambda: int(getenv("SERVICE_BATCH_SIZE", "256")),
+    "SERVICE_BATCH_WINDOW_MS": lambda: float(getenv("SERVICE_BATCH_WINDOW_MS", "2")),
+    "SERVICE_QUEUE_SIZE": lambda: int(getenv("SERVICE_QUEUE_SIZE", "1024")),
+
+    # Bulk ingestion of path listings (see ingest.py)
+    "INGEST_WORKERS": lambda: int(getenv("INGEST_WORKERS", str(os.cpu_count() or 2))),
+    "INGEST_CHUNK_BYTES": lambda: int(getenv("INGEST_CHUNK_BYTES", str(1 << 20))),
+
+    # Pipelined scans (see scan_pipeline.py)
+    "PIPELINE_WORKERS": lambda: int(getenv("PIPELINE_WORKERS", str(os.cpu_count() or 2))),
+    "PIPELINE_BATCH_SIZE": lambda: int(getenv("PIPELINE_BATCH_SIZE", "256")),
+    "PIPELINE_QUEUE_SIZE": lambda: int(getenv("PIPELINE_QUEUE_SIZE", "8")),
+
+    # Entries in parser's token classification memo
+    "TOKEN_MEMO_SIZE": lambda: int(getenv("TOKEN_MEMO_SIZE", "65536")),
+
+    # Guarded parsing for callers that opt in (see parser.guarded_parse); 0 = unlimited
+    "PARSE_MAX_LENGTH": lambda: int(getenv("PARSE_MAX_LENGTH", "1024")),
+    "PARSE_OP_BUDGET": lambda: int(getenv("PARSE_OP_BUDGET", "50000")),
+    "PARSE_QUARANTINE_FILE": lambda: resolve_env_path("PARSE_QUARANTINE_FILE", _get("OUTPUT_DIR") / "quarantine.jsonl"),
+
+    "CLUE_INDEX": _clue_index,
+    "CLUES": lambda: _get("CLUE_INDEX").clues,
+}
+
+
+def _get(name: str):
+    """Module-internal access to a lazy value (globals() lookups bypass __getattr__)."""
+    if name in globals():
+        return globals()[name]
+    return __getattr__(name)
+
+
+def __getattr__(name: str):
+    try:
+        factory = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = factory()
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
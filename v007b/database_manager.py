@@ -0,0 +1,341 @@
+"""
+database_manager.py
+
+Handles all SQLite database operations for storing media groups and their paths.
+This keeps all SQL logic separate from the parsing and processing logic.
+
+Uses the same media_groups/media_paths schema as v007c so both write the
+same media_library.sqlite (config.DB_FILE).
+"""
+
+import sqlite3
+from itertools import groupby
+from typing import Any, Dict, Iterable
+
+
+def setup_database(db_path: str) -> sqlite3.Connection:
+    """Creates the database and tables if they don't exist and returns a connection."""
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("PRAGMA foreign_keys = ON")
+    cursor = conn.cursor()
+
+    # Table for the media "group" - the unique media item
+    # e.g., "The Matrix", "movie", 1999
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS media_groups (
+        id INTEGER PRIMARY KEY,
+        clean_title TEXT NOT NULL,
+        media_type TEXT NOT NULL,
+        year INTEGER,
+        UNIQUE(clean_title, media_type, year)
+    )
+    """)
+
+    # Table for the individual file/folder paths associated with a group
+    # e.g., "/path/to/The.Matrix.1999.1080p.mkv"
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS media_paths (
+        id INTEGER PRIMARY KEY,
+        group_id INTEGER NOT NULL,
+        full_path TEXT NOT NULL UNIQUE,
+        FOREIGN KEY (group_id) REFERENCES media_groups (id) ON DELETE CASCADE
+    )
+    """)
+    conn.commit()
+    return conn
+
+
+def save_groups_to_db(grouped_data: Dict[tuple, Dict[str, Any]], db_path: str,
+                      quiet: bool = False) -> Dict[tuple, int]:
+    """
+    Saves the grouped media data (dir_processor.group_results) to the SQLite database.
+    It inserts or updates data, ensuring no duplicates.
+
+    Returns:
+        group key -> media_groups.id (groups without a title are skipped)
+    """
+    conn = setup_database(db_path)
+    cursor = conn.cursor()
+
+    if not quiet:
+        print(f"Syncing {len(grouped_data)} media groups with the database...")
+
+    ids: Dict[tuple, int] = {}
+    for key, group_info in grouped_data.items():
+        if not key[0]:
+            continue
+        ids[key] = _sync_group(cursor, key, group_info["paths"])
+
+    conn.commit()
+    conn.close()
+    if not quiet:
+        print("Database sync complete.")
+    return ids
+
+
+def _sync_group(cursor: sqlite3.Cursor, key: tuple, paths: Iterable[str]) -> int:
+    """Insert one group (if new) and its paths; returns media_groups.id."""
+    title, mtype, year = key
+
+    # Look the group up first: UNIQUE(clean_title, media_type, year) treats
+    # NULL years as distinct, so INSERT OR IGNORE would add a tv/anime group
+    # (no year) again on every sync. Older databases may already hold such
+    # duplicates; the first one keeps the paths.
+    cursor.execute(
+        "SELECT id FROM media_groups WHERE clean_title = ? AND media_type = ? AND year IS ? ORDER BY id LIMIT 1",
+        (title, mtype, year)
+    )
+    row = cursor.fetchone()
+    if row:
+        group_id = row[0]
+    else:
+        cursor.execute(
+            "INSERT INTO media_groups (clean_title, media_type, year) VALUES (?, ?, ?)",
+            (title, mtype, year)
+        )
+        group_id = cursor.lastrowid
+
+    # Insert all associated paths for this group
+    cursor.executemany(
+        "INSERT OR IGNORE INTO media_paths (group_id, full_path) VALUES (?, ?)",
+        [(group_id, path) for path in paths]
+    )
+    return group_id
+
+
+def setup_scan_table(conn: sqlite3.Connection) -> None:
+    """
+    Creates the temporary scan_paths table a pipelined scan stages its results in.
+
+    One row per parsed path, seq being its position in the walk. year has no
+    declared type so movie_clues years keep the str type group_results gives
+    them until merge_scan_paths binds them like save_groups_to_db does.
+    """
+    conn.execute("""
+    CREATE TEMP TABLE IF NOT EXISTS scan_paths (
+        seq INTEGER PRIMARY KEY,
+        full_path TEXT NOT NULL UNIQUE,
+        clean_title TEXT,
+        media_type TEXT NOT NULL,
+        year
+    )
+    """)
+
+
+def stage_scan_paths(conn: sqlite3.Connection, rows: Iterable[tuple]) -> None:
+    """
+    Stages (seq, full_path, clean_title, media_type, year) rows, without committing.
+
+    A path seen again keeps its first seq but takes the latest group key, as
+    re-assigning raw[path] does in dir_processor.
+    """
+    conn.executemany(
+        "INSERT INTO scan_paths (seq, full_path, clean_title, media_type, year) VALUES (?, ?, ?, ?, ?) "
+        "ON CONFLICT (full_path) DO UPDATE SET "
+        "clean_title = excluded.clean_title, media_type = excluded.media_type, year = excluded.year",
+        rows
+    )
+
+
+def merge_scan_paths(conn: sqlite3.Connection, quiet: bool = False) -> Dict[tuple, int]:
+    """
+    Moves the staged paths into media_groups / media_paths and commits.
+
+    Groups are written in the order of their first path and each group's
+    paths in walk order, which is the order save_groups_to_db writes the
+    groups of dir_processor.group_results, so both produce the same rows
+    and ids. The staged rows are removed.
+
+    Returns:
+        group key -> media_groups.id (groups without a title are skipped)
+    """
+    cursor = conn.cursor()
+    if not quiet:
+        count = conn.execute(
+            "SELECT COUNT(*) FROM (SELECT DISTINCT clean_title, media_type, year FROM scan_paths)"
+        ).fetchone()[0]
+        print(f"Syncing {count} media groups with the database...")
+
+    staged = conn.execute("""
+    SELECT clean_title, media_type, year, full_path FROM (
+        SELECT *, MIN(seq) OVER (PARTITION BY clean_title, media_type, year) AS first_seq FROM scan_paths
+    )
+    ORDER BY first_seq, seq
+    """)
+    ids: Dict[tuple, int] = {}
+    for key, rows in groupby(staged, key=lambda row: row[:3]):
+        if not key[0]:
+            continue
+        ids[key] = _sync_group(cursor, key, [row[3] for row in rows])
+
+    conn.execute("DELETE FROM scan_paths")
+    conn.commit()
+    if not quiet:
+        print("Database sync complete.")
+    return ids
+
+
+def setup_gap_table(conn: sqlite3.Connection) -> None:
+    """Creates the episode_gaps table (one row per missing range, see gap_detector)."""
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS episode_gaps (
+        id INTEGER PRIMARY KEY,
+        group_id INTEGER NOT NULL,
+        season INTEGER,
+        first_missing INTEGER,
+        last_missing INTEGER,
+        missing_count INTEGER,
+        detected_at TEXT NOT NULL DEFAULT (datetime('now')),
+        FOREIGN KEY (group_id) REFERENCES media_groups (id) ON DELETE CASCADE
+    )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_episode_gaps_group ON episode_gaps (group_id, season)")
+    conn.commit()
+
+
+def save_gaps_to_db(gaps: Dict[tuple, list], group_ids: Dict[tuple, int], db_path: str) -> int:
+    """
+    Replaces the stored gaps of every group in group_ids with `gaps`.
+
+    Args:
+        gaps: group key -> list of gap_detector.Gap
+        group_ids: group key -> media_groups.id, as returned by save_groups_to_db
+        db_path: database file
+
+    Returns:
+        number of gap rows written
+
+    Groups that were scanned but have no gaps get their old rows removed,
+    so the table always reflects the latest scan. Example query:
+
+        SELECT g.clean_title, e.season, e.first_missing, e.last_missing
+        FROM episode_gaps e JOIN media_groups g ON g.id = e.group_id
+        ORDER BY g.clean_title, e.season, e.first_missing
+    """
+    conn = setup_database(db_path)
+    setup_gap_table(conn)
+    cursor = conn.cursor()
+    cursor.executemany("DELETE FROM episode_gaps WHERE group_id = ?",
+                       [(group_id,) for group_id in group_ids.values()])
+    rows = [(group_ids[key], gap.season, gap.first, gap.last, gap.count)
+            for key, show_gaps in gaps.items() if key in group_ids
+            for gap in show_gaps]
+    cursor.executemany(
+        "INSERT INTO episode_gaps (group_id, season, first_missing, last_missing, missing_count) VALUES (?, ?, ?, ?, ?)",
+        rows
+    )
+    conn.commit()
+    conn.close()
+    return len(rows)
+
+
+def setup_best_table(conn: sqlite3.Connection) -> None:
+    """Creates the best_releases table (the top-ranked path of each group, see quality_ranker)."""
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS best_releases (
+        group_id INTEGER PRIMARY KEY,
+        full_path TEXT NOT NULL,
+        score REAL NOT NULL,
+        resolution TEXT,
+        source TEXT,
+        codec TEXT,
+        audio TEXT,
+        hdr TEXT,
+        ranked_at TEXT NOT NULL DEFAULT (datetime('now')),
+        FOREIGN KEY (group_id) REFERENCES media_groups (id) ON DELETE CASCADE
+    )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_best_releases_path ON best_releases (full_path)")
+    conn.commit()
+
+
+def save_best_to_db(best: Dict[tuple, Any], group_ids: Dict[tuple, int], db_path: str) -> int:
+    """
+    Stores the best release of every ranked group, replacing the previous winner.
+
+    Args:
+        best: group key -> quality_ranker.Rank
+        group_ids: group key -> media_groups.id, as returned by save_groups_to_db
+        db_path: database file
+
+    Returns:
+        number of rows written
+
+    Lookups go through the group_id primary key (or the full_path index):
+
+        SELECT g.clean_title, b.full_path, b.score
+        FROM best_releases b JOIN media_groups g ON g.id = b.group_id
+        WHERE g.clean_title = ?
+    """
+    conn = setup_database(db_path)
+    setup_best_table(conn)
+    rows = [(group_ids[key], rank.path, rank.score,
+             rank.features.get("resolution"), rank.features.get("source"), rank.features.get("codec"),
+             rank.features.get("audio"), rank.features.get("hdr"))
+            for key, rank in best.items() if key in group_ids]
+    conn.executemany(
+        "INSERT OR REPLACE INTO best_releases (group_id, full_path, score, resolution, source, codec, audio, hdr) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        rows
+    )
+    conn.commit()
+    conn.close()
+    return len(rows)
+
+
+def setup_size_tables(conn: sqlite3.Connection) -> None:
+    """Creates path_sizes (bytes per scanned path) and group_sizes (bytes per group, see disk_usage)."""
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS path_sizes (
+        full_path TEXT PRIMARY KEY,
+        size_bytes INTEGER NOT NULL,
+        measured_at TEXT NOT NULL DEFAULT (datetime('now'))
+    )
+    """)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS group_sizes (
+        group_id INTEGER PRIMARY KEY,
+        total_bytes INTEGER NOT NULL,
+        path_count INTEGER NOT NULL,
+        measured_at TEXT NOT NULL DEFAULT (datetime('now')),
+        FOREIGN KEY (group_id) REFERENCES media_groups (id) ON DELETE CASCADE
+    )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_group_sizes_total ON group_sizes (total_bytes DESC)")
+    conn.commit()
+
+
+def save_sizes_to_db(sizes: Dict[str, int], group_totals: Dict[tuple, int],
+                     grouped_data: Dict[tuple, Dict[str, Any]], group_ids: Dict[tuple, int],
+                     db_path: str) -> int:
+    """
+    Stores per-path and per-group byte totals of a scan, replacing earlier measurements.
+
+    Args:
+        sizes: absolute path -> bytes (parse_directory(..., sizes=True)["sizes"])
+        group_totals: group key -> bytes (disk_usage.group_bytes)
+        grouped_data: the scan's groups, for the path counts
+        group_ids: group key -> media_groups.id, as returned by save_groups_to_db
+        db_path: database file
+
+    Returns:
+        number of group rows written
+
+    "Largest shows" is an indexed query:
+
+        SELECT g.clean_title, s.total_bytes
+        FROM group_sizes s JOIN media_groups g ON g.id = s.group_id
+        WHERE g.media_type = 'tv'
+        ORDER BY s.total_bytes DESC LIMIT 10
+    """
+    conn = setup_database(db_path)
+    setup_size_tables(conn)
+    conn.executemany("INSERT OR REPLACE INTO path_sizes (full_path, size_bytes) VALUES (?, ?)",
+                     sizes.items())
+    rows = [(group_ids[key], total, len(grouped_data[key]["paths"]))
+            for key, total in group_totals.items() if key in group_ids]
+    conn.executemany("INSERT OR REPLACE INTO group_sizes (group_id, total_bytes, path_count) VALUES (?, ?, ?)",
+                     rows)
+    conn.commit()
+    conn.close()
+    return len(rows)
@@ -2,51 +2,229 @@
 Directory processing: scan root folders or files and group parsed results.
 """
 
+import os
 from pathlib import Path
-from collections import defaultdict
-from typing import Dict, Any, List
-from parser import parse_filename
+from collections import defaultdict, deque
+from typing import Dict, Any, List, Optional, Tuple
+from parser import parse_filename, parse_with_context, directory_context
+from batch_parser import parse_siblings
+from fuzzy_grouping import merge_near_duplicates
+from rate_limiter import IOScheduler
+from disk_usage import DiskUsage, entry_bytes
 
+# (name, resolved path if the entry matches the scan mode else None, subdir path to descend into or None)
+_Entry = Tuple[str, Optional[str], Optional[str]]
 
-def parse_directory(source_dir: str, mode: str = "dirs", quiet: bool = True) -> Dict[str, Any]:
+
+def _check_mode(mode: str) -> None:
+    if mode not in ("dirs", "files"):
+        raise ValueError("mode must be 'dirs' or 'files'")
+
+
+def _scan_dir(directory: str, mode: str, recursive: bool,
+              limiter: Optional[IOScheduler] = None, usage: Optional[DiskUsage] = None) -> List[_Entry]:
+    """
+    List one directory (the only blocking I/O of a scan).
+
+    Uses os.scandir so the entry type usually comes from the directory
+    listing itself instead of a separate stat per child. With a limiter,
+    the listing and each path resolution take a metadata token first.
+    With usage, entry sizes from the DirEntry stat cache are recorded.
+    """
+    entries: List[_Entry] = []
+    own = 0
+    sizes: Dict[str, int] = {}
+    dirs: Dict[str, str] = {}
+    if limiter is not None:
+        limiter.metadata()
+    with os.scandir(directory) as it:
+        for entry in it:
+            try:
+                is_dir = entry.is_dir()
+                wanted = is_dir if mode == "dirs" else entry.is_file()
+                # don't follow directory symlinks when descending (avoids cycles)
+                descend = recursive and is_dir and not entry.is_symlink()
+                size = entry_bytes(entry, descend, limiter) if usage is not None else 0
+            except OSError:
+                continue
+            if wanted and limiter is not None:
+                limiter.metadata()
+            resolved = str(Path(entry.path).resolve()) if wanted else None
+            if wanted or descend:
+                entries.append((entry.name, resolved, entry.path if descend else None))
+            own += size
+            if usage is not None and wanted:
+                if descend:
+                    dirs[resolved] = entry.path
+                else:
+                    # a symlink (0 bytes) and its target resolve to the same path
+                    sizes[resolved] = max(size, sizes.get(resolved, 0))
+    if usage is not None:
+        usage.add_listing(directory, own, [subdir for _n, _r, subdir in entries if subdir is not None],
+                          sizes, dirs)
+    return entries
+
+
+def _parse_listing(entries: List[_Entry], quiet: bool, raw: Dict[str, Dict]) -> None:
+    """Parse the matching entries of one listing together (siblings share work, see batch_parser)."""
+    wanted = [(name, resolved) for name, resolved, _subdir in entries if resolved is not None]
+    results = parse_siblings([n for n, _r in wanted], quiet=quiet, guarded=True)
+    for (name, resolved), result in zip(wanted, results):
+        result["path"] = resolved
+        raw[resolved] = result
+
+
+def _parse_entry(name: str, subdir: Optional[str], context: Optional[Dict],
+                 quiet: bool) -> Tuple[Dict, Optional[Dict]]:
+    """Hierarchical mode: parse one entry; returns (result, context for its children if it is a directory)."""
+    result = parse_with_context(name, context, quiet=quiet, guarded=True)
+    if subdir is None:
+        return result, None
+    result = directory_context(result, context)
+    return result, result
+
+
+def group_key(meta: Dict[str, Any]) -> tuple:
+    """The (clean_title, media_type, year) group of one parse result."""
+    media_type = ("tv" if meta["tv_clues"] else
+                  "anime" if meta["anime_clues"] else
+                  "movie" if meta["movie_clues"] else "unknown")
+    year = meta["movie_clues"][0] if meta["movie_clues"] else None
+    return meta["clean_title"], media_type, year
+
+
+def group_results(raw: Dict[str, Dict], fuzzy: bool = False) -> Dict[tuple, Dict[str, Any]]:
+    """
+    Group parse results by (clean_title, media_type, year).
+
+    With fuzzy=True, groups whose titles differ only in case/punctuation or
+    are near-duplicates are merged (see fuzzy_grouping.merge_near_duplicates).
+    """
+    buckets = defaultdict(lambda: {"paths": [], "media_type": None, "year": None})
+    for path, meta in raw.items():
+        key = group_key(meta)
+        _title, media_type, year = key
+        buckets[key]["paths"].append(path)
+        buckets[key]["media_type"] = media_type
+        buckets[key]["year"] = year
+
+    grouped = {k: v for k, v in buckets.items()}
+    if fuzzy:
+        grouped = merge_near_duplicates(grouped)
+    return grouped
+
+
+def _scan_result(raw: Dict[str, Dict], fuzzy: bool, usage: Optional[DiskUsage]) -> Dict[str, Any]:
+    result = {"raw": raw, "grouped": group_results(raw, fuzzy=fuzzy)}
+    if usage is not None:
+        result["sizes"] = usage.path_sizes()
+    return result
+
+
+def parse_directory(source_dir: str, mode: str = "dirs", quiet: bool = True,
+                    recursive: bool = False, limiter: Optional[IOScheduler] = None,
+                    fuzzy: bool = False, hierarchical: bool = False,
+                    sizes: bool = False) -> Dict[str, Any]:
     """
     Parse the immediate children of source_dir.
 
+    Names are parsed guarded (parser.guarded_parse), so one pathological
+    name gets a degraded result instead of stalling the scan.
+
     Args:
         source_dir: path to scan
         mode: "dirs" (default) or "files"
         quiet: if True, parser runs without console prints
+        recursive: also parse matching entries of all subdirectories
+        limiter: optional IOScheduler throttling filesystem operations
+        fuzzy: merge near-duplicate titles when grouping
+        hierarchical: parse each directory once and pass its result down as
+            context, so episode files reuse the folder's title (see
+            parser.parse_with_context); mostly useful with recursive=True
+        sizes: also measure disk usage during the walk (see disk_usage)
 
     Returns:
         dict with:
           - raw: mapping absolute_path -> parse result dict
           - grouped: mapping (clean_title, media_type, year) -> dict(paths: [...], meta: {...})
+          - sizes (with sizes=True): mapping absolute_path -> bytes, for every path of raw
     """
-    root = Path(source_dir)
+    _check_mode(mode)
     raw: Dict[str, Dict] = {}
-    if mode == "dirs":
-        items = [p for p in root.iterdir() if p.is_dir()]
-    elif mode == "files":
-        items = [p for p in root.iterdir() if p.is_file()]
-    else:
-        raise ValueError("mode must be 'dirs' or 'files'")
+    usage = DiskUsage() if sizes else None
+    pending: "deque[Tuple[str, Optional[Dict]]]" = deque([(str(Path(source_dir)), None)])
+    while pending:
+        directory, context = pending.popleft()
+        entries = _scan_dir(directory, mode, recursive, limiter, usage)
+        if not hierarchical:
+            _parse_listing(entries, quiet, raw)
+            pending.extend((subdir, None) for _n, _r, subdir in entries if subdir is not None)
+            continue
+        for name, resolved, subdir in entries:
+            result, child_context = _parse_entry(name, subdir, context, quiet)
+            if resolved is not None:
+                result["path"] = resolved
+                raw[resolved] = result
+            if subdir is not None:
+                pending.append((subdir, child_context))
 
-    for p in items:
-        result = parse_filename(p.name, quiet=quiet)
-        result["path"] = str(p.resolve())
-        raw[str(p.resolve())] = result
+    return _scan_result(raw, fuzzy, usage)
 
-    grouped: Dict[tuple, Dict[str, Any]] = {}
-    buckets = defaultdict(lambda: {"paths": [], "media_type": None, "year": None})
-    for path, meta in raw.items():
-        media_type = ("tv" if meta["tv_clues"] else
-                      "anime" if meta["anime_clues"] else
-                      "movie" if meta["movie_clues"] else "unknown")
-        year = meta["movie_clues"][0] if meta["movie_clues"] else None
-        key = (meta["clean_title"], media_type, year)
-        buckets[key]["paths"].append(path)
-        buckets[key]["media_type"] = media_type
-        buckets[key]["year"] = year
 
-    grouped = {k: v for k, v in buckets.items()}
-    return {"raw": raw, "grouped": grouped}
+async def aparse_directory(source_dir: str, mode: str = "dirs", quiet: bool = True,
+                           recursive: bool = False, concurrency: int = 32,
+                           limiter: Optional[IOScheduler] = None,
+                           fuzzy: bool = False, hierarchical: bool = False,
+                           sizes: bool = False) -> Dict[str, Any]:
+    """
+    Async variant of parse_directory for high-latency (SMB/NFS) mounts.
+
+    Directory listings run concurrently in a thread pool of `concurrency`
+    workers, so their latency overlaps; each listing is parsed on the event
+    loop as soon as it arrives. Returns the same {"raw", "grouped"} shape as
+    parse_directory (for a non-recursive scan, with identical contents).
+
+    Args:
+        source_dir: path to scan
+        mode: "dirs" (default) or "files"
+        quiet: if True, parser runs without console prints
+        recursive: also parse matching entries of all subdirectories
+        concurrency: max directory listings in flight
+        limiter: optional IOScheduler shared by all listing threads
+        fuzzy: merge near-duplicate titles when grouping
+        hierarchical: pass directory results down as context (see parse_directory)
+        sizes: also measure disk usage during the walk (see parse_directory)
+    """
+    # imported here: asyncio alone would triple the import time of this module
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    _check_mode(mode)
+    loop = asyncio.get_running_loop()
+    raw: Dict[str, Dict] = {}
+    usage = DiskUsage() if sizes else None
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="scan") as pool:
+        async def visit(directory: str, context: Optional[Dict]) -> None:
+            entries = await loop.run_in_executor(pool, _scan_dir, directory, mode, recursive,
+                                                 limiter, usage)
+            if not hierarchical:
+                _parse_listing(entries, quiet, raw)
+                subdirs = [(subdir, None) for _n, _r, subdir in entries if subdir is not None]
+                if subdirs:
+                    await asyncio.gather(*(visit(d, c) for d, c in subdirs))
+                return
+            subdirs = []
+            for name, resolved, subdir in entries:
+                result, child_context = _parse_entry(name, subdir, context, quiet)
+                if resolved is not None:
+                    result["path"] = resolved
+                    raw[resolved] = result
+                if subdir is not None:
+                    subdirs.append((subdir, child_context))
+            if subdirs:
+                await asyncio.gather(*(visit(d, c) for d, c in subdirs))
+
+        await visit(str(Path(source_dir)), None)
+
+    return _scan_result(raw, fuzzy, usage)
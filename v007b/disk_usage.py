@@ -0,0 +1,118 @@
+"""
+Disk usage accounting during a scan.
+
+The walker (dir_processor._scan_dir) reports every listing it makes: the
+bytes of the regular files in it, taken from the os.DirEntry stat cache,
+and the subdirectories it descends into. Totals of all directories are then
+aggregated bottom-up in one pass over the listings (a child is always
+listed after its parent, so reverse listing order visits children first).
+Subdirectories the scan doesn't descend into (non-recursive scans) are
+measured once with tree_bytes() when their parent is listed, so no
+directory is ever listed twice.
+
+Sizes are apparent sizes (st_size) of regular files; symlinks count as 0
+and are not followed (a path reached both directly and through a symlink
+keeps its real size).
+"""
+
+import os
+from typing import Any, Dict, List, Tuple
+
+
+def entry_bytes(entry: os.DirEntry, descend: bool, limiter=None) -> int:
+    """Bytes of a listed entry: a regular file's size, or the subtree of a directory not descended into."""
+    if entry.is_file(follow_symlinks=False):
+        return entry.stat(follow_symlinks=False).st_size
+    if not descend and entry.is_dir(follow_symlinks=False):
+        return tree_bytes(entry.path, limiter)
+    return 0
+
+
+def tree_bytes(path: str, limiter=None) -> int:
+    """Total bytes of the regular files below path (unreadable directories are skipped)."""
+    total = 0
+    stack = [path]
+    while stack:
+        directory = stack.pop()
+        if limiter is not None:
+            limiter.metadata()
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        if entry.is_file(follow_symlinks=False):
+                            total += entry.stat(follow_symlinks=False).st_size
+                        elif entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total
+
+
+class DiskUsage:
+    """
+    Byte totals collected from the listings of one scan.
+
+    add_listing() stores one record with a single dict assignment, so it can
+    be called from the listing threads of aparse_directory.
+    """
+
+    def __init__(self):
+        # scan path -> (own bytes, descended subdirs, resolved -> bytes, resolved dir -> scan path)
+        self._listings: Dict[str, Tuple[int, List[str], Dict[str, int], Dict[str, str]]] = {}
+
+    def add_listing(self, directory: str, own: int, subdirs: List[str],
+                    sizes: Dict[str, int], dirs: Dict[str, str]) -> None:
+        """
+        Record one listing.
+
+        Args:
+            directory: scan path of the listed directory
+            own: bytes of its files and of the subtrees not descended into
+            subdirs: scan paths of the subdirectories that will be listed
+            sizes: resolved path -> bytes of matching entries with a known size
+            dirs: resolved path -> scan path of matching subdirectories that will be listed
+        """
+        self._listings[directory] = (own, subdirs, sizes, dirs)
+
+    def totals(self) -> Dict[str, int]:
+        """Scan path -> total bytes of every listed directory."""
+        totals: Dict[str, int] = {}
+        for directory in reversed(list(self._listings)):
+            own, subdirs, _sizes, _dirs = self._listings[directory]
+            totals[directory] = own + sum(totals.get(d, 0) for d in subdirs)
+        return totals
+
+    def path_sizes(self) -> Dict[str, int]:
+        """Resolved path -> bytes of every matching entry of the scan (the keys of its "raw")."""
+        totals = self.totals()
+        out: Dict[str, int] = {}
+        for _own, _subdirs, sizes, dirs in self._listings.values():
+            found = list(sizes.items()) + [(resolved, totals.get(d, 0)) for resolved, d in dirs.items()]
+            # a path listed twice was also reached through a symlink (0 bytes): keep the real size
+            for resolved, size in found:
+                out[resolved] = max(size, out.get(resolved, 0))
+        return out
+
+
+def group_bytes(grouped: Dict[tuple, Dict[str, Any]], sizes: Dict[str, int]) -> Dict[tuple, int]:
+    """
+    Total bytes per group; a path below another path of the same group
+    (a season folder inside its show folder) is not counted twice.
+    """
+    out: Dict[tuple, int] = {}
+    for key, info in grouped.items():
+        paths = {p for p in info["paths"] if p in sizes}
+        out[key] = sum(sizes[p] for p in paths if not _has_ancestor(p, paths))
+    return out
+
+
+def _has_ancestor(path: str, paths: set) -> bool:
+    parent = os.path.dirname(path)
+    while parent and parent != path:
+        if parent in paths:
+            return True
+        path, parent = parent, os.path.dirname(parent)
+    return False
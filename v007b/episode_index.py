@@ -0,0 +1,245 @@
+"""
+Per-show season/episode index.
+
+Turns the string clues of parse results ("S01E05", "SEASON 02", "001-500",
+"EP.1080", ...) into integers and builds, for every group from
+parse_directory, an index of season -> sorted episode numbers plus compact
+intervals. Season packs ("S01", "Season 1-8", "S01-S03") and long anime
+ranges ("(001-500)") are stored as intervals instead of being expanded, so
+queries like "which episodes of S02 do we have" are answered from the index
+without re-scanning paths.
+
+Season None means absolute numbering (typical for anime). An SxxEyy
+episode far beyond the rest of its season ("S01E1116" next to S01E01-E02)
+is absolute numbering inside a season tag and is indexed as such. Samples,
+subtitles and extras are not indexed: they aren't episodes of their own.
+"""
+
+import os
+import re
+from array import array
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Tuple
+
+Interval = Tuple[int, int]
+
+_SXXEYY_RE = re.compile(r"(?i)^s(\d{1,3})e(\d{1,4})$")
+_SEASON_RE = re.compile(r"(?i)^(?:s|season[\s._-]*)(\d{1,3})$")
+_EP_RE = re.compile(r"(?i)^(?:e|ep\.?|chapter[\s._-]?)(\d{1,4})$")
+_RANGE_RE = re.compile(r"^\(?(\d{1,4})-(\d{1,4})\)?$")
+# season ranges in the original name: "Season 1-8", "S01-S03", "Seasons 1 - 4"
+_SEASON_RANGE_RE = re.compile(r"(?i)(?<![a-z0-9])(?:seasons?[\s._-]*|s)(\d{1,2})\s*-\s*(?:s|seasons?[\s._-]*)?(\d{1,2})(?!\d)")
+
+# an episode more than this beyond the previous one starts a run of absolute numbering
+ABSOLUTE_JUMP = 100
+
+_SUBTITLE_EXTS = {".srt", ".ass", ".ssa", ".sub", ".idx", ".sup", ".vtt"}
+_EXTRAS_DIRS = {"extras", "featurettes", "behind the scenes", "deleted scenes", "interviews",
+                "trailers", "samples", "sample", "subs", "subtitles"}
+_SAMPLE_RE = re.compile(r"(?i)(?<![a-z0-9])sample(?![a-z0-9])")
+
+
+def parse_clue(clue: str) -> Optional[Tuple[Optional[int], Optional[Interval]]]:
+    """
+    Parse one tv/anime clue into (season, episode interval).
+
+    Returns (season, None) for a whole-season pack, (None, (a, b)) for
+    absolute episodes or ranges, or None when the clue carries no numbers.
+    """
+    clue = clue.strip()
+    m = _SXXEYY_RE.match(clue)
+    if m:
+        ep = int(m.group(2))
+        return int(m.group(1)), (ep, ep)
+    m = _SEASON_RE.match(clue)
+    if m:
+        return int(m.group(1)), None
+    m = _EP_RE.match(clue)
+    if m:
+        ep = int(m.group(1))
+        return None, (ep, ep)
+    m = _RANGE_RE.match(clue)
+    if m:
+        a, b = int(m.group(1)), int(m.group(2))
+        return None, (min(a, b), max(a, b))
+    return None
+
+
+def is_far_jump(previous_end: int, episode: int) -> bool:
+    """True if episode is too far beyond previous_end (0: none yet) to count the episodes between as missing."""
+    return episode - previous_end > ABSOLUTE_JUMP
+
+
+def is_auxiliary(path: str) -> bool:
+    """True for sample, subtitle and extras paths, which are left out of the index."""
+    parts = re.split(r"[\\/]", path.rstrip("/\\"))
+    name = parts[-1]
+    ext = os.path.splitext(name)[1].lower()
+    if ext in _SUBTITLE_EXTS or ext == ".sample" or _SAMPLE_RE.search(name):
+        return True
+    return any(part.lower() in _EXTRAS_DIRS for part in parts[:-1])
+
+
+def merge_intervals(intervals: List[Interval]) -> List[Interval]:
+    """Sort and merge overlapping or adjacent intervals."""
+    merged: List[Interval] = []
+    for a, b in sorted(intervals):
+        if merged and a <= merged[-1][1] + 1:
+            if b > merged[-1][1]:
+                merged[-1] = (merged[-1][0], b)
+        else:
+            merged.append((a, b))
+    return merged
+
+
+class ShowIndex:
+    """
+    Seasons -> episodes for one show.
+
+    Attributes:
+        episodes (dict): season -> sorted array of single episode numbers
+        ranges (dict): season -> merged episode intervals (singles and ranges)
+        packs (list): merged intervals of seasons present as whole packs
+        paths (dict): (season, episode) or (season, (a, b)) -> list of paths
+    """
+
+    def __init__(self):
+        self.episodes: Dict[Optional[int], array] = {}
+        self.ranges: Dict[Optional[int], List[Interval]] = {}
+        self.packs: List[Interval] = []
+        self.paths: Dict[tuple, List[str]] = {}
+        self._pending: Dict[Optional[int], List[Interval]] = {}
+
+    def add(self, season: Optional[int], interval: Optional[Interval], path: str) -> None:
+        if interval is None:
+            self.packs.append((season, season))
+            self.paths.setdefault((season, None), []).append(path)
+            return
+        self._pending.setdefault(season, []).append(interval)
+        key = (season, interval[0]) if interval[0] == interval[1] else (season, interval)
+        self.paths.setdefault(key, []).append(path)
+
+    def add_season_range(self, first: int, last: int, path: str) -> None:
+        self.packs.append((min(first, last), max(first, last)))
+        self.paths.setdefault(((first, last), None), []).append(path)
+
+    def finalize(self) -> "ShowIndex":
+        """Build the sorted arrays and merged intervals (call once after all add()s)."""
+        for season in [s for s in self._pending if s is not None]:
+            self._move_absolute(season)
+        for season, intervals in self._pending.items():
+            singles = sorted({a for a, b in intervals if a == b})
+            self.episodes[season] = array("L", singles)
+            self.ranges[season] = merge_intervals(intervals + self.ranges.get(season, []))
+        self._pending = {}
+        self.packs = merge_intervals(self.packs)
+        return self
+
+    def _move_absolute(self, season: int) -> None:
+        """Move the episodes of a season from its first far jump on to absolute numbering."""
+        intervals = sorted(self._pending[season])
+        previous_end = 0
+        for i, (a, b) in enumerate(intervals):
+            if is_far_jump(previous_end, a):
+                break
+            previous_end = max(previous_end, b)
+        else:
+            return
+        moved = intervals[i:]
+        if i:
+            self._pending[season] = intervals[:i]
+        else:
+            del self._pending[season]
+        self._pending.setdefault(None, []).extend(moved)
+        for a, b in moved:
+            old, new = ((season, a), (None, a)) if a == b else ((season, (a, b)), (None, (a, b)))
+            if old in self.paths:
+                self.paths.setdefault(new, []).extend(self.paths.pop(old))
+
+    # ---- queries ------------------------------------------------------------
+
+    def seasons(self) -> List[Optional[int]]:
+        """Seasons with episodes or packs (None = absolute numbering first)."""
+        found = set(self.ranges)
+        for a, b in self.packs:
+            if b - a <= 100:
+                found.update(range(a, b + 1))
+        return sorted(found, key=lambda s: -1 if s is None else s)
+
+    def has_season_pack(self, season: int) -> bool:
+        i = bisect_right(self.packs, (season, float("inf"))) - 1
+        return i >= 0 and self.packs[i][0] <= season <= self.packs[i][1]
+
+    def episodes_in(self, season: Optional[int]) -> List[Interval]:
+        """Episode intervals present for a season (empty if only a pack is known)."""
+        return list(self.ranges.get(season, []))
+
+    def has(self, season: Optional[int], episode: int) -> bool:
+        """True if the episode is present individually, inside a range, or via a season pack."""
+        intervals = self.ranges.get(season, [])
+        i = bisect_right(intervals, (episode, float("inf"))) - 1
+        if i >= 0 and intervals[i][0] <= episode <= intervals[i][1]:
+            return True
+        return season is not None and self.has_season_pack(season)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly view: {"S01": {"episodes": [[1, 3]], "pack": false}, "absolute": {...}}."""
+        out: Dict[str, Any] = {}
+        for season in self.seasons():
+            label = "absolute" if season is None else f"S{season:02d}"
+            out[label] = {
+                "episodes": [list(iv) for iv in self.ranges.get(season, [])],
+                "pack": season is not None and self.has_season_pack(season),
+            }
+        return out
+
+
+def index_result(index: ShowIndex, meta: Dict[str, Any], path: str) -> None:
+    """Add one parse result's tv/anime clues (and season ranges in its name) to index."""
+    season_ctx: Optional[int] = None
+    pending_eps: List[Interval] = []
+    for clue in list(meta.get("tv_clues", [])) + list(meta.get("anime_clues", [])):
+        parsed = parse_clue(clue)
+        if parsed is None:
+            continue
+        season, interval = parsed
+        if season is not None and interval is None:
+            season_ctx = season
+            index.add(season, None, path)
+        elif season is None:
+            pending_eps.append(interval)
+        else:
+            index.add(season, interval, path)
+    # bare episodes ("E05", "Chapter 9") belong to a season clue of the same name, if any
+    for interval in pending_eps:
+        index.add(season_ctx, interval, path)
+    for m in _SEASON_RANGE_RE.finditer(meta.get("original", "")):
+        first, last = int(m.group(1)), int(m.group(2))
+        if first != last:
+            index.add_season_range(first, last, path)
+
+
+def build_episode_index(parsed: Dict[str, Any]) -> Dict[tuple, ShowIndex]:
+    """
+    Build a ShowIndex for every titled tv/anime group of a parse_directory result.
+
+    Sample, subtitle and extras paths (is_auxiliary) are skipped.
+
+    Args:
+        parsed: {"raw": ..., "grouped": ...} as returned by parse_directory
+
+    Returns:
+        group key -> ShowIndex
+    """
+    raw = parsed["raw"]
+    shows: Dict[tuple, ShowIndex] = {}
+    for key, info in parsed["grouped"].items():
+        if not key[0] or info.get("media_type") not in ("tv", "anime"):
+            continue
+        index = ShowIndex()
+        for path in info["paths"]:
+            meta = raw.get(path)
+            if meta is not None and not is_auxiliary(path):
+                index_result(index, meta, path)
+        shows[key] = index.finalize()
+    return shows
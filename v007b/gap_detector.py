@@ -0,0 +1,97 @@
+"""
+Missing-episode gap detection.
+
+Works on the merged integer intervals of episode_index.ShowIndex: for each
+(show, season) the gaps are the complement of the sorted intervals between
+episode 1 and the highest episode present, found in one pass, so a show
+costs O(intervals + seasons). Seasons present only as a whole pack are
+considered complete, and seasons missing between the first and last known
+season are reported as whole-season gaps. Episodes after the highest one
+we have can't be detected (the season length is unknown), and neither can
+those before an episode far beyond the previous one (episode_index.
+is_far_jump): that is a new run of absolute numbering, not a gap.
+
+Results go to a JSON report and to the episode_gaps table of
+media_library.sqlite (see database_manager.save_gaps_to_db).
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from episode_index import ShowIndex, is_far_jump
+
+
+class Gap(NamedTuple):
+    """Missing episodes first..last of a season; first/last are None when the whole season is missing."""
+    season: Optional[int]
+    first: Optional[int]
+    last: Optional[int]
+
+    @property
+    def count(self) -> Optional[int]:
+        return None if self.first is None else self.last - self.first + 1
+
+
+def find_gaps(index: ShowIndex) -> List[Gap]:
+    """Gaps of one show, ordered by season (absolute numbering first) and episode."""
+    gaps: List[Gap] = []
+    seasons = index.seasons()
+    numbered = [s for s in seasons if s is not None]
+    if numbered:
+        present = set(numbered)
+        missing_seasons = set(range(numbered[0], numbered[-1] + 1)) - present
+    else:
+        missing_seasons = set()
+
+    for season in sorted(set(seasons) | missing_seasons, key=lambda s: -1 if s is None else s):
+        if season in missing_seasons:
+            gaps.append(Gap(season, None, None))
+            continue
+        if season is not None and index.has_season_pack(season):
+            continue
+        expected = 1
+        for a, b in index.ranges.get(season, []):
+            if a > expected and not is_far_jump(expected - 1, a):
+                gaps.append(Gap(season, expected, a - 1))
+            expected = max(expected, b + 1)
+    return gaps
+
+
+def detect_gaps(shows: Dict[tuple, ShowIndex]) -> Dict[tuple, List[Gap]]:
+    """Gaps for every show of build_episode_index(); shows without gaps are left out."""
+    out: Dict[tuple, List[Gap]] = {}
+    for key, index in shows.items():
+        gaps = find_gaps(index)
+        if gaps:
+            out[key] = gaps
+    return out
+
+
+def gap_report(gaps: Dict[tuple, List[Gap]]) -> Dict[str, Any]:
+    """JSON-friendly report: per show, the missing ranges and a total count of missing episodes."""
+    shows = []
+    total = 0
+    for (title, media_type, year), show_gaps in sorted(gaps.items(), key=lambda kv: str(kv[0][0])):
+        entries = []
+        missing = 0
+        for gap in show_gaps:
+            season = "absolute" if gap.season is None else f"S{gap.season:02d}"
+            if gap.first is None:
+                entries.append({"season": season, "missing": "season"})
+            else:
+                entries.append({"season": season, "missing": [gap.first, gap.last]})
+                missing += gap.count
+        total += missing
+        shows.append({"title": title, "media_type": media_type, "year": year,
+                      "missing_episodes": missing, "gaps": entries})
+    return {"shows_with_gaps": len(shows), "missing_episodes": total, "shows": shows}
+
+
+def write_gap_report(gaps: Dict[tuple, List[Gap]], path: Path) -> Path:
+    """Write gap_report() as JSON to path and return it."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as fh:
+        json.dump(gap_report(gaps), fh, indent=2, ensure_ascii=False)
+    return path
@@ -0,0 +1,171 @@
+"""
+Bulk ingestion of path listings.
+
+Parses an existing listing (find, rclone lsf, a NAS export; one path per
+line) instead of walking a directory. The input is cut into chunks of
+about `chunk_bytes` at line boundaries, and each chunk is handled by a
+worker in one go:
+decode, splitlines(), take basenames, parse_siblings() (consecutive
+entries of a listing are mostly siblings, see batch_parser) and encode
+the results as JSON lines. The parent only moves bytes: for a listing file
+it sends byte offsets into the memory-mapped file (workers map it
+themselves), for stdin the raw chunk. Results are written in input order
+as they complete, with at most 2 chunks per worker in flight.
+
+Output: one JSON object per input line, the parse result plus "path".
+"""
+
+import json
+import mmap
+import os
+import sys
+import time
+from collections import deque
+from typing import BinaryIO, Dict, Iterator, List, NamedTuple, Optional, TextIO, Tuple, Union
+
+import config
+from parse_pool import worker_pool
+
+# worker-side mmaps of listing files, by path
+_MAPS: Dict[str, mmap.mmap] = {}
+
+# a chunk: raw bytes (stdin) or (listing path, start, end) into the mapped file
+_Chunk = Union[bytes, Tuple[str, int, int]]
+
+
+class IngestStats(NamedTuple):
+    lines: int
+    bytes: int  # listing bytes read
+    seconds: float
+
+    @property
+    def lines_per_second(self) -> float:
+        return self.lines / self.seconds if self.seconds > 0 else 0.0
+
+
+def _chunk_size(chunk: _Chunk) -> int:
+    """Listing bytes in a chunk."""
+    if isinstance(chunk, bytes):
+        return len(chunk)
+    _path, start, end = chunk
+    return end - start
+
+
+def _chunk_bytes(chunk: _Chunk) -> bytes:
+    if isinstance(chunk, bytes):
+        return chunk
+    path, start, end = chunk
+    mm = _MAPS.get(path)
+    if mm is None:
+        with open(path, "rb") as fh:
+            mm = _MAPS[path] = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    return mm[start:end]
+
+
+def _basename(path: str) -> str:
+    """Last component of a POSIX or Windows path (listings may come from either side of a share)."""
+    path = path.rstrip("/\\")
+    return path[max(path.rfind("/"), path.rfind("\\")) + 1:]
+
+
+def _parse_chunk(chunk: _Chunk) -> Tuple[int, bytes]:
+    """Parse every path of a chunk; returns (lines parsed, JSON lines)."""
+    from batch_parser import parse_siblings
+    paths = [p for p in _chunk_bytes(chunk).decode("utf-8", "surrogateescape").splitlines() if p]
+    names = [_basename(p) for p in paths]
+    results = parse_siblings(names, quiet=True, guarded=True)
+    out = []
+    for path, result in zip(paths, results):
+        result["path"] = path
+        out.append(json.dumps(result, ensure_ascii=False))
+    if not out:
+        return 0, b""
+    return len(out), ("\n".join(out) + "\n").encode("utf-8", "surrogateescape")
+
+
+def file_chunks(path: str, chunk_bytes: int) -> Iterator[_Chunk]:
+    """(path, start, end) ranges of a listing file, each ending after a newline (or at EOF)."""
+    size = os.path.getsize(path)
+    if size == 0:
+        return
+    with open(path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = 0
+        while start < size:
+            end = min(start + chunk_bytes, size)
+            if end < size:
+                nl = mm.find(b"\n", end - 1)
+                end = size if nl < 0 else nl + 1
+            yield path, start, end
+            start = end
+
+
+def stream_chunks(stream: BinaryIO, chunk_bytes: int) -> Iterator[_Chunk]:
+    """Chunks of a byte stream, split after the last newline of each read."""
+    rest = b""
+    while True:
+        data = stream.read(chunk_bytes)
+        if not data:
+            break
+        data = rest + data
+        nl = data.rfind(b"\n")
+        if nl < 0:
+            rest = data
+            continue
+        rest = data[nl + 1:]
+        yield data[:nl + 1]
+    if rest:
+        yield rest
+
+
+def ingest(source: Optional[str], out: BinaryIO, workers: Optional[int] = None,
+           chunk_bytes: Optional[int] = None, progress: Optional[TextIO] = None) -> IngestStats:
+    """
+    Parse a path listing and stream JSON lines to out.
+
+    Args:
+        source: listing file (memory-mapped), or None / "-" for stdin
+        out: binary output stream
+        workers: worker processes (default INGEST_WORKERS); 0 parses in this process
+        chunk_bytes: approximate bytes per chunk (default INGEST_CHUNK_BYTES)
+        progress: optional text stream for a lines/sec line about once a second
+
+    Returns:
+        IngestStats(lines, listing bytes read, seconds)
+    """
+    workers = config.INGEST_WORKERS if workers is None else workers
+    chunk_bytes = max(1, chunk_bytes or config.INGEST_CHUNK_BYTES)
+    if source in (None, "-"):
+        chunks = stream_chunks(sys.stdin.buffer, chunk_bytes)
+    else:
+        chunks = file_chunks(str(source), chunk_bytes)
+
+    started = last_report = time.monotonic()
+    lines = read = 0
+
+    def emit(size: int, parsed: Tuple[int, bytes]) -> None:
+        nonlocal lines, read, last_report
+        n, data = parsed
+        out.write(data)
+        lines += n
+        read += size
+        now = time.monotonic()
+        if progress is not None and now - last_report >= 1.0:
+            last_report = now
+            print(f"{lines} lines, {lines / (now - started):.0f} lines/s", file=progress)
+
+    if workers <= 0:
+        for chunk in chunks:
+            emit(_chunk_size(chunk), _parse_chunk(chunk))
+    else:
+        with worker_pool(workers) as pool:
+            pending: deque = deque()
+            for chunk in chunks:
+                pending.append((_chunk_size(chunk), pool.submit(_parse_chunk, chunk)))
+                if len(pending) >= 2 * workers:
+                    size, future = pending.popleft()
+                    emit(size, future.result())
+            while pending:
+                size, future = pending.popleft()
+                emit(size, future.result())
+    out.flush()
+    return IngestStats(lines, read, time.monotonic() - started)
@@ -4,10 +4,13 @@ Entry point for running scans and saving JSON outputs.
 
 import argparse
 import json
+import sys
 from pathlib import Path
-from config import SOURCE_DIR, OUTPUT_DIR
-from dir_processor import parse_directory
+import config
+from config import SOURCE_DIR, ensure_output_dir
+from dir_processor import parse_directory, aparse_directory
 from clue_manager import ClueManager
+from rate_limiter import IOScheduler
 
 
 def convert_tuples_to_lists(obj):
@@ -21,17 +24,156 @@ def convert_tuples_to_lists(obj):
     return obj
 
 
+def run_ingest(args):
+    """--from-list: stream JSON lines for a listing file or stdin."""
+    from ingest import ingest
+    name = "stdin" if args.from_list == "-" else Path(args.from_list).stem
+    out_path = Path(args.out) if args.out else ensure_output_dir() / f"ingest_{name}.jsonl"
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with out_path.open("wb") as out:
+        stats = ingest(args.from_list, out, workers=args.workers,
+                       progress=None if args.quiet else sys.stderr)
+    print(f"Parsed {stats.lines} lines in {stats.seconds:.2f}s "
+          f"({stats.lines_per_second:.0f} lines/s); results saved to {out_path}")
+
+
+def report_throttle(limiter):
+    """--throttle: print how much the scan was throttled."""
+    if limiter is not None:
+        meta = limiter.metrics()["metadata"]
+        print(f"Throttle: {int(meta['units'])} fs ops, {meta['throttled']} waits, "
+              f"{meta['wait_seconds']:.2f}s waiting")
+
+
+def run_pipeline(args, source, limiter):
+    """--pipeline: walk, parse and save concurrently; writes JSON lines (and the DB with --db)."""
+    from scan_pipeline import ScanPipeline
+    out_path = Path(args.out) if args.out else ensure_output_dir() / f"scan_{source.name}.jsonl"
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    db_path = None
+    if args.db:
+        db_path = config.DB_FILE
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+    cm = ClueManager()
+    with out_path.open("wb") as out:
+        pipeline = ScanPipeline(str(source), mode=args.mode, recursive=args.recursive,
+                                db_path=None if db_path is None else str(db_path), out=out,
+                                collect=cm.collect_from_parsed, workers=args.workers, limiter=limiter,
+                                quiet=args.quiet, progress=None if args.quiet else sys.stderr)
+        stats = pipeline.run()
+    report_throttle(limiter)
+    print(f"Scanned {stats.entries} entries in {stats.directories} directories in {stats.seconds:.2f}s "
+          f"({stats.entries_per_second:.0f} entries/s; walker blocked {stats.walker_blocked:.2f}s, "
+          f"writer idle {stats.writer_idle:.2f}s); results saved to {out_path}")
+    if db_path is not None:
+        print(f"Saved {len(pipeline.group_ids)} groups to {db_path}")
+    with cm:
+        collected = len(cm.unknown)
+        cm.save_unknowns()
+        print(f"Collected {collected} unknown tokens ({len(cm.store)} in {cm.store.db_path})")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Media parser runner")
     parser.add_argument("--scan-dir", "-s", default=str(SOURCE_DIR), help="Directory to scan (root folders)")
     parser.add_argument("--mode", "-m", default="dirs", choices=["dirs", "files"], help="Scan mode")
     parser.add_argument("--out", "-o", default=None, help="Output JSON file path")
     parser.add_argument("--quiet", action="store_true", help="Run in quiet mode")
+    parser.add_argument("--recursive", "-r", action="store_true", help="Also scan subdirectories")
+    parser.add_argument("--hierarchical", action="store_true",
+                        help="Pass each folder's parse result down to its entries (with --recursive)")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="List directories concurrently (for network mounts)")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent listings with --async")
+    parser.add_argument("--fuzzy", action="store_true",
+                        help="Merge near-duplicate titles (case/punctuation variants) when grouping")
+    parser.add_argument("--episodes", action="store_true",
+                        help="Add a per-show season/episode index to the output")
+    parser.add_argument("--gaps", action="store_true",
+                        help="Detect missing episodes; writes a gap report and the episode_gaps table (implies --db)")
+    parser.add_argument("--db", action="store_true", help="Save groups to the sqlite library (DB_FILE)")
+    parser.add_argument("--rank", action="store_true",
+                        help="Pick the best release of every group (RANK_WEIGHTS_FILE); stored with --db")
+    parser.add_argument("--sizes", action="store_true",
+                        help="Measure disk usage per path and group during the scan; stored with --db")
+    parser.add_argument("--suggest", action="store_true",
+                        help="Print suggested categories for unknown tokens")
+    parser.add_argument("--from-list", metavar="FILE",
+                        help="Parse a path listing (one path per line, '-' for stdin) instead of scanning; "
+                             "writes JSON lines")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes for --from-list and --pipeline")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Walk, parse and save concurrently with bounded memory; writes JSON lines "
+                             "(and groups with --db)")
+    parser.add_argument("--throttle", action="store_true",
+                        help="Rate-limit filesystem operations (TOKENS_PER_SECOND / BYTES_PER_SECOND)")
     args = parser.parse_args()
 
+    if args.from_list:
+        run_ingest(args)
+        return
+    if args.pipeline:
+        clash = [flag for flag, on in (("--async", args.use_async), ("--hierarchical", args.hierarchical),
+                                       ("--fuzzy", args.fuzzy), ("--episodes", args.episodes),
+                                       ("--gaps", args.gaps), ("--rank", args.rank),
+                                       ("--sizes", args.sizes), ("--suggest", args.suggest)) if on]
+        if clash:
+            parser.error(f"--pipeline can't be combined with {', '.join(clash)} (they need the whole scan)")
+
     source = Path(args.scan_dir)
-    out_path = Path(args.out) if args.out else Path(OUTPUT_DIR) / f"scan_{source.name}.json"
-    result = parse_directory(str(source), mode=args.mode, quiet=args.quiet)
+    out_path = Path(args.out) if args.out else ensure_output_dir() / f"scan_{source.name}.json"
+    limiter = IOScheduler.from_config() if args.throttle else None
+    if args.pipeline:
+        run_pipeline(args, source, limiter)
+        return
+    if args.use_async:
+        import asyncio
+        result = asyncio.run(aparse_directory(str(source), mode=args.mode, quiet=args.quiet,
+                                              recursive=args.recursive, concurrency=args.concurrency,
+                                              limiter=limiter, fuzzy=args.fuzzy,
+                                              hierarchical=args.hierarchical, sizes=args.sizes))
+    else:
+        result = parse_directory(str(source), mode=args.mode, quiet=args.quiet,
+                                 recursive=args.recursive, limiter=limiter, fuzzy=args.fuzzy,
+                                 hierarchical=args.hierarchical, sizes=args.sizes)
+    report_throttle(limiter)
+
+    shows = None
+    if args.episodes or args.gaps:
+        from episode_index import build_episode_index
+        shows = build_episode_index(result)
+    if args.episodes:
+        result["episodes"] = {key: index.to_dict() for key, index in shows.items()}
+
+    if args.rank:
+        from quality_ranker import best_releases
+        best = best_releases(result)
+        result["best"] = {key: rank._asdict() for key, rank in best.items()}
+
+    if args.sizes:
+        from disk_usage import group_bytes
+        group_totals = group_bytes(result["grouped"], result["sizes"])
+        result["group_sizes"] = group_totals
+        print(f"Measured {sum(group_totals.values())} bytes in {len(group_totals)} groups")
+
+    if args.db or args.gaps:
+        from database_manager import save_groups_to_db, save_gaps_to_db, save_best_to_db, save_sizes_to_db
+        db_path = config.DB_FILE
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        group_ids = save_groups_to_db(result["grouped"], str(db_path), quiet=args.quiet)
+        if args.gaps:
+            from gap_detector import detect_gaps, write_gap_report
+            gaps = detect_gaps(shows)
+            report = write_gap_report(gaps, ensure_output_dir() / f"gaps_{source.name}.json")
+            rows = save_gaps_to_db(gaps, group_ids, str(db_path))
+            print(f"Found gaps in {len(gaps)} shows ({rows} rows in {db_path}); report saved to {report}")
+        if args.rank:
+            rows = save_best_to_db(best, group_ids, str(db_path))
+            print(f"Stored the best release of {rows} groups in {db_path}")
+        if args.sizes:
+            rows = save_sizes_to_db(result["sizes"], group_totals, result["grouped"], group_ids, str(db_path))
+            print(f"Stored disk usage of {rows} groups in {db_path}")
 
     # Convert tuples to lists before JSON serialization
     result = convert_tuples_to_lists(result)
@@ -47,8 +189,13 @@ def main():
     # Collect unknowns and persist them
     cm = ClueManager()
     cm.collect_from_parsed(result["raw"])
-    cm.save_unknowns()
-    print(f"Collected {len(cm.unknown)} unknown tokens (saved to {cm.unknown_file})")
+    if args.suggest:
+        for s in cm.suggest(result["raw"].values())[:20]:
+            print(f"  {s.token:<24} -> {s.category:<22} confidence {s.confidence:.2f} ({s.count}x)")
+    with cm:
+        collected = len(cm.unknown)
+        cm.save_unknowns()
+        print(f"Collected {collected} unknown tokens ({len(cm.store)} in {cm.store.db_path})")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,53 @@
+"""
+Process pools of warmed-up parse workers.
+
+Shared by parser_service, ingest and scan_pipeline; kept apart from
+parser_service so batch callers don't import asyncio and the socket code.
+"""
+
+import gc
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import config
+
+
+def _warm_worker() -> None:
+    """Pool initializer: import the parser once so clues and regexes stay loaded."""
+    import parser  # noqa: F401
+    config.CLUE_INDEX  # load the precompiled clue snapshot up front
+
+
+def worker_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Process pool whose workers share the parent's loaded parser.
+
+    Where the start method is fork (Linux by default; macOS and Windows
+    spawn) the parent imports the parser, loads the clue index and moves
+    everything into gc's permanent generation before the workers are
+    forked, so the modules, clue tables and compiled regexes stay on
+    copy-on-write pages shared by all workers instead of being rebuilt in
+    each one (the collector would otherwise touch every object header and
+    un-share the pages). The workers are forked right away, so threads the
+    caller starts afterwards are not forked with them, and the parent then
+    unfreezes its own heap: a long-lived caller keeps collecting as usual.
+    Otherwise each worker warms itself up.
+
+    Args:
+        workers: number of worker processes
+
+    Returns:
+        ProcessPoolExecutor
+    """
+    if multiprocessing.get_start_method() != "fork":
+        return ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker)
+    _warm_worker()
+    import batch_parser  # noqa: F401
+    gc.freeze()
+    try:
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork"),
+                                   initializer=_warm_worker)
+        pool.submit(int).result()  # with fork, the first submit starts every worker
+    finally:
+        gc.unfreeze()
+    return pool
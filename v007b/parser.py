@@ -6,11 +6,14 @@ Provides parse_filename(name, quiet=False) -> dict
 Fixed parsing bits only: Loosened regex for dots/dashes in episodes/seasons, added year context check, improved prefix stripping with anime group check, added multiple passes for TV/anime, expanded heuristics in media_type, better clean_title (no auto-cap, multi-lang scoring), aggressive trim for possible_title. Structure/output unchanged.
 """
 
+import json
 import re
+import threading
 import unicodedata
-from typing import List, Optional, Tuple, Dict, Any
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Pattern, Tuple
 from collections import OrderedDict
-from config import CLUES
+import config
 
 # Fixed Patterns (loosened boundaries for . - _ spaces/dots in episodes/seasons, e.g., "8x12", "s02", "4x13", "S08E01")
 EPISODE_RE    = re.compile(r"(?i)(?<!\w)(s\d{2}e\d{2,4}|e\d{2,4})(?!\w)")  # Looser: word boundary, allows dots/dashes
@@ -27,65 +30,249 @@ YEAR_RE       = re.compile(r"(?i)(?<!\w)(\d{4})(?!\w)")  # Looser
 CHAPTER_RE    = re.compile(r"(?i)(?<!\w)(chapter[\s._-]?\d+)(?!\w)")  # Looser
 
 # Fixed prefix patterns (more aggressive for "cam -", "pics -", "world -", etc.)
+# The reference form of the stripping: _strip_prefix_patterns does the same
+# with the site prefix trie and bracket scanner below (only the third
+# pattern, which can't backtrack, still runs as a regex).
 PREFIX_PATTERNS = [
     re.compile(r"(?i)^(?:www\.[^\s\.\[\(]*|\[www\.[^\]]*\]|www\.torrenting\.com|www\.tamil.*|ww\.tamil.*|\[www\.arabp2p\.net\]|cam\s*-|pics\s*-|world\s*-|phd\s*-|sbs\s*-)(?:[_\-\s\[\]\.\(\)]+|$)", re.IGNORECASE),
     re.compile(r"(?i)^(?:\[.*?\])+", re.IGNORECASE),
     re.compile(r"(?i)(?:tamilblasters|1tamilmv|torrenting|arabp2p|phd|world|sbs)[^-\s]*[_\-\s]*", re.IGNORECASE),
 ]
 
-_RIGHT_SEP_TRIM = re.compile(r"[.\-\s_\(\)\[\]]+$")
+# clue categories reported in matched_clues, in this order
+MATCHED_CLUE_KEYS = (
+    "resolution_clues",
+    "audio_clues",
+    "quality_clues",
+    "release_groups",
+    "release_groups_anime",
+    "misc_clues",
+)
+
+# Site prefixes of PREFIX_PATTERNS[0] by literal head, with how each ends:
+#   "token":   up to whitespace . [ or ( ("www.site.com" -> "www.site")
+#   "bracket": up to the first "]"
+#   "line":    to the end of the line
+#   "dash":    optional whitespace and a "-"
+# A prefix must be followed by separators (taken with it) or the end.
+# ("www.torrenting.com", "www.tamil..." and "[www.arabp2p.net]" are covered
+# by the shorter "www." / "[www." heads, as in the pattern.)
+_SITE_PREFIXES = {"www.": "token", "[www.": "bracket", "ww.tamil": "line",
+                  "cam": "dash", "pics": "dash", "world": "dash", "phd": "dash", "sbs": "dash"}
+
+
+def _build_trie(words: Dict[str, str]) -> dict:
+    root: dict = {}
+    for word, kind in words.items():
+        node = root
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = kind
+    return root
+
+
+_SITE_PREFIX_TRIE = _build_trie(_SITE_PREFIXES)
+# the non-ASCII characters re.IGNORECASE equates with ASCII letters
+_IGNORECASE_FOLD = {"\u0130": "i", "\u0131": "i", "\u017f": "s", "\u212a": "k"}
+_PREFIX_SEPARATORS = "_-[].()"  # and whitespace
+_OUTER_TRIM_CHARS = ".-_ []"
+_RIGHT_SEPARATORS = ".-_()[]"  # and whitespace
+
 
 def _trim_right_separators(s: str) -> str:
-    return _RIGHT_SEP_TRIM.sub("", s)
+    """s without trailing . - _ ( ) [ ] and whitespace."""
+    i = len(s)
+    while i and (s[i - 1] in _RIGHT_SEPARATORS or s[i - 1].isspace()):
+        i -= 1
+    return s[:i]
+
+
+def _separator_run_end(name: str, i: int) -> int:
+    n = len(name)
+    while i < n and (name[i] in _PREFIX_SEPARATORS or name[i].isspace()):
+        i += 1
+    return i
+
+
+def _site_prefix_end(name: str) -> int:
+    """Length of the site prefix name starts with (PREFIX_PATTERNS[0]), 0 if none."""
+    node, i, n = _SITE_PREFIX_TRIE, 0, len(name)
+    while "" not in node:
+        if i == n:
+            return 0
+        ch = name[i]
+        node = node.get(ch.lower() if ch.isascii() else _IGNORECASE_FOLD.get(ch, ch))
+        if node is None:
+            return 0
+        i += 1
+    kind = node[""]
+    if kind == "token":
+        while i < n and not (name[i] in ".[(" or name[i].isspace()):
+            i += 1
+    elif kind == "bracket":
+        i = name.find("]", i)
+        if i < 0:
+            return 0
+        i += 1
+    elif kind == "line":
+        i = name.find("\n", i)
+        i = n if i < 0 else i
+    else:
+        while i < n and name[i].isspace():
+            i += 1
+        if i == n or name[i] != "-":
+            return 0
+        i += 1
+    end = _separator_run_end(name, i)
+    if end == i and i < n:
+        return 0
+    return end
+
+
+def _bracket_groups_end(name: str) -> int:
+    """End of the "[..]" groups name starts with (PREFIX_PATTERNS[1]); a group can't span lines."""
+    i = 0
+    while name.startswith("[", i):
+        j = name.find("]", i + 1)
+        if j < 0 or name.find("\n", i + 1, j) >= 0:
+            break
+        i = j + 1
+    return i
+
+
+def _trim_outer_separators(name: str) -> str:
+    r"""
+    re.sub(r'^[.\-_ \[\]]+| [.\-_ \[\]]+$', '', name) without the regex: it
+    retries every space of a separator run that isn't at the end, which is
+    quadratic in the run length.
+    """
+    start = len(name) - len(name.lstrip(_OUTER_TRIM_CHARS))
+    end = len(name) - 1 if name.endswith("\n") else len(name)  # $ also matches before a final newline
+    run = max(len(name[:end].rstrip(_OUTER_TRIM_CHARS)), start)
+    cut = name.find(" ", run, end - 1)
+    if cut < 0:
+        return name[start:]
+    return name[start:cut] + name[end:]
 
 def _strip_prefixes(name: str, quiet: bool = False) -> str:
     """Fixed: Strip prefixes. Check anime groups first (substring in first 100 chars)."""
     anime_set = False
     prefix_part = name[:100].lower()
-    for cat, lst in CLUES.items():
-        if cat == "release_groups_anime":
-            for group in lst:
-                if group.lower() in prefix_part:
-                    anime_set = True
-                    if not quiet:
-                        print(f"  Anime group '{group}' found → anime=true")
-                    break
-            if anime_set:
-                break
+    index = config.CLUE_INDEX
+    for group, low in zip(index.clues.get("release_groups_anime", []), index.anime_groups_lower):
+        if low in prefix_part:
+            anime_set = True
+            if not quiet:
+                print(f"  Anime group '{group}' found → anime=true")
+            break
     
+    return _strip_prefix_patterns(name)
+
+
+def _strip_prefix_patterns(name: str) -> str:
+    """
+    The stripping part of _strip_prefixes (no anime group check): what
+    PREFIX_PATTERNS remove, in linear time on any input.
+    """
     # Strip aggressively
-    for pattern in PREFIX_PATTERNS:
-        name = pattern.sub('', name)
-    
+    name = name[_site_prefix_end(name):]
+    name = name[_bracket_groups_end(name):]
+    name = PREFIX_PATTERNS[2].sub('', name)
+
     # Trim
-    name = re.sub(r'^[.\-_ \[\]]+| [.\-_ \[\]]+$', '', name)
+    name = _trim_outer_separators(name)
     name = re.sub(r'\s+', ' ', name).strip()
     
     return name
 
+class Extractor(NamedTuple):
+    """
+    One token pattern of _collect_matches.
+
+    Attributes:
+        clue_type: match label ("episode", "movieyear", ...)
+        regex: compiled pattern; group 1 (if any) is the match text
+        needs_digit: the pattern can't match a token without a digit
+        needles: lower-case literals, one of which every match contains
+                 (checked on ASCII tokens only, where lower() is exact)
+        priority: registration order, which orders matches with the same start
+    """
+    clue_type: str
+    regex: Pattern
+    needs_digit: bool
+    needles: Tuple[str, ...]
+    priority: int = 0
+
+
+# Every extractor whose prechecks pass runs on the token: none is skipped
+# because another one matched, since overlapping matches all reach the
+# result ("E01" is both an episode and an anime episode and lands in
+# tv_clues and anime_clues).
+EXTRACTORS: List[Extractor] = []
+
+# a token with a TV/anime context never yields a year (see _collect_matches)
+_YEAR_CONTEXT_RE = re.compile(r"(?i)(s\d+|e\d+|season|ep\.|chapter)")
+_DIGIT_RE = re.compile(r"\d")
+
+# [tokens, extractors run, extractors skipped] since the last reset_extractor_stats()
+_EXTRACTOR_COUNTS = [0, 0, 0]
+
+
+def register_extractor(clue_type: str, regex: Pattern, needs_digit: bool = False,
+                       needles: Tuple[str, ...] = ()) -> None:
+    """Add a pattern to EXTRACTORS; matches with the same start sort in registration order."""
+    EXTRACTORS.append(Extractor(clue_type, regex, needs_digit, needles, len(EXTRACTORS)))
+
+
+register_extractor("episode", EPISODE_RE, True, ("e",))
+register_extractor("tvclue", TV_CLUE_RE, True, ("s",))
+register_extractor("tvseason", SEASON_RE, True, ("s",))
+register_extractor("resolution", RESOLUTION_RE, True, ("p",))
+register_extractor("h264", H264_RE, True, ("264",))
+register_extractor("x265", X265_RE, True, ("x265",))
+register_extractor("aac", AAC_RE, False, ("aac",))
+register_extractor("bluray", BLURAY_RE, False, ("blu", "bdr"))
+register_extractor("animerange", EP_RANGE_RE, True, ("(",))
+register_extractor("animeep", ANIME_EP_RE, True, ("e",))
+register_extractor("movieyear", YEAR_RE, True)
+register_extractor("chapter", CHAPTER_RE, True, ("chapter",))
+
+
+def extractor_stats() -> Dict[str, Any]:
+    """Tokens classified and extractors run / skipped by their preconditions."""
+    tokens, run, skipped = _EXTRACTOR_COUNTS
+    return {"tokens": tokens, "run": run, "skipped": skipped,
+            "run_per_token": run / tokens if tokens else 0.0}
+
+
+def reset_extractor_stats() -> None:
+    _EXTRACTOR_COUNTS[:] = [0, 0, 0]
+
+
 def _collect_matches(token: str) -> List[Tuple[int, int, str, str]]:
     """
     Collect regex matches for known patterns inside a token. Fixed: Looser regex, year context skip.
+
+    Extractors are skipped when the token can't match them (no digit,
+    none of their needles), or, for the year, when the token has a TV/anime
+    context that would discard any year found. Matches are ordered by
+    (start, registration order).
     """
-    matches: List[Tuple[int, int, str, str]] = []
-
-    PATTERNS = [
-        (EPISODE_RE, "episode"),
-        (TV_CLUE_RE, "tvclue"),
-        (SEASON_RE, "tvseason"),
-        (RESOLUTION_RE, "resolution"),
-        (H264_RE, "h264"),
-        (X265_RE, "x265"),
-        (AAC_RE, "aac"),
-        (BLURAY_RE, "bluray"),
-        (EP_RANGE_RE, "animerange"),
-        (ANIME_EP_RE, "animeep"),
-        (YEAR_RE, "movieyear"),
-        (CHAPTER_RE, "chapter"),
-    ]
+    matches: List[Tuple[int, int, str, str, int]] = []
+    has_digit = _DIGIT_RE.search(token) is not None
+    low = token.lower() if token.isascii() else None
+    run = 0
 
-    for regex, clue_type in PATTERNS:
-        for m in regex.finditer(token):
+    for ext in EXTRACTORS:
+        if ext.needs_digit and not has_digit:
+            continue
+        if ext.needles and low is not None and not any(n in low for n in ext.needles):
+            continue
+        clue_type = ext.clue_type
+        if clue_type == "movieyear" and _YEAR_CONTEXT_RE.search(token.lower()):
+            continue
+        run += 1
+        for m in ext.regex.finditer(token):
             text = m.group(1) if m.lastindex else m.group(0)
 
             if clue_type == "movieyear":
@@ -93,17 +280,17 @@ def _collect_matches(token: str) -> List[Tuple[int, int, str, str]]:
                     year = int(text)
                     if not (1900 <= year <= 2100):
                         continue
-                    # Fixed: Context check - skip if near TV/anime patterns in full token
-                    context = token.lower()
-                    if re.search(r"(?i)(s\d+|e\d+|season|ep\.|chapter)", context):
-                        continue
                 except ValueError:
                     continue
 
-            matches.append((m.start(), m.end(), clue_type, text))
+            matches.append((m.start(), ext.priority, m.end(), clue_type, text))
 
-    matches.sort(key=lambda x: x[0])
-    return matches
+    counts = _EXTRACTOR_COUNTS
+    counts[0] += 1
+    counts[1] += run
+    counts[2] += len(EXTRACTORS) - run
+    matches.sort()
+    return [(start, end, clue_type, text) for start, _prio, end, clue_type, text in matches]
 
 def _token_in_clues(token: str, clue_lists: Dict[str, List[str]]) -> Optional[str]:
     """
@@ -118,10 +305,74 @@ def _token_in_clues(token: str, clue_lists: Dict[str, List[str]]) -> Optional[st
                 return cat
     return None
 
-def _multiple_passes_for_tv_anime(final_title: str, tv_clues: List[str], anime_clues: List[str], quiet: bool = False) -> str:
+_UNSET = object()
+
+
+class _TokenMemo:
+    """
+    Bounded LRU memo of per-token classification used by parse_filename_internal.
+
+    Maps (raw token, clue index version) -> [regex matches, clue category]; the
+    category is filled in on first need. Keying on the version means an edited
+    clue set never returns stale categories. Unlike a whole-filename cache it
+    also pays off on unique names, since "1080p", "x264", "WEB-DL" recur everywhere.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.data: "OrderedDict[Tuple[str, str], list]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str, version: str) -> list:
+        key = (token, version)
+        entry = self.data.get(key)
+        if entry is not None:
+            self.hits += 1
+            try:
+                self.data.move_to_end(key)
+            except KeyError:  # evicted meanwhile by another thread
+                pass
+            return entry
+        self.misses += 1
+        entry = [_collect_matches(token), _UNSET]
+        self.data[key] = entry
+        if len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+        return entry
+
+
+_TOKEN_MEMO: Optional[_TokenMemo] = None
+
+
+def _token_memo() -> _TokenMemo:
+    global _TOKEN_MEMO
+    if _TOKEN_MEMO is None:
+        _TOKEN_MEMO = _TokenMemo(config.TOKEN_MEMO_SIZE)
+    return _TOKEN_MEMO
+
+
+def token_memo_stats() -> Dict[str, Any]:
+    """Hits, misses, hit rate and size of the token classification memo."""
+    memo = _token_memo()
+    total = memo.hits + memo.misses
+    return {"hits": memo.hits, "misses": memo.misses,
+            "hit_rate": memo.hits / total if total else 0.0,
+            "size": len(memo.data), "maxsize": memo.maxsize}
+
+
+def clear_token_memo() -> None:
+    """Empty the token memo and reset its statistics."""
+    global _TOKEN_MEMO
+    _TOKEN_MEMO = None
+
+def _multiple_passes_for_tv_anime(final_title: str, tv_clues: List[str], anime_clues: List[str], quiet: bool = False,
+                                  budget: Optional["_OpBudget"] = None) -> str:
     """Fixed: Added multiple passes (up to 3) for TV/anime to extract remaining clues."""
     pass_count = 0
     while pass_count < 3:
+        if budget is not None:
+            budget.spend(len(final_title))
         # Re-scan final_title for new clues
         new_title = final_title
         new_tv = []
@@ -139,6 +390,8 @@ def _multiple_passes_for_tv_anime(final_title: str, tv_clues: List[str], anime_c
             i -= 1
         
         # Merge new clues (dedupe)
+        if budget is not None:
+            budget.spend(len(new_tv) * len(tv_clues) + len(new_anime) * len(anime_clues))
         for c in new_tv:
             if c not in tv_clues:
                 tv_clues.append(c)
@@ -200,23 +453,140 @@ def write_concise_log(result: dict, expected: str, log_dir: str = None) -> None:
     with open(log_file, 'a', encoding='utf-8') as f:
         f.write(line)
 
+class ParseBudgetExceeded(Exception):
+    """A guarded parse ran over its operation budget."""
+
+
+class _OpBudget:
+    """
+    Operation budget of one guarded parse. The parser's loops spend roughly
+    the characters / comparisons they are about to go through, so a name
+    that makes them run away is stopped after a bounded amount of work
+    (unlike a timer, the same name always stops at the same point).
+    """
+
+    __slots__ = ("left",)
+
+    def __init__(self, ops: int):
+        self.left = ops
+
+    def spend(self, ops: int) -> None:
+        self.left -= ops
+        if self.left < 0:
+            raise ParseBudgetExceeded
+
+
+def _guard_budget() -> Optional[_OpBudget]:
+    ops = config.PARSE_OP_BUDGET
+    return _OpBudget(ops) if ops > 0 else None
+
+
+_QUARANTINE_LOCK = threading.Lock()
+
+
+def _quarantine(filename: str, reason: str) -> None:
+    """Append a name the guard gave up on to PARSE_QUARANTINE_FILE (one JSON object per line)."""
+    record = {"name": filename, "reason": reason, "length": len(filename),
+              "time": datetime.now().isoformat(timespec="seconds")}
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    path = config.PARSE_QUARANTINE_FILE
+    with _QUARANTINE_LOCK:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8", errors="surrogateescape") as fh:
+            fh.write(line)
+
+
+def degraded_parse(filename: str, reason: str, max_length: int = 0) -> dict:
+    """
+    Cheap stand-in result for a name the guard gave up on: the prefix-stripped
+    name (capped to max_length characters) as title, no clues, media type
+    "unknown", and "degraded" set to the reason ("length" or "budget").
+    """
+    m = re.match(r"^(?P<name>.+?)(?P<ext>\.[^.]+)$", filename)
+    name = m.group("name") if m else filename
+    if max_length > 0:
+        name = name[:max_length]
+    title = _strip_prefix_patterns(name) or None
+    return {
+        "original": filename,
+        "tv_clues": [],
+        "anime_clues": [],
+        "movie_clues": [],
+        "possible_title": title,
+        "clean_title": clean_title(title) if title else None,
+        "extras_bits": [],
+        "words": [],
+        "media_type": "unknown",
+        "matched_clues": {},
+        "resolution_clues": [],
+        "audio_clues": [],
+        "quality_clues": [],
+        "release_groups": [],
+        "misc_clues": [],
+        "degraded": reason,
+    }
+
+
+def guarded_parse(filename: str, quiet: bool = False, max_length: Optional[int] = None,
+                  op_budget: Optional[int] = None) -> dict:
+    """
+    parse_filename_internal with bounded work per name.
+
+    Names longer than max_length characters are not parsed, and a parse
+    that runs over op_budget operations is abandoned; either way the name
+    is recorded in PARSE_QUARANTINE_FILE and degraded_parse() is returned,
+    so one malformed name can't stall a batch scan.
+
+    Args:
+        filename: name to parse
+        quiet: passed to parse_filename_internal
+        max_length: length cap (default PARSE_MAX_LENGTH; 0 = none)
+        op_budget: operation budget (default PARSE_OP_BUDGET; 0 = none)
+    """
+    max_length = config.PARSE_MAX_LENGTH if max_length is None else max_length
+    op_budget = config.PARSE_OP_BUDGET if op_budget is None else op_budget
+    if max_length > 0 and len(filename) > max_length:
+        reason = "length"
+    else:
+        try:
+            return parse_filename_internal(filename, quiet, _OpBudget(op_budget) if op_budget > 0 else None)
+        except ParseBudgetExceeded:
+            reason = "budget"
+    if not quiet:
+        print(f"Parse guard ({reason}): {filename[:80]!r}... degraded")
+    _quarantine(filename, reason)
+    return degraded_parse(filename, reason, max_length)
+
+
 # Fixed parse_filename wrapper (original, with expected for logging)
-def parse_filename(filename: str, quiet: bool = False, expected: str = None) -> dict:
-    """Parse filename and optionally log concise results. (Original unchanged)"""
-    result = parse_filename_internal(filename, quiet)
+def parse_filename(filename: str, quiet: bool = False, expected: str = None,
+                   guarded: bool = False) -> dict:
+    """
+    Parse filename and optionally log concise results. (Original unchanged)
+
+    With guarded=True (batch scans, the parser service) the parse goes
+    through guarded_parse, bounded by PARSE_MAX_LENGTH and PARSE_OP_BUDGET.
+    """
+    if guarded:
+        result = guarded_parse(filename, quiet)
+    else:
+        result = parse_filename_internal(filename, quiet)
     
     if expected is not None:
         write_concise_log(result, expected)
     
     return result
 
-def parse_filename_internal(filename: str, quiet: bool = False) -> dict:
+def parse_filename_internal(filename: str, quiet: bool = False, budget: Optional[_OpBudget] = None) -> dict:
     """
     Parse a filename to extract media information. Fixed parsing bits only.
     
     Only splits possible_title at the first media type clue found
     (tv_clues, anime_clues, or movie_clues). If no media type clues
     are found, uses the original filename as possible_title.
+
+    With a budget (see guarded_parse) the loops spend from it and raise
+    ParseBudgetExceeded when it runs out.
     """
     m = re.match(r"^(?P<name>.+?)(?P<ext>\.[^.]+)$", filename)
     if m:
@@ -259,10 +629,15 @@ def parse_filename_internal(filename: str, quiet: bool = False) -> dict:
             print(f"Found {ext} -> word")
         words.append(ext)
 
+    index = config.CLUE_INDEX
+    memo = _token_memo()
     i = len(tokens) - 1
     while i >= 0:
         raw_tok = tokens[i]
-        matches = _collect_matches(raw_tok)
+        if budget is not None:
+            budget.spend(len(raw_tok) + 1)
+        memo_entry = memo.get(raw_tok, index.version)
+        matches = memo_entry[0]
 
         # Fixed: If movie already found, ignore further movieyear matches
         if movie_found and matches:
@@ -271,7 +646,9 @@ def parse_filename_internal(filename: str, quiet: bool = False) -> dict:
         if not matches:
             if i >= title_boundary_index:
                 # Check if this token is known clue by lookup from CLUES
-                cat = _token_in_clues(raw_tok, CLUES)
+                cat = memo_entry[1]
+                if cat is _UNSET:
+                    cat = memo_entry[1] = index.lookup(raw_tok)
                 if cat:
                     # add to extras_bits with normalized mapping
                     if cat == "resolution_clues":
@@ -414,6 +791,8 @@ def parse_filename_internal(filename: str, quiet: bool = False) -> dict:
     # Fixed: Iterative stripping of clues at end of final_title (if any) + multiple passes for TV/anime
     clue_patterns = [EPISODE_RE, TV_CLUE_RE, SEASON_RE, EP_RANGE_RE, ANIME_EP_RE, YEAR_RE, CHAPTER_RE]
     while final_title:
+        if budget is not None:
+            budget.spend(len(final_title) * len(clue_patterns))
         found_any = False
         rightmost_end = -1
         rightmost_m = None
@@ -452,7 +831,7 @@ def parse_filename_internal(filename: str, quiet: bool = False) -> dict:
 
     # Fixed: Multiple passes for TV/anime if clues found
     if tv_clues or anime_clues or anime_set:
-        final_title = _multiple_passes_for_tv_anime(final_title or " ".join(tokens[:title_boundary_index]).strip(), tv_clues, anime_clues, quiet)
+        final_title = _multiple_passes_for_tv_anime(final_title or " ".join(tokens[:title_boundary_index]).strip(), tv_clues, anime_clues, quiet, budget)
 
     # Fixed: Decide media type (expanded heuristics, anime_set override, ignore movie if TV/anime)
     if anime_set or anime_clues:
@@ -484,24 +863,16 @@ def parse_filename_internal(filename: str, quiet: bool = False) -> dict:
     # after computing extras_bits, words, tv_clues, anime_clues, movie_clues etc.
     # build matched clue lists from CLUES (config.CLUES)
     matched_clues: Dict[str, List[str]] = {}
-    # categories present in config.CLUES (adjust names to your CLUES file keys)
-    clue_keys = [
-        "resolution_clues",
-        "audio_clues",
-        "quality_clues",
-        "release_groups",
-        "release_groups_anime",
-        "misc_clues"
-    ]
     search_space = [filename] + extras_bits + words + ([final_title] if final_title else [])
-    for key in clue_keys:
-        candidates = CLUES.get(key, []) if isinstance(CLUES, dict) else []
+    search_lower = [token.lower() for token in search_space if token]
+    lowered = config.CLUE_INDEX.lowered
+    for key in MATCHED_CLUE_KEYS:
+        candidates = lowered.get(key, [])
         found = []
-        for c in candidates:
+        for c, low in candidates:
             # case-insensitive substring match against tokens
-            low = c.lower()
-            for token in search_space:
-                if token and low in token.lower():
+            for token in search_lower:
+                if low in token:
                     found.append(c)
                     break
         if found:
@@ -544,6 +915,96 @@ def parse_filename_internal(filename: str, quiet: bool = False) -> dict:
 
     return result
 
+_CONTEXT_KEYS = ("possible_title", "clean_title")
+
+
+def _title_key(text: Optional[str]) -> str:
+    return " ".join(re.sub(r"[\W_]+", " ", text or "").casefold().split())
+
+
+def directory_context(result: dict, parent: Optional[dict] = None) -> dict:
+    """
+    Turn a directory's parse result into context for its children.
+
+    Titleless directory names ("Season 01", "S02") take the title from the
+    parent context, so "Show/Season 01/" carries both the show title and the
+    season clue.
+    """
+    if result.get("clean_title") or not parent or not parent.get("clean_title"):
+        return result
+    merged = dict(result)
+    for key in _CONTEXT_KEYS:
+        merged[key] = parent[key]
+    merged["tv_clues"] = list(result.get("tv_clues", [])) or list(parent.get("tv_clues", []))
+    return merged
+
+
+def parse_with_context(filename: str, context: Optional[dict], quiet: bool = True,
+                       guarded: bool = False) -> dict:
+    """
+    Parse an entry of a directory whose (directory_context) result is `context`.
+
+    For tv/anime context, a file named "<title> SxxEyy <rest>" (or just
+    "SxxEyy <rest>") is not re-parsed from scratch: the title, media type and,
+    if the rest has none of its own, quality bits come from the context; only
+    the episode clue and the rest of the name are extracted. Names that don't
+    fit (different title, no episode clue, extra clues in the rest) get a
+    full parse_filename, so results never depend on a wrong folder guess.
+    guarded is passed to parse_filename; the shortcut spends from the same budget.
+    """
+    if not context or context.get("media_type") not in ("tv", "anime") or not context.get("clean_title"):
+        return parse_filename(filename, quiet, guarded=guarded)
+    if guarded and 0 < config.PARSE_MAX_LENGTH < len(filename):
+        return parse_filename(filename, quiet, guarded=guarded)
+    mext = re.match(r"^(?P<name>.+?)(?P<ext>\.[^.]+)$", filename)
+    name, ext = (mext.group("name"), mext.group("ext")) if mext else (filename, "")
+    m = EPISODE_RE.search(name)
+    if not m or _title_key(name[:m.start()]) not in ("", _title_key(context["clean_title"]),
+                                                     _title_key(context["possible_title"])):
+        return parse_filename(filename, quiet, guarded=guarded)
+
+    episode = m.group(1).upper()
+    rest_name = name[m.end():].lstrip(" ._-")
+    budget = _guard_budget() if guarded else None
+    try:
+        rest = parse_filename_internal(rest_name + ext, True, budget) if rest_name else None
+    except ParseBudgetExceeded:
+        return parse_filename(filename, quiet, guarded=guarded)
+    if rest and (rest["tv_clues"] or rest["anime_clues"] or rest["movie_clues"]):
+        return parse_filename(filename, quiet, guarded=guarded)
+
+    tv_clues = [episode]
+    if episode.startswith("E"):
+        # bare episode number: the season comes from the folder
+        tv_clues += [c for c in context.get("tv_clues", []) if not EPISODE_RE.fullmatch(c)]
+    matched = {k: list(v) for k, v in context.get("matched_clues", {}).items()}
+    if rest:
+        matched.update(rest["matched_clues"])
+    words = list(rest["words"]) if rest else ([ext] if ext else [])
+    if rest and rest["possible_title"]:
+        words.append(rest["possible_title"])  # episode title, e.g. "Lets.Go.Get.It!"
+    extras = list(rest["extras_bits"]) if rest and rest["extras_bits"] else list(context.get("extras_bits", []))
+    result: Dict[str, Any] = {
+        "original": filename,
+        "tv_clues": tv_clues,
+        "anime_clues": [],
+        "movie_clues": [],
+        "possible_title": context["possible_title"],
+        "clean_title": context["clean_title"],
+        "extras_bits": extras,
+        "words": words,
+        "media_type": context["media_type"],
+        "matched_clues": matched,
+        "resolution_clues": matched.get("resolution_clues", []),
+        "audio_clues": matched.get("audio_clues", []),
+        "quality_clues": matched.get("quality_clues", []),
+        "release_groups": matched.get("release_groups", []),
+        "misc_clues": matched.get("misc_clues", [])
+    }
+    if not quiet:
+        print(f"Found {episode} -> tv_clue (title and quality from folder '{context['original']}')")
+    return result
+
 def normalize_text(text: str) -> str:
     """
     Normalize Unicode text. Fixed: No case change.
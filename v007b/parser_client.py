@@ -0,0 +1,94 @@
+"""
+Client for the parser service (see parser_service.py).
+
+Usage:
+    with ParserClient() as client:
+        results = client.parse(["Show.S01E01.1080p.mkv", "Movie.2019.720p.mkv"])
+"""
+
+import json
+import socket
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import config
+
+
+class ParserServiceError(RuntimeError):
+    """Raised when the service answers a request with an error."""
+
+
+class ParserClient:
+    """
+    Blocking client speaking the newline-delimited JSON protocol.
+
+    Attributes:
+        socket_path (Path): service socket
+        retries (int): how often a "busy" answer is retried (with backoff)
+    """
+
+    def __init__(self, socket_path: Optional[Path] = None, timeout: float = 30.0, retries: int = 5):
+        self.socket_path = Path(socket_path or config.PARSER_SOCKET)
+        self.timeout = timeout
+        self.retries = retries
+        self._sock = None
+        self._rfile = None
+        self._next_id = 0
+
+    def connect(self) -> "ParserClient":
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(str(self.socket_path))
+        self._sock = sock
+        self._rfile = sock.makefile("rb")
+        return self
+
+    def close(self) -> None:
+        if self._rfile is not None:
+            self._rfile.close()
+        if self._sock is not None:
+            self._sock.close()
+        self._sock = self._rfile = None
+
+    def __enter__(self):
+        return self.connect()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _call(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if self._sock is None:
+            self.connect()
+        self._next_id += 1
+        payload["id"] = self._next_id
+        self._sock.sendall(json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n")
+        line = self._rfile.readline()
+        if not line:
+            raise ParserServiceError("connection closed by service")
+        return json.loads(line)
+
+    def parse(self, names: List[str]) -> List[Dict[str, Any]]:
+        """Parse names on the service; results come back in input order."""
+        delay = 0.01
+        for attempt in range(self.retries + 1):
+            reply = self._call({"op": "parse", "names": list(names)})
+            if "results" in reply:
+                return reply["results"]
+            if reply.get("error") != "busy" or attempt == self.retries:
+                break
+            time.sleep(delay)
+            delay = min(delay * 2, 1.0)
+        raise ParserServiceError(reply.get("error", "unknown error"))
+
+    def parse_one(self, name: str) -> Dict[str, Any]:
+        return self.parse([name])[0]
+
+    def stats(self) -> Dict[str, int]:
+        return self._call({"op": "stats"})["stats"]
+
+    def ping(self) -> bool:
+        try:
+            return bool(self._call({"op": "ping"}).get("ok"))
+        except OSError:
+            return False
@@ -0,0 +1,265 @@
+"""
+Long-running parser service.
+
+Keeps clues and compiled matchers warm in a pool of worker processes and
+answers newline-delimited JSON requests on a local Unix-domain socket, so
+ingest scripts no longer pay interpreter start, dotenv, clue loading and
+regex compilation for every batch.
+
+Protocol (one JSON object per line, in both directions):
+    -> {"id": 1, "names": ["Show.S01E01.1080p.mkv", ...]}
+    <- {"id": 1, "results": [{...parse result...}, ...]}
+    <- {"id": 1, "error": "busy"}          (queue full, retry later)
+    -> {"id": 2, "op": "stats"}            (also "ping")
+    <- {"id": 2, "stats": {...}}
+
+Run with: python parser_service.py [--socket PATH] [--workers N]
+"""
+
+import argparse
+import asyncio
+import json
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import config
+from parse_pool import worker_pool
+
+# Largest request line accepted from a client (bytes)
+MAX_LINE_BYTES = 16 * 1024 * 1024
+
+
+def _parse_batch(names: List[str]) -> List[Dict[str, Any]]:
+    """Parse a batch of names inside a worker process (guarded: one bad name can't stall a batch)."""
+    from parser import guarded_parse
+    return [guarded_parse(n, quiet=True) for n in names]
+
+
+class _Job:
+    """A slice of one client request waiting to be batched."""
+
+    __slots__ = ("names", "future")
+
+    def __init__(self, names: List[str], future: asyncio.Future):
+        self.names = names
+        self.future = future
+
+
+class ParserService:
+    """
+    Unix-socket parser daemon with request coalescing.
+
+    Concurrent requests are queued as jobs; a single batcher task collects
+    jobs until `batch_size` names are pending or `batch_window_ms` elapsed,
+    then hands the batch to the worker pool. When the queue is full new
+    requests are answered with {"error": "busy"} instead of piling up.
+
+    Attributes:
+        socket_path (Path): where the server listens
+        stats (dict): request/batch counters, served via {"op": "stats"}
+    """
+
+    def __init__(self,
+                 socket_path: Optional[Path] = None,
+                 workers: Optional[int] = None,
+                 batch_size: Optional[int] = None,
+                 batch_window_ms: Optional[float] = None,
+                 queue_size: Optional[int] = None):
+        self.socket_path = Path(socket_path or config.PARSER_SOCKET)
+        self.workers = max(1, workers or config.SERVICE_WORKERS)
+        self.batch_size = max(1, batch_size or config.SERVICE_BATCH_SIZE)
+        if batch_window_ms is None:
+            batch_window_ms = config.SERVICE_BATCH_WINDOW_MS
+        self.batch_window = batch_window_ms / 1000.0
+        self.queue_size = queue_size or config.SERVICE_QUEUE_SIZE
+        self.stats: Dict[str, int] = {
+            "requests": 0,
+            "names": 0,
+            "batches": 0,
+            "batched_names": 0,
+            "rejected": 0,
+            "errors": 0,
+        }
+        self._queue: Optional[asyncio.Queue] = None
+        self._inflight: Optional[asyncio.Semaphore] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._tasks: set = set()
+
+    # ---- request handling -------------------------------------------------
+
+    async def _submit(self, names: List[str]) -> List[Dict[str, Any]]:
+        """Queue names (split into batch-sized jobs) and wait for all results."""
+        loop = asyncio.get_running_loop()
+        jobs = []
+        for i in range(0, len(names), self.batch_size):
+            jobs.append(_Job(names[i:i + self.batch_size], loop.create_future()))
+        if self._queue.qsize() + len(jobs) > self.queue_size:
+            raise asyncio.QueueFull
+        for job in jobs:
+            self._queue.put_nowait(job)
+        results: List[Dict[str, Any]] = []
+        for job in jobs:
+            results.extend(await job.future)
+        return results
+
+    async def _handle_line(self, line: bytes, writer: asyncio.StreamWriter) -> None:
+        req_id = None
+        try:
+            req = json.loads(line)
+            req_id = req.get("id")
+            op = req.get("op", "parse")
+            if op == "ping":
+                reply = {"id": req_id, "ok": True}
+            elif op == "stats":
+                reply = {"id": req_id, "stats": dict(self.stats, queued=self._queue.qsize())}
+            elif op == "parse":
+                names = req.get("names")
+                if not isinstance(names, list):
+                    raise ValueError("'names' must be a list of strings")
+                self.stats["requests"] += 1
+                self.stats["names"] += len(names)
+                reply = {"id": req_id, "results": await self._submit([str(n) for n in names])}
+            else:
+                raise ValueError(f"unknown op {op!r}")
+        except asyncio.QueueFull:
+            self.stats["rejected"] += 1
+            reply = {"id": req_id, "error": "busy"}
+        except Exception as exc:
+            self.stats["errors"] += 1
+            reply = {"id": req_id, "error": str(exc)}
+        writer.write(json.dumps(reply, ensure_ascii=False).encode("utf-8") + b"\n")
+        await writer.drain()
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Read requests until EOF; each line is answered independently (ids may interleave)."""
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                task = asyncio.create_task(self._handle_line(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    # ---- batching -----------------------------------------------------------
+
+    async def _collect_batch(self) -> List[_Job]:
+        """Wait for one job, then coalesce more until the batch is full or the window closes."""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        count = len(batch[0].names)
+        deadline = loop.time() + self.batch_window
+        while count < self.batch_size:
+            try:
+                job = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    job = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            batch.append(job)
+            count += len(job.names)
+        return batch
+
+    async def _run_batch(self, batch: List[_Job]) -> None:
+        loop = asyncio.get_running_loop()
+        names = [n for job in batch for n in job.names]
+        try:
+            results = await loop.run_in_executor(self._pool, _parse_batch, names)
+        except Exception as exc:
+            for job in batch:
+                if not job.future.done():
+                    job.future.set_exception(exc)
+        else:
+            pos = 0
+            for job in batch:
+                end = pos + len(job.names)
+                if not job.future.done():
+                    job.future.set_result(results[pos:end])
+                pos = end
+        finally:
+            self._inflight.release()
+
+    async def _batcher(self) -> None:
+        while True:
+            batch = await self._collect_batch()
+            # At most two batches per worker in flight; the queue absorbs the rest
+            await self._inflight.acquire()
+            self.stats["batches"] += 1
+            self.stats["batched_names"] += sum(len(job.names) for job in batch)
+            task = asyncio.create_task(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    # ---- lifecycle ----------------------------------------------------------
+
+    async def serve_forever(self) -> None:
+        """Start the worker pool and socket server; return after SIGINT/SIGTERM."""
+        self._queue = asyncio.Queue()
+        self._inflight = asyncio.Semaphore(self.workers * 2)
+        self._stopping = asyncio.Event()
+        self._pool = worker_pool(self.workers)
+
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self._stopping.set)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        server = await asyncio.start_unix_server(self._handle_client, path=str(self.socket_path),
+                                                 limit=MAX_LINE_BYTES)
+        batcher = asyncio.create_task(self._batcher())
+        print(f"Parser service listening on {self.socket_path} ({self.workers} workers)")
+        try:
+            await self._stopping.wait()
+        finally:
+            server.close()
+            await server.wait_closed()
+            batcher.cancel()
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            if self.socket_path.exists():
+                self.socket_path.unlink()
+
+    def stop(self) -> None:
+        """Ask a running serve_forever() to shut down."""
+        if self._stopping is not None:
+            self._stopping.set()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Run the parser service on a Unix socket")
+    ap.add_argument("--socket", default=str(config.PARSER_SOCKET), help="Socket path")
+    ap.add_argument("--workers", type=int, default=config.SERVICE_WORKERS, help="Worker processes")
+    ap.add_argument("--batch-size", type=int, default=config.SERVICE_BATCH_SIZE, help="Max names per batch")
+    ap.add_argument("--batch-window-ms", type=float, default=config.SERVICE_BATCH_WINDOW_MS,
+                    help="How long to wait for more requests before dispatching a batch")
+    ap.add_argument("--queue-size", type=int, default=config.SERVICE_QUEUE_SIZE,
+                    help="Max queued jobs before requests are rejected as busy")
+    args = ap.parse_args()
+
+    service = ParserService(Path(args.socket), args.workers, args.batch_size,
+                            args.batch_window_ms, args.queue_size)
+    asyncio.run(service.serve_forever())
+
+
+if __name__ == "__main__":
+    main()
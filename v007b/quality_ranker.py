@@ -0,0 +1,159 @@
+"""
+Release quality ranking.
+
+Scores each parse result from the tokens of its name after the title,
+without the container extension (so neither "The.Web.2010..." nor
+"Movie.2010.720p.ts" scores its title or extension as a source), plus its
+extras_bits. Matched clues count as whole tokens only: substring hits such
+as "TS" inside "DTS" don't. The weight table has five dimensions:
+resolution, source, codec, audio and HDR. A dimension scores its best
+token, and the release score is the weighted sum of the dimension scores.
+
+The weight table is compiled once into a token -> (dimension, score) map,
+so ranking every path of a scan is one pass doing one dict lookup per
+token; the winner of each group is the highest score (ties: shortest,
+then alphabetically first path). Winners go to the best_releases table
+(see database_manager.save_best_to_db).
+
+The defaults below can be overridden with a JSON file (RANK_WEIGHTS_FILE,
+default config/rank_weights.json) of the same shape; it is merged over the
+defaults, so it only needs the entries it changes:
+
+    {"weights": {"codec": 1.0}, "scores": {"source": {"WEBRIP": 70}}}
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import config
+
+DIMENSIONS = ("resolution", "source", "codec", "audio", "hdr")
+
+DEFAULT_WEIGHTS: Dict[str, Dict[str, Any]] = {
+    "weights": {"resolution": 1.0, "source": 1.0, "codec": 0.4, "audio": 0.3, "hdr": 0.3},
+    "scores": {
+        "resolution": {"4320P": 110, "8K": 110, "2160P": 100, "4K": 100, "UHD": 100, "1440P": 85, "2K": 85,
+                       "1080P": 75, "FHD": 75, "1080I": 65, "720P": 50, "576P": 30, "480P": 25, "SD": 20,
+                       "360P": 10, "240P": 5},
+        "source": {"REMUX": 100, "BDREMUX": 100, "BLURAY": 90, "BLU-RAY": 90, "BDRIP": 80, "BRRIP": 75,
+                   "WEB-DL": 75, "WEBDL": 75, "WEBRIP": 65, "WEB": 65, "HDTV": 50, "HDRIP": 45,
+                   "DVDRIP": 35, "PDTV": 30, "DSR": 30, "TVRIP": 25, "VODRIP": 25, "R5": 15, "DVDSCR": 10,
+                   "SCR": 10, "SCREENER": 10, "HDTS": 5, "TS": 5, "TC": 5, "HDCAM": 3, "CAMRIP": 2,
+                   "CAM": 2, "WORKPRINT": 1},
+        "codec": {"AV1": 100, "X265": 90, "H265": 90, "H.265": 90, "HEVC": 90, "X264": 60, "H264": 60,
+                  "H.264": 60, "AVC": 60, "VC-1": 40, "MPEG2": 20, "XVID": 15, "DIVX": 15},
+        "audio": {"ATMOS": 100, "TRUEHD": 95, "DTS-X": 95, "DTS-HD": 90, "LPCM": 85, "PCM": 85, "FLAC": 80,
+                  "DDP": 70, "DD+": 70, "EAC3": 70, "DTS": 65, "AC3": 50, "DD": 50, "AAC": 40, "OPUS": 40,
+                  "MP3": 20, "7.1": 60, "5.1": 45, "2CH": 20, "2.0": 20, "STEREO": 20, "MONO": 10},
+        "hdr": {"DV": 100, "DOVI": 100, "HDR10+": 90, "HDR10PLUS": 90, "HDR10": 85, "HDR": 80,
+                "HLG": 70, "10BIT": 30},
+    },
+}
+
+# hyphenated tokens stay whole ("WEB-DL", "DTS-HD"); "DDP5.1" / "7.1" are one token
+_TOKEN_RE = re.compile(r"[^\s._\[\](){}]*?(?<!\d)\d\.\d(?!\d)|[^\s._\[\](){}]+")
+_CHANNELS_RE = re.compile(r"^([A-Z+]+?)(\d\.\d)$")
+# a trailing ".ts" is a container, not telesync; other endings may be release tokens of a folder name
+_CONTAINER_EXT_RE = re.compile(
+    r"\.(?:mkv|mp4|m4v|avi|ts|m2ts|mts|mov|wmv|mpg|mpeg|webm|flv|vob|iso|divx|ogm|rmvb)$", re.I)
+
+
+class Rank(NamedTuple):
+    """Score of one path; features maps each scored dimension to the token that set it."""
+    path: str
+    score: float
+    features: Dict[str, str]
+
+
+def load_weights(path: Optional[Path] = None) -> Dict[str, Dict[str, Any]]:
+    """DEFAULT_WEIGHTS with the JSON file at path (default RANK_WEIGHTS_FILE) merged over it, if it exists."""
+    table = {"weights": dict(DEFAULT_WEIGHTS["weights"]),
+             "scores": {dim: dict(scores) for dim, scores in DEFAULT_WEIGHTS["scores"].items()}}
+    path = Path(path) if path is not None else config.RANK_WEIGHTS_FILE
+    if path.exists():
+        with path.open("r", encoding="utf-8") as fh:
+            custom = json.load(fh)
+        table["weights"].update(custom.get("weights", {}))
+        for dim, scores in custom.get("scores", {}).items():
+            table["scores"].setdefault(dim, {}).update({k.upper(): v for k, v in scores.items()})
+    return table
+
+
+def _release_part(meta: Dict[str, Any]) -> str:
+    """The name after its title, without the container extension."""
+    name = _CONTAINER_EXT_RE.sub("", meta.get("original", ""))
+    title = meta.get("possible_title")
+    if title:
+        at = name.find(title)
+        if at >= 0:
+            name = name[at + len(title):]
+    return name
+
+
+def _tokens(meta: Dict[str, Any]) -> Iterable[str]:
+    """Upper-cased release tokens, plus hyphen parts ("x264-GRP") and channel-split forms ("DDP5.1")."""
+    out = set(b.upper() for b in meta.get("extras_bits", []))
+    for tok in _TOKEN_RE.findall(_release_part(meta)):
+        tok = tok.upper()
+        out.add(tok)
+        if "-" in tok:
+            out.update(tok.split("-"))
+        m = _CHANNELS_RE.match(tok)
+        if m:
+            out.update(m.groups())
+    return out
+
+
+class QualityRanker:
+    """
+    Scores parse results with a compiled weight table.
+
+    Attributes:
+        weights (dict): dimension -> weight
+        table (dict): token -> list of (dimension, score)
+    """
+
+    def __init__(self, weights: Optional[Dict[str, Dict[str, Any]]] = None):
+        weights = weights if weights is not None else load_weights()
+        self.weights: Dict[str, float] = dict(weights["weights"])
+        self.table: Dict[str, List[Tuple[str, float]]] = {}
+        for dim, scores in weights["scores"].items():
+            if self.weights.get(dim):
+                for token, score in scores.items():
+                    self.table.setdefault(token.upper(), []).append((dim, score))
+
+    def features(self, meta: Dict[str, Any]) -> Dict[str, Tuple[str, float]]:
+        """dimension -> (best token, its score) for one parse result."""
+        best: Dict[str, Tuple[str, float]] = {}
+        table = self.table
+        for tok in _tokens(meta):
+            for dim, score in table.get(tok, ()):
+                if dim not in best or score > best[dim][1] or (score == best[dim][1] and tok < best[dim][0]):
+                    best[dim] = (tok, score)
+        return best
+
+    def rank(self, path: str, meta: Dict[str, Any]) -> Rank:
+        feats = self.features(meta)
+        score = sum(self.weights[dim] * s for dim, (_tok, s) in feats.items())
+        return Rank(path, round(score, 3), {dim: tok for dim, (tok, _s) in feats.items()})
+
+    def rank_groups(self, grouped: Dict[tuple, Dict[str, Any]],
+                    raw: Dict[str, Dict]) -> Dict[tuple, List[Rank]]:
+        """Every path of every group ranked, best first."""
+        ranked = {}
+        for key, info in grouped.items():
+            ranks = [self.rank(path, raw[path]) for path in info["paths"] if path in raw]
+            ranks.sort(key=lambda r: (-r.score, len(r.path), r.path))
+            ranked[key] = ranks
+        return ranked
+
+    def best(self, grouped: Dict[tuple, Dict[str, Any]], raw: Dict[str, Dict]) -> Dict[tuple, Rank]:
+        """The winning path of every group (groups without parsed paths are left out)."""
+        return {key: ranks[0] for key, ranks in self.rank_groups(grouped, raw).items() if ranks}
+
+
+def best_releases(result: Dict[str, Any], weights: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[tuple, Rank]:
+    """Best copy per group of a parse_directory() result."""
+    return QualityRanker(weights).best(result["grouped"], result["raw"])
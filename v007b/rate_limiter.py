@@ -0,0 +1,107 @@
+"""
+Token-bucket I/O throttling for scans.
+
+IOScheduler keeps two budgets: filesystem metadata operations
+(listdir/stat/resolve, TOKENS_PER_SECOND / TOKEN_BUCKET_CAPACITY) and bytes
+read (BYTES_PER_SECOND / BYTES_BUCKET_CAPACITY). Callers ask for tokens
+before touching the filesystem and sleep when the bucket is empty; the time
+spent waiting is reported by metrics().
+
+Buckets are thread-safe. With shared=True their state lives in
+multiprocessing shared memory, so one scheduler created in the parent and
+handed to worker processes (e.g. through a pool initializer) throttles all
+of them together.
+"""
+
+import multiprocessing
+import threading
+import time
+from typing import Dict
+
+import config
+
+# indexes into a bucket's state array
+_TOKENS, _STAMP, _OPS, _WAITED, _WAIT_SECONDS = range(5)
+
+
+class TokenBucket:
+    """
+    Refills `rate` tokens per second up to `capacity`.
+
+    acquire(n) reserves n tokens immediately (the balance may go negative)
+    and sleeps until the reservation is covered, so large requests are not
+    starved and waiters are served in arrival order. A rate <= 0 disables
+    throttling.
+    """
+
+    def __init__(self, rate: float, capacity: float, shared: bool = False):
+        self.rate = float(rate)
+        self.capacity = max(float(capacity), 1.0)
+        initial = [self.capacity, time.monotonic(), 0.0, 0.0, 0.0]
+        if shared:
+            self._lock = multiprocessing.Lock()
+            self._state = multiprocessing.Array("d", initial, lock=False)
+        else:
+            self._lock = threading.Lock()
+            self._state = initial
+
+    def acquire(self, n: float = 1) -> float:
+        """Take n tokens, sleeping if needed. Returns seconds waited."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            state = self._state
+            now = time.monotonic()
+            tokens = min(self.capacity, state[_TOKENS] + (now - state[_STAMP]) * self.rate)
+            tokens -= n
+            state[_TOKENS] = tokens
+            state[_STAMP] = now
+            state[_OPS] += n
+            wait = -tokens / self.rate if tokens < 0 else 0.0
+            if wait:
+                state[_WAITED] += 1
+                state[_WAIT_SECONDS] += wait
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "units": self._state[_OPS],
+                "throttled": int(self._state[_WAITED]),
+                "wait_seconds": self._state[_WAIT_SECONDS],
+            }
+
+
+class IOScheduler:
+    """
+    Separate token buckets for metadata operations and bytes read.
+
+    Attributes:
+        meta (TokenBucket): one token per listdir/stat/resolve
+        bytes (TokenBucket): one token per byte read
+    """
+
+    def __init__(self, ops_per_second: float, ops_capacity: float,
+                 bytes_per_second: float = 0, bytes_capacity: float = 0, shared: bool = False):
+        self.meta = TokenBucket(ops_per_second, ops_capacity, shared=shared)
+        self.bytes = TokenBucket(bytes_per_second, bytes_capacity or bytes_per_second, shared=shared)
+
+    @classmethod
+    def from_config(cls, shared: bool = False) -> "IOScheduler":
+        """Scheduler using TOKENS_PER_SECOND/TOKEN_BUCKET_CAPACITY and BYTES_PER_SECOND/BYTES_BUCKET_CAPACITY."""
+        return cls(config.TOKENS_PER_SECOND, config.TOKEN_BUCKET_CAPACITY,
+                   config.BYTES_PER_SECOND, config.BYTES_BUCKET_CAPACITY, shared=shared)
+
+    def metadata(self, ops: int = 1) -> float:
+        """Call before `ops` metadata operations (listdir, stat, resolve)."""
+        return self.meta.acquire(ops)
+
+    def read(self, nbytes: int) -> float:
+        """Call before reading `nbytes` bytes (e.g. a media header)."""
+        return self.bytes.acquire(nbytes)
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Units taken, throttled calls and throttle wait time (summed over all callers) per budget."""
+        return {"metadata": self.meta.stats(), "bytes": self.bytes.stats()}
@@ -0,0 +1,163 @@
+"""
+Compact batch wire format for parse results.
+
+A list of result dicts pickles as one dict per result: the key strings are
+memoized by pickle, but every value string is written again wherever it
+occurs (".mkv", "1080p", release groups, a season pack's title) and the
+parent rebuilds every dict and list on unpickling, all in the one process
+that collects results from every worker. encode_results() turns a batch
+into
+
+    layouts  the result keys, once per distinct key layout
+    rows     one tuple of values per result, lists and dicts frozen
+             into tuples
+
+with every str value going through a per-batch string table, so equal
+strings are the same object and pickle writes each once. Unpickling a
+batch then only builds the tuples; dicts and lists are rebuilt when a row
+or a field is accessed, so a consumer that looks at a few fields of each
+result never pays for the rest (scan_pipeline's writer only needs the
+group key fields unless it streams JSON lines).
+
+Results must be JSON-shaped (str, numbers, bool, None, lists and str-keyed
+dicts), as parse results are: tuples come back as lists.
+"""
+
+from typing import Any, Dict, Iterator, List, Sequence, Tuple, Union
+
+
+# Inside a row a plain tuple is a list of strings (nearly every list of a
+# result); other lists and str-keyed dicts are marked by these subclasses.
+
+class _FrozenList(tuple):
+    __slots__ = ()
+
+    def __reduce__(self):
+        return _FrozenList, (tuple(self),)
+
+
+class _FrozenMap(tuple):
+    """(key, value) pairs."""
+
+    __slots__ = ()
+
+    def __reduce__(self):
+        return _FrozenMap, (tuple(self),)
+
+
+# most results have no matched_clues; one shared instance pickles once per batch
+_EMPTY_MAP = _FrozenMap()
+
+
+def _thaw(value: Any) -> Any:
+    kind = type(value)
+    if kind is tuple:
+        return list(value)
+    if kind is _FrozenList:
+        return [_thaw(v) for v in value]
+    if kind is _FrozenMap:
+        return {k: _thaw(v) for k, v in value}
+    return value
+
+
+class ResultBatch(Sequence):
+    """
+    Parse results of one batch in wire form.
+
+    A read-only sequence of result dicts: indexing and iterating return a
+    fresh dict per access, equal to the encoded result (same key order and
+    values); slicing returns a list. select() and field() read some
+    values without building the whole dict.
+    """
+
+    __slots__ = ("_layouts", "_rows")
+
+    def __init__(self, layouts: List[Tuple[str, ...]], rows: List[Tuple[Any, ...]]):
+        # each row is (layout index, value, value, ...)
+        self._layouts = layouts
+        self._rows = rows
+
+    def __reduce__(self):
+        return ResultBatch, (self._layouts, self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self._row(row) for row in self._rows[index]]
+        return self._row(self._rows[index])
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for row in self._rows:
+            yield self._row(row)
+
+    def _row(self, row: Tuple[Any, ...]) -> Dict[str, Any]:
+        values = iter(row)
+        keys = self._layouts[next(values)]
+        return dict(zip(keys, [list(v) if type(v) is tuple else v if type(v) is str else _thaw(v)
+                               for v in values]))
+
+    def select(self, keys: Sequence[str]) -> Iterator[Dict[str, Any]]:
+        """Per result, a dict of only the given keys (those it has), without decoding the rest."""
+        positions = [[(key, layout.index(key) + 1) for key in keys if key in layout] for layout in self._layouts]
+        for row in self._rows:
+            yield {key: _thaw(row[pos]) for key, pos in positions[row[0]]}
+
+    def field(self, index: int, key: str, default: Any = None) -> Any:
+        """Value of one key of result `index` (default if the result has no such key)."""
+        row = self._rows[index]
+        keys = self._layouts[row[0]]
+        try:
+            return _thaw(row[keys.index(key) + 1])
+        except ValueError:
+            return default
+
+
+def encode_results(results: Sequence[Dict[str, Any]]) -> ResultBatch:
+    """
+    Pack a batch of parse results into a ResultBatch.
+
+    Args:
+        results: result dicts as returned by parse_filename_internal
+
+    Returns:
+        ResultBatch
+    """
+    layouts: Dict[Tuple[str, ...], int] = {}
+    strings: Dict[str, str] = {}
+    intern = strings.setdefault
+
+    def freeze(value: Any) -> Any:
+        kind = type(value)
+        if kind is str:
+            return intern(value, value)
+        if kind is list or kind is tuple:
+            if all(type(v) is str for v in value):
+                return tuple(map(intern, value, value))
+            return _FrozenList(map(freeze, value))
+        if kind is dict:
+            if not value:
+                return _EMPTY_MAP
+            return _FrozenMap((intern(k, k), freeze(v)) for k, v in value.items())
+        return value
+
+    rows = []
+    for result in results:
+        keys = tuple(result)
+        layout = layouts.get(keys)
+        if layout is None:
+            layout = layouts[keys] = len(layouts)
+        row = [layout]
+        for value in result.values():
+            kind = type(value)
+            # inline fast paths for the values most results are made of
+            if kind is str:
+                value = intern(value, value)
+            elif kind is list and not value:
+                value = ()
+            else:
+                value = freeze(value)
+            row.append(value)
+        rows.append(tuple(row))
+    return ResultBatch(list(layouts), rows)
@@ -0,0 +1,329 @@
+"""
+Pipelined directory scans: walker -> parser pool -> writer.
+
+parse_directory lists everything, parses everything and groups everything
+before anything is saved, so the whole library is held in memory and the
+disk is idle while names are parsed. ScanPipeline runs the stages at the
+same time:
+
+    walker thread   lists directories breadth-first, as parse_directory
+                    does, and packs the listings into batches of about
+                    batch_size names (small listings share a batch)
+    parser pool     parse_siblings() per listing in worker processes
+                    (parse_pool.worker_pool), fed by the calling thread;
+                    results travel as result_wire batches
+    writer thread   takes the results in walk order, stages each path and
+                    its group key in a temporary table and optionally
+                    streams the results as JSON lines (only then are whole
+                    results decoded; otherwise just the group key fields)
+
+connected by two bounded queues (listed batches, pending parses). A full
+queue blocks the stage that feeds it, so a slow database or output throttles
+the walk instead of growing memory: at most about 2 * queue_size batches
+exist at any time. When the walk is finished the writer merges the staged
+rows into media_groups / media_paths in one transaction, in the same order
+as save_groups_to_db(group_results(raw)), so the database ends up exactly
+as after parse_directory + save_groups_to_db (same rows, same ids).
+
+cancel() (or KeyboardInterrupt, or an error in any stage) stops every
+stage and rolls the staged rows back: the database is left untouched.
+"""
+
+import json
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, wait
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import config
+from batch_parser import parse_siblings
+from database_manager import merge_scan_paths, setup_database, setup_scan_table, stage_scan_paths
+from dir_processor import _check_mode, _scan_dir, group_key
+from parse_pool import worker_pool
+from rate_limiter import IOScheduler
+from result_wire import ResultBatch, encode_results
+
+# how often blocked queue operations look at the cancel flag (seconds)
+_POLL = 0.1
+
+# what the writer reads of a result when it doesn't stream JSON lines
+_GROUP_KEY_FIELDS = ("clean_title", "tv_clues", "anime_clues", "movie_clues")
+
+
+class ScanCancelled(Exception):
+    """Raised by ScanPipeline.run() when the scan was cancelled."""
+
+
+class PipelineStats(NamedTuple):
+    directories: int
+    entries: int
+    batches: int
+    seconds: float
+    walker_blocked: float  # seconds the walker waited for a free slot (backpressure)
+    parser_blocked: float  # seconds the feeder waited for the writer to catch up
+    writer_idle: float  # seconds the writer waited for parse results
+
+    @property
+    def entries_per_second(self) -> float:
+        return self.entries / self.seconds if self.seconds > 0 else 0.0
+
+
+def _parse_batch(listings: List[List[str]]) -> ResultBatch:
+    """
+    Parse one batch inside a worker process.
+
+    Each listing is parsed on its own, as parse_directory does: siblings
+    are found per directory, where names sharing a digit pattern usually
+    are one season pack.
+    """
+    return encode_results([result for names in listings
+                           for result in parse_siblings(names, quiet=True, guarded=True)])
+
+
+class ScanPipeline:
+    """
+    A pipelined scan of one directory tree.
+
+    Attributes:
+        source_dir (str): directory scanned
+        stats (PipelineStats): counters of the last run (also returned by run())
+        group_ids (dict): group key -> media_groups.id saved by the last run
+    """
+
+    def __init__(self, source_dir: str, mode: str = "dirs", recursive: bool = False,
+                 db_path: Optional[str] = None, out: Optional[BinaryIO] = None,
+                 collect: Optional[Callable[[Dict[str, Dict]], None]] = None,
+                 workers: Optional[int] = None, batch_size: Optional[int] = None,
+                 queue_size: Optional[int] = None, limiter: Optional[IOScheduler] = None,
+                 quiet: bool = True, progress: Optional[Any] = None):
+        """
+        Args:
+            source_dir: path to scan
+            mode: "dirs" (default) or "files"
+            recursive: also parse matching entries of all subdirectories
+            db_path: sqlite library to save the groups to (None: no database)
+            out: optional binary stream for one JSON line per result (plus "path")
+            collect: optional callback getting {path: result} of every batch,
+                on the writer thread (e.g. ClueManager.collect_from_parsed);
+                without out, results only hold the group key fields and "words"
+            workers: worker processes (default PIPELINE_WORKERS); 0 parses on
+                the calling thread
+            batch_size: names per parse batch (default PIPELINE_BATCH_SIZE)
+            queue_size: length of each queue (default PIPELINE_QUEUE_SIZE)
+            limiter: optional IOScheduler throttling the walk
+            quiet: no database sync messages
+            progress: optional text stream for an entries/sec line about once a second
+        """
+        _check_mode(mode)
+        self.source_dir = str(Path(source_dir))
+        self.mode = mode
+        self.recursive = recursive
+        self.db_path = db_path
+        self.out = out
+        self.collect = collect
+        self.workers = config.PIPELINE_WORKERS if workers is None else workers
+        self.batch_size = max(1, batch_size or config.PIPELINE_BATCH_SIZE)
+        self.queue_size = max(1, queue_size or config.PIPELINE_QUEUE_SIZE)
+        self.limiter = limiter
+        self.quiet = quiet
+        self.progress = progress
+        self.stats = PipelineStats(0, 0, 0, 0.0, 0.0, 0.0, 0.0)
+        self.group_ids: Dict[tuple, int] = {}
+        self._finished = False
+        self._cancel = threading.Event()
+        self._errors: List[BaseException] = []
+
+    def cancel(self) -> None:
+        """Stop all stages; run() then raises ScanCancelled. Safe from any thread."""
+        self._cancel.set()
+
+    # ---- queue helpers --------------------------------------------------------
+
+    def _put(self, q: queue.Queue, item: Any) -> float:
+        """Blocking put that gives up on cancel; returns seconds spent blocked."""
+        started = time.monotonic()
+        while not self._cancel.is_set():
+            try:
+                q.put(item, timeout=_POLL)
+                return time.monotonic() - started
+            except queue.Full:
+                continue
+        return time.monotonic() - started
+
+    def _get(self, q: queue.Queue) -> Tuple[Any, float]:
+        """Blocking get that gives up on cancel (returning None); also returns seconds waited."""
+        started = time.monotonic()
+        while not self._cancel.is_set():
+            try:
+                return q.get(timeout=_POLL), time.monotonic() - started
+            except queue.Empty:
+                continue
+        return None, time.monotonic() - started
+
+    def _fail(self, exc: BaseException) -> None:
+        self._errors.append(exc)
+        self._cancel.set()
+
+    # ---- stages -----------------------------------------------------------------
+
+    def _walk(self, listed: queue.Queue, counters: Dict[str, float]) -> None:
+        """Walker thread: breadth-first listing, batches of (listings, paths), then None."""
+        try:
+            listings: List[List[str]] = []
+            paths: List[str] = []
+            pending = deque([self.source_dir])
+            while pending and not self._cancel.is_set():
+                entries = _scan_dir(pending.popleft(), self.mode, self.recursive, self.limiter)
+                counters["directories"] += 1
+                wanted = [(name, resolved) for name, resolved, _subdir in entries if resolved is not None]
+                pending.extend(subdir for _n, _r, subdir in entries if subdir is not None)
+                # a listing longer than a batch is parsed in batch_size pieces
+                for i in range(0, len(wanted), self.batch_size):
+                    piece = wanted[i:i + self.batch_size]
+                    if len(paths) + len(piece) > self.batch_size:
+                        counters["walker_blocked"] += self._put(listed, (listings, paths))
+                        listings, paths = [], []
+                    listings.append([name for name, _r in piece])
+                    paths.extend(resolved for _n, resolved in piece)
+            if paths:
+                counters["walker_blocked"] += self._put(listed, (listings, paths))
+            self._put(listed, None)
+        except BaseException as exc:
+            self._fail(exc)
+
+    def _feed(self, pool: Optional[Any], listed: queue.Queue, parsed: queue.Queue,
+              counters: Dict[str, float]) -> None:
+        """Calling thread: submit the listed batches in order and queue their futures for the writer."""
+        while True:
+            batch, _waited = self._get(listed)
+            if batch is None:  # end of the walk, or cancelled
+                break
+            listings, paths = batch
+            if pool is None:
+                future: Future = Future()
+                future.set_result(_parse_batch(listings))
+            else:
+                future = pool.submit(_parse_batch, listings)
+            counters["batches"] += 1
+            counters["parser_blocked"] += self._put(parsed, (paths, future))
+        self._put(parsed, None)
+
+    def _write(self, parsed: queue.Queue, counters: Dict[str, float]) -> None:
+        """Writer thread: take parse results in walk order, stage them, merge them at the end."""
+        conn = None
+        try:
+            if self.db_path is not None:
+                conn = setup_database(self.db_path)
+                setup_scan_table(conn)
+            started = last_report = time.monotonic()
+            seq = 0
+            while True:
+                item, waited = self._get(parsed)
+                if item is None:
+                    break
+                paths, future = item
+                waiting_since = time.monotonic()
+                while not wait([future], timeout=_POLL).done:
+                    if self._cancel.is_set():
+                        return
+                counters["writer_idle"] += waited + time.monotonic() - waiting_since
+                batch = future.result()
+                if self.out is not None:
+                    results = list(batch)
+                else:
+                    results = list(batch.select(_GROUP_KEY_FIELDS + (("words",) if self.collect else ())))
+
+                rows = []
+                lines = []
+                for path, result in zip(paths, results):
+                    title, media_type, year = group_key(result)
+                    rows.append((seq, path, title, media_type, year))
+                    seq += 1
+                    if self.out is not None:
+                        result["path"] = path
+                        lines.append(json.dumps(result, ensure_ascii=False))
+                if conn is not None:
+                    stage_scan_paths(conn, rows)
+                if lines:
+                    self.out.write(("\n".join(lines) + "\n").encode("utf-8", "surrogateescape"))
+                if self.collect is not None:
+                    self.collect(dict(zip(paths, results)))
+
+                counters["entries"] += len(rows)
+                now = time.monotonic()
+                if self.progress is not None and now - last_report >= 1.0:
+                    last_report = now
+                    print(f"{counters['entries']:.0f} entries, "
+                          f"{counters['entries'] / (now - started):.0f} entries/s", file=self.progress)
+            if self._cancel.is_set():
+                return
+            if self.out is not None:
+                self.out.flush()
+            if conn is not None:
+                self.group_ids = merge_scan_paths(conn, quiet=self.quiet)
+            self._finished = True
+        except BaseException as exc:
+            self._fail(exc)
+        finally:
+            if conn is not None:
+                conn.rollback()
+                conn.close()
+
+    def _join(self, *threads: threading.Thread) -> None:
+        for thread in threads:
+            while thread.is_alive():
+                try:
+                    thread.join(_POLL)
+                except KeyboardInterrupt as exc:
+                    self._fail(exc)
+
+    # ---- running ------------------------------------------------------------------
+
+    def run(self) -> PipelineStats:
+        """
+        Scan, parse and save; returns when the writer has committed.
+
+        Returns:
+            PipelineStats (the saved group ids are in self.group_ids)
+
+        Raises:
+            ScanCancelled: cancel() was called before the scan was saved
+            the first error of any stage (KeyboardInterrupt included), after
+            all stages have stopped
+        """
+        self._cancel.clear()
+        self._errors = []
+        self._finished = False
+        self.group_ids = {}
+        counters = dict.fromkeys(("directories", "entries", "batches", "walker_blocked",
+                                  "parser_blocked", "writer_idle"), 0.0)
+        listed: queue.Queue = queue.Queue(self.queue_size)
+        parsed: queue.Queue = queue.Queue(self.queue_size)
+        started = time.monotonic()
+
+        pool = worker_pool(self.workers) if self.workers > 0 else None
+        walker = threading.Thread(target=self._walk, args=(listed, counters), name="scan-walker", daemon=True)
+        writer = threading.Thread(target=self._write, args=(parsed, counters), name="scan-writer", daemon=True)
+        walker.start()
+        writer.start()
+        try:
+            self._feed(pool, listed, parsed, counters)
+        except BaseException as exc:
+            self._fail(exc)
+        finally:
+            self._join(walker, writer)
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+        self.stats = PipelineStats(int(counters["directories"]), int(counters["entries"]),
+                                   int(counters["batches"]), time.monotonic() - started,
+                                   counters["walker_blocked"], counters["parser_blocked"],
+                                   counters["writer_idle"])
+        if self._errors:
+            raise self._errors[0]
+        if not self._finished:
+            raise ScanCancelled(f"scan of {self.source_dir} cancelled")
+        return self.stats
@@ -0,0 +1,88 @@
+"""
+Persistent store of unknown tokens.
+
+One row per token in the unknown_tokens table of media_library.sqlite
+(config.DB_FILE) with a cumulative count and first/last-seen timestamps.
+Each scan upserts only its own counts, so nothing is rewritten, and top-k
+queries are answered from an index on count instead of loading the store.
+"""
+
+import json
+import sqlite3
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import config
+
+
+class UnknownStore:
+    """
+    Counter-like view of the unknown_tokens table.
+
+    Attributes:
+        db_path (Path): sqlite database file
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path) if db_path is not None else config.DB_FILE
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute("""
+        CREATE TABLE IF NOT EXISTS unknown_tokens (
+            token TEXT PRIMARY KEY,
+            count INTEGER NOT NULL DEFAULT 0,
+            first_seen TEXT NOT NULL,
+            last_seen TEXT NOT NULL
+        )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_unknown_tokens_count ON unknown_tokens (count DESC)")
+        self.conn.commit()
+
+    def add(self, counts: Counter) -> None:
+        """Add counts to the stored totals (new tokens are inserted, existing ones updated)."""
+        now = datetime.now().isoformat(timespec="seconds")
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO unknown_tokens (token, count, first_seen, last_seen) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(token) DO UPDATE SET count = count + excluded.count, last_seen = excluded.last_seen",
+                [(token, n, now, now) for token, n in counts.items() if n > 0]
+            )
+
+    def remove(self, tokens: Iterable[str]) -> None:
+        """Drop tokens (e.g. after they were classified)."""
+        with self.conn:
+            self.conn.executemany("DELETE FROM unknown_tokens WHERE token = ?", [(t,) for t in tokens])
+
+    def top_k(self, k: int = 20) -> List[Tuple[str, int]]:
+        """The k most frequent tokens as (token, count), most frequent first."""
+        return self.conn.execute(
+            "SELECT token, count FROM unknown_tokens ORDER BY count DESC, token LIMIT ?", (k,)
+        ).fetchall()
+
+    def get(self, token: str) -> Optional[Tuple[int, str, str]]:
+        """(count, first_seen, last_seen) of a token, or None."""
+        return self.conn.execute(
+            "SELECT count, first_seen, last_seen FROM unknown_tokens WHERE token = ?", (token,)
+        ).fetchone()
+
+    def import_json(self, path: Path) -> int:
+        """Import a legacy unknown_clues.json token list (count 1 each). Returns tokens read."""
+        with Path(path).open("r", encoding="utf-8") as fh:
+            tokens = json.load(fh)
+        self.add(Counter(t for t in tokens if isinstance(t, str)))
+        return len(tokens)
+
+    def __contains__(self, token: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM unknown_tokens WHERE token = ?", (token,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM unknown_tokens").fetchone()[0]
+
+    def __iter__(self) -> Iterator[Tuple[str, int]]:
+        """Stream (token, count) rows without loading the table."""
+        return iter(self.conn.execute("SELECT token, count FROM unknown_tokens"))
+
+    def close(self) -> None:
+        self.conn.close()
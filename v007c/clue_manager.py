@@ -7,7 +7,7 @@ and loading them for parser enrichment.
 """
 
 import json
-from collections import defaultdict
+from collections import Counter
 
 def collect_unknown_words(parsed_data):
     """
@@ -19,11 +19,10 @@ def collect_unknown_words(parsed_data):
     Returns:
         dict: Unknown word -> frequency.
     """
-    counter = defaultdict(int)
-    for meta in parsed_data["raw"].values():
-        for word in meta.get("words", []):
-            counter[word.lower()] += 1
-    return dict(sorted(counter.items(), key=lambda x: -x[1]))
+    counter = Counter(word.lower()
+                      for meta in parsed_data["raw"].values()
+                      for word in meta.get("words", []))
+    return dict(counter.most_common())
 
 
 def save_clue_mapping(mapping, filepath="clues_overrides.json"):
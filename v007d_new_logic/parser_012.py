@@ -0,0 +1,606 @@
+import re
+import sys
+import io
+import time
+from contextlib import contextmanager
+from typing import Tuple, Dict, List, Optional, Any, Callable
+
+# Same stages as parser_011, run by a small pipeline engine:
+#   - stages are registered on a Pipeline, in order, with an optional cheap `when` guard
+#   - all stages work on one ParseContext (current text + fields); no per-stage copies or dicts,
+#     the stage metadata dicts of parser_011 are built once at the end (ParseContext.metadata)
+#   - a stage returns True (or sets ctx.done) when the result is decided; later stages are skipped
+#   - with pipeline.timing = True, every stage counts calls / skips / stops / time (pipeline.report())
+# process_filename() returns exactly what parser_011.process_filename() returns.
+
+# Simplified known clues for anime release groups
+KNOWN_CLUES = {
+    "release_groups_anime": [
+        "HorribleSubs", "Erai-raws", "Nyaa", "Commie", "Shinzou-Narana",
+        "AnimeRG", "SubsPlease", "Doki", "Punished", "Hoodlum", "Funi",
+        "Crunchyroll", "GM-Team", "SweetSub", "NC-Raws", "Seed-Raws", "Moozzi2"
+    ]
+}
+ANIME_GROUPS_LOWER = [(g, g.lower()) for g in KNOWN_CLUES["release_groups_anime"]]
+ANIME_GROUPS_LOWER_SET = {low for _g, low in ANIME_GROUPS_LOWER}
+
+# Resolution patterns
+RESOLUTION_PATTERNS = {
+    'standard': re.compile(r'\b(\d{3,4}p)\b', re.IGNORECASE),
+    'dimensions': re.compile(r'\b(\d{3,4}x\d{3,4})\b', re.IGNORECASE),
+    'custom_dimensions': re.compile(r'\b(\d{4}x\d{4})\b', re.IGNORECASE),
+    'uhd': re.compile(r'\b(4K|UHD|2160p|Ultra\.?HD)\b', re.IGNORECASE),
+    'hd': re.compile(r'\b(1080p|720p|480p|1080i|720i)\b', re.IGNORECASE),
+    'sd': re.compile(r'\b(480p|360p|240p|SD)\b', re.IGNORECASE),
+}
+
+COMMON_EXTENSIONS = {'mkv', 'mp4', 'avi', 'mov', 'mpg', 'mpeg', 'srt', 'torrent', 'wav', 'flac', 'm4v'}
+WEBSITE_RE = re.compile(r'^www\.[a-zA-Z0-9-]+\.[a-zA-Z]{2,6}(?:\.[a-zA-Z]{2,})?$', re.IGNORECASE)
+START_BRACKET_RE = re.compile(r'^\[[^\]]*\]\s*')
+BRACKET_ITEM_RE = re.compile(r'\[([^\]]*)\]')
+SPACES_RE = re.compile(r'\s+')
+
+# (compiled pattern, pattern name, episode type)
+ANIME_EPISODE_PATTERNS = [(re.compile(p, re.IGNORECASE), name, kind) for p, name, kind in [
+    # Anime dash patterns
+    (r'\s-\s(\d{1,4})\s', "anime_dash", "season"),
+    (r'\s-\s(\d{1,4})\[', "anime_dash_bracket", "season"),
+    (r'\s-\s(\d{1,4})$', "anime_dash_end", "season"),
+    (r'\s-(\d{1,4})\.', "anime_dash_dot", "season"),
+    (r'\s-(\d{1,4})$', "anime_dash_end2", "season"),
+    (r'S(\d{1,2})\s*-\s*(\d{1,4})', "anime_season_episode", "season"),
+
+    # Season X - Episode pattern
+    (r'Season\s+\d+\s*-\s*(\d{1,4})\s*\[', "anime_season_episode_bracket", "season"),
+    (r'Season\s+\d+\s*-\s*(\d{1,4})\s*$', "anime_season_episode_end", "season"),
+    (r'Season\s+\d+\s*-\s*(\d{1,4})\s', "anime_season_episode_space", "season"),
+
+    # Space-separated patterns
+    (r'\]\s+[A-Za-z\s]+\s+(\d{1,4})\s+[-\[]', "anime_group_title_episode", "season"),
+    (r'\]\s+[A-Za-z\s]+\s+(\d{1,4})\s+\[', "anime_group_title_episode_bracket", "season"),
+    (r'\]\s+[A-Za-z\s]+\s+(\d{1,4})(?:\s|$)', "anime_group_title_episode_end", "season"),
+
+    # Episode indicators
+    (r'Episode\s+(\d{1,4})', "anime_episode_word", "season"),
+    (r'Episode(\d{1,4})', "anime_episode_nospace", "season"),
+    (r'EP(\d{1,4})', "anime_ep", "season"),
+    (r'S(\d{1,2})E(\d{1,4})', "anime_sxe", "season"),
+
+    # Underscore patterns
+    (r'_(\d{1,4})_\d{3,4}\.', "anime_underscore_resolution", "season"),
+    (r'_(\d{1,4})\.', "anime_underscore", "season"),
+
+    # Special anime content
+    (r'(?:NCED|NCOP|NCBD|PV|CM|SP|OVA|OAD|SPECIAL|EXTRA)\s*(\d{1,4})', "anime_special", "special"),
+    (r'-\s+(?:NCED|NCOP|NCBD|PV|CM|SP|OVA|OAD|SPECIAL|EXTRA)(\d{1,4})', "anime_special_dash", "special"),
+]]
+
+TV_EPISODE_PATTERNS = [(re.compile(p, re.IGNORECASE), name, kind) for p, name, kind in [
+    # Standard TV patterns
+    (r'S(\d{1,2})\.E(\d{1,3})', "tv_sxe_dot", "season"),
+    (r'S(\d{1,2})E(\d{1,3})', "tv_sxe", "season"),
+    (r'(\d{1,2})x(\d{1,3})', "tv_x", "season"),
+    (r'(\d{1,2})x(\d{1,3})-(\d{1,3})', "tv_x_range", "season"),
+
+    # Standalone episode patterns
+    (r'\bE(\d{1,3})\b(?![A-Z])', "tv_episode", "season"),
+    (r'\bEpisode\s+(\d{1,3})', "tv_episode_word", "season"),
+    (r'\bEpisode(\d{1,3})', "tv_episode_nospace", "season"),
+    (r'\bepisode\.(\d{1,3})', "tv_episode_dot", "season"),
+    (r'\bEP(\d{1,3})', "tv_ep", "season"),
+
+    # Season patterns
+    (r'S(\d{1,2})\s*-\s*E(\d{1,3})', "tv_sxe_hyphen", "season"),
+    (r'Season\s+(\d{1,2})', "tv_season", "season_only"),
+    (r'[Ss]eason(\d{1,2})', "tv_season_nospace", "season_only"),
+
+    # Season ranges
+    (r'S(\d{1,2})-S(\d{1,2})', "tv_season_range", "season_range"),
+    (r'S(\d{1,2})-(\d{1,2})', "tv_season_episode_range", "season"),
+    (r'(\d{1,2})-(\d{1,2})', "tv_number_range", "season"),
+]]
+
+ORDINAL_MAP = {
+    'first': 1, 'second': 2, 'third': 3, 'fourth': 4, 'fifth': 5, 'sixth': 6,
+    'seventh': 7, 'eighth': 8, 'ninth': 9, 'tenth': 10, 'eleventh': 11, 'twelfth': 12
+}
+ORDINAL_SEASON_RE = re.compile(
+    r'\b(First|Second|Third|Fourth|Fifth|Sixth|Seventh|Eighth|Ninth|Tenth|Eleventh|Twelfth)\s+Season\s*[-–]\s*(\d{1,3})',
+    re.IGNORECASE)
+SEASON_NUM_RE = re.compile(r'^\d{1,2}$')
+EPISODE_NUM_3_RE = re.compile(r'^\d{1,3}$')
+EPISODE_NUM_4_RE = re.compile(r'^\d{1,4}$')
+
+
+def is_website_pattern(text: str) -> bool:
+    """Check if text matches a website pattern (www.word.word)."""
+    return bool(WEBSITE_RE.match(text))
+
+
+class ParseContext:
+    """State shared by all stages of one filename."""
+
+    __slots__ = (
+        "filename", "text", "is_anime", "done",
+        # stage 1
+        "found_at_start", "clue", "removed",
+        # stage 2
+        "brackets_found", "replaced", "anime_groups_removed", "other_brackets_processed",
+        # stage 3
+        "found_resolutions", "resolution_type", "resolution_value",
+        # stage 4
+        "episode_found", "season_found", "episode_type", "pattern_matched",
+    )
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.text = filename
+        self.is_anime = False
+        self.done = False
+        self.found_at_start: List[str] = []
+        self.clue: Optional[str] = None
+        self.removed: List[str] = []
+        self.brackets_found: List[str] = []
+        self.replaced: List[str] = []
+        self.anime_groups_removed: List[str] = []
+        self.other_brackets_processed: List[str] = []
+        self.found_resolutions: List[Dict[str, str]] = []
+        self.resolution_type: Optional[str] = None
+        self.resolution_value: Optional[str] = None
+        self.episode_found: Optional[int] = None
+        self.season_found: Optional[int] = None
+        self.episode_type: Optional[str] = None
+        self.pattern_matched: Optional[str] = None
+
+    def metadata(self) -> Dict[str, Any]:
+        """The all_metadata dict of parser_011.process_filename."""
+        all_metadata = {
+            "stage1": {
+                "found_at_start": self.found_at_start,
+                "anime_clue": self.is_anime,
+                "clue": self.clue,
+                "removed": self.removed
+            },
+            "stage2": {
+                "found": self.brackets_found,
+                "replaced": self.replaced,
+                "anime_groups_removed": self.anime_groups_removed,
+                "other_brackets_processed": self.other_brackets_processed
+            },
+            "stage3": {
+                "found_resolutions": self.found_resolutions,
+                "resolution_type": self.resolution_type,
+                "resolution_value": self.resolution_value
+            },
+            "stage4": {
+                "episode_found": self.episode_found,
+                "season_found": self.season_found,
+                "episode_type": self.episode_type,
+                "pattern_matched": self.pattern_matched
+            },
+            "is_anime": self.is_anime,
+            "all_clues_found": []
+        }
+
+        # Collect all clues found
+        clues = all_metadata["all_clues_found"]
+        if self.clue:
+            clues.append(f"anime_release_group: {self.clue}")
+        if self.found_at_start:
+            clues.append(f"start_bracket: {self.found_at_start[0]}")
+        if self.anime_groups_removed:
+            clues.extend([f"anime_group_removed: {group}" for group in self.anime_groups_removed])
+        if self.other_brackets_processed:
+            clues.extend([f"bracket_content: {content}" for content in self.other_brackets_processed])
+        if self.resolution_value:
+            clues.append(f"resolution: {self.resolution_value} ({self.resolution_type})")
+        if self.episode_found:
+            if self.season_found:
+                clues.append(f"episode: S{self.season_found}E{self.episode_found} ({self.episode_type})")
+            else:
+                clues.append(f"episode: E{self.episode_found} ({self.episode_type})")
+        return all_metadata
+
+
+# stage(ctx, debug) -> True when the result is decided (remaining stages are skipped)
+Stage = Callable[[ParseContext, bool], Optional[bool]]
+
+
+class Pipeline:
+    """Ordered, registered stages over a shared ParseContext, with optional per-stage timing."""
+
+    def __init__(self, timing: bool = False):
+        self.stages: List[Tuple[str, Stage, Optional[Callable[[ParseContext], bool]]]] = []
+        self.timing = timing
+        # stage name -> [calls, skipped, stops, seconds]
+        self.stats: Dict[str, List[float]] = {}
+
+    def stage(self, name: str, when: Optional[Callable[[ParseContext], bool]] = None):
+        """Decorator registering a stage; `when(ctx)` False skips it for that filename."""
+        def register(func: Stage) -> Stage:
+            self.stages.append((name, func, when))
+            self.stats[name] = [0, 0, 0, 0.0]
+            return func
+        return register
+
+    def run(self, filename: str, debug: bool = False) -> ParseContext:
+        ctx = ParseContext(filename)
+        timing = self.timing
+        for name, func, when in self.stages:
+            if ctx.done or (when is not None and not when(ctx)):
+                if timing:
+                    self.stats[name][1] += 1
+                continue
+            if timing:
+                start = time.perf_counter()
+                stop = func(ctx, debug)
+                counters = self.stats[name]
+                counters[3] += time.perf_counter() - start
+                counters[0] += 1
+                if stop or ctx.done:
+                    counters[2] += 1
+            else:
+                stop = func(ctx, debug)
+            if stop:
+                ctx.done = True
+        return ctx
+
+    def reset_stats(self) -> None:
+        for name in self.stats:
+            self.stats[name] = [0, 0, 0, 0.0]
+
+    def report(self) -> str:
+        """Per-stage counters, most expensive stage first."""
+        lines = [f"{'stage':<28}{'calls':>9}{'skipped':>9}{'stops':>7}{'total ms':>11}{'us/call':>9}"]
+        for name, (calls, skipped, stops, seconds) in sorted(self.stats.items(), key=lambda kv: -kv[1][3]):
+            per_call = seconds / calls * 1e6 if calls else 0.0
+            lines.append(f"{name:<28}{calls:>9}{skipped:>9}{stops:>7}{seconds * 1000:>11.2f}{per_call:>9.2f}")
+        return "\n".join(lines)
+
+
+PIPELINE = Pipeline()
+
+
+@PIPELINE.stage("square_brackets")
+def stage_1_square_brackets_and_media_type_clues_for_anime(ctx: ParseContext, debug: bool = True):
+    """
+    First stage: Process square brackets at the start of the filename.
+    """
+    filename = ctx.text
+    if debug:
+        print(f"\n=== Stage 1: Processing square brackets at start ===")
+        print(f"Input: '{filename}'")
+
+    # Remove file extension first
+    dot = filename.rfind('.')
+    if dot >= 0 and filename[dot + 1:].lower() in COMMON_EXTENSIONS:
+        if debug:
+            print(f"  Removed extension: {filename[dot + 1:]}")
+        filename = filename[:dot]
+
+    # Find only the FIRST square bracket at the very beginning
+    match = START_BRACKET_RE.match(filename)
+    if match:
+        bracket_content = match.group(0)
+        bracket_text = bracket_content[1:bracket_content.find(']')]
+        ctx.found_at_start = [bracket_text]
+
+        if debug:
+            print(f"  Found FIRST bracket at start: '{bracket_content}'")
+
+        # Check if it's a website pattern
+        if is_website_pattern(bracket_text):
+            if debug:
+                print(f"  Detected website: '{bracket_text}'")
+            filename = filename[len(bracket_content):].strip()
+            ctx.removed.append(bracket_content)
+        elif debug:
+            print(f"  Not a website: '{bracket_text}' - keeping in filename for now")
+
+    # Check entire filename for anime release groups (anywhere)
+    lowered = filename.lower()
+    for group, low in ANIME_GROUPS_LOWER:
+        if low in lowered:
+            ctx.is_anime = True
+            ctx.clue = group
+            if debug:
+                print(f"  Anime release group found: '{group}'")
+            break
+
+    # Clean up multiple spaces
+    ctx.text = SPACES_RE.sub(' ', filename).strip()
+
+    if debug:
+        print(f"  Anime clue: {ctx.is_anime}")
+        if ctx.clue:
+            print(f"  Clue: {ctx.clue}")
+        print(f"  Removed: {', '.join(ctx.removed) if ctx.removed else 'None'}")
+        print(f"  Output: '{ctx.text}'")
+
+
+@PIPELINE.stage("replace_square_brackets")
+def stage_2_replace_square_brackets(ctx: ParseContext, debug: bool = True):
+    """
+    Second stage: Replace ALL square brackets with spaces, but remove anime release groups.
+    Preserves resolution information by not removing it from brackets.
+    """
+    filename = ctx.text
+    if debug:
+        print(f"\n=== Stage 2: Processing ALL square brackets ===")
+        print(f"Input: '{filename}'")
+
+    # Find all bracket contents
+    bracket_items = BRACKET_ITEM_RE.findall(filename) if '[' in filename else []
+    ctx.brackets_found = bracket_items
+    if not bracket_items:
+        return
+
+    if debug:
+        print(f"  Found brackets: {', '.join(bracket_items)}")
+
+    for item in bracket_items:
+        if item.lower() in ANIME_GROUPS_LOWER_SET:
+            # Remove anime release groups completely
+            filename = filename.replace(f"[{item}]", "", 1)
+            ctx.replaced.append(f"[{item}] -> removed (anime group)")
+            ctx.anime_groups_removed.append(item)
+            if debug:
+                print(f"  Removing anime release group: '[{item}]'")
+            continue
+
+        # Resolutions and other brackets both keep their content
+        filename = filename.replace(f"[{item}]", f" {item} ", 1)
+        ctx.other_brackets_processed.append(item)
+        if any(pattern.match(item) for pattern in RESOLUTION_PATTERNS.values()):
+            ctx.replaced.append(f"[{item}] -> '{item}' (resolution)")
+            if debug:
+                print(f"  Preserving resolution: '[{item}]'")
+        else:
+            ctx.replaced.append(f"[{item}] -> '{item}'")
+
+    # Clean up extra spaces
+    ctx.text = SPACES_RE.sub(' ', filename).strip()
+
+    if debug:
+        print(f"  Replaced: {', '.join(ctx.replaced)}")
+        print(f"  Output: '{ctx.text}'")
+
+
+@PIPELINE.stage("extract_resolution")
+def stage_3_extract_resolution(ctx: ParseContext, debug: bool = True):
+    """
+    Third stage: Extract resolution information from the filename.
+    """
+    filename = ctx.text
+    if debug:
+        print(f"\n=== Stage 3: Extracting resolution ===")
+        print(f"Input: '{filename}'")
+
+    # Search for resolution patterns in order of specificity; take the first match
+    for pattern_type, pattern in RESOLUTION_PATTERNS.items():
+        match = pattern.search(filename)
+        if match:
+            ctx.resolution_value = match.group(1)
+            ctx.resolution_type = pattern_type
+            ctx.found_resolutions.append({
+                "value": ctx.resolution_value,
+                "type": pattern_type
+            })
+            if debug:
+                print(f"  Found {pattern_type} resolution: '{ctx.resolution_value}'")
+            break
+
+    if debug:
+        if ctx.resolution_value:
+            print(f"  Resolution: {ctx.resolution_value} ({ctx.resolution_type})")
+        else:
+            print("  No resolution found")
+        print(f"  Output: '{filename}'")
+
+
+def _season_dash_episode(filename: str, episode_re, max_episode: Optional[int] = None) -> Optional[Tuple[int, int]]:
+    """First '... Season 2 - 05 ...' (whitespace-split, episode in 1..max_episode if given) -> (season, episode)."""
+    parts = filename.split()
+    for i, part in enumerate(parts):
+        if part.lower() == 'season' and i + 2 < len(parts):
+            if (parts[i + 2] == '-' and i + 3 < len(parts) and
+                    SEASON_NUM_RE.match(parts[i + 1]) and
+                    episode_re.match(parts[i + 3])):
+                season_num, episode_num = int(parts[i + 1]), int(parts[i + 3])
+                if max_episode is None or 1 <= episode_num <= max_episode:
+                    return season_num, episode_num
+    return None
+
+
+@PIPELINE.stage("extract_episode")
+def stage_4_extract_episode(ctx: ParseContext, debug: bool = True):
+    """
+    Fourth stage: Extract episode information from the filename.
+    Uses different patterns for anime vs TV shows.
+    """
+    filename = ctx.text
+    is_anime = ctx.is_anime
+    if debug:
+        print(f"\n=== Stage 4: Extracting episode information ===")
+        print(f"Input: '{filename}'")
+        print(f"Content type: {'Anime' if is_anime else 'TV Show'}")
+
+    for pattern, pattern_name, episode_type in (ANIME_EPISODE_PATTERNS if is_anime else TV_EPISODE_PATTERNS):
+        match = pattern.search(filename)
+        if not match:
+            continue
+        groups = match.groups()
+
+        # Extract season and episode based on pattern
+        if len(groups) == 1:
+            # Single group - usually just episode number
+            episode_num = int(groups[0])
+            season_num = None
+        else:
+            # Multiple groups - usually season and episode
+            try:
+                season_num = int(groups[0])
+                episode_num = int(groups[1])
+            except (ValueError, IndexError):
+                # Fallback to just episode if season extraction fails
+                episode_num = int(groups[-1])
+                season_num = None
+
+        # Validate episode number
+        if 1 <= episode_num <= 4999:
+            ctx.episode_found = episode_num
+            ctx.season_found = season_num
+            ctx.episode_type = episode_type
+            ctx.pattern_matched = pattern_name
+
+            if debug:
+                if season_num:
+                    print(f"  Found {episode_type} - Season: {season_num}, Episode: {episode_num} (Pattern: {pattern_name})")
+                else:
+                    print(f"  Found {episode_type} - Episode: {episode_num} (Pattern: {pattern_name})")
+
+            # For TV shows, also check for multi-part patterns
+            if not is_anime and season_num is None:
+                found = _season_dash_episode(filename, EPISODE_NUM_3_RE)
+                if found:
+                    ctx.season_found, ctx.episode_found = found
+                    ctx.pattern_matched = "tv_season_episode_fallback"
+                    if debug:
+                        print(f"  Found season/episode from parts: Season {found[0]}, Episode {found[1]}")
+            break
+
+    # Additional fallback for anime: check for simple numeric episode after "Season X -"
+    if is_anime and ctx.episode_found is None:
+        found = _season_dash_episode(filename, EPISODE_NUM_4_RE, max_episode=4999)
+        if found:
+            ctx.season_found, ctx.episode_found = found
+            ctx.episode_type = "season"
+            ctx.pattern_matched = "anime_season_episode_fallback"
+            if debug:
+                print(f"  Found anime episode from parts: Season {found[0]}, Episode {found[1]}")
+
+    # For TV shows, check ordinal season patterns ("Title Second Season - 02")
+    if not is_anime and ctx.episode_found is None:
+        ordinal_match = ORDINAL_SEASON_RE.search(filename)
+        if ordinal_match:
+            season_num = ORDINAL_MAP.get(ordinal_match.group(1).lower())
+            episode_num = int(ordinal_match.group(2))
+            if season_num and 1 <= episode_num <= 499:
+                ctx.episode_found = episode_num
+                ctx.season_found = season_num
+                ctx.episode_type = "season"
+                ctx.pattern_matched = "tv_ordinal_season"
+                if debug:
+                    print(f"  Found TV episode from ordinal: Season {season_num}, Episode {episode_num}")
+
+    if debug:
+        if ctx.episode_found is None:
+            print("  No episode found")
+        print(f"  Output: '{filename}'")
+
+
+def process_filename(filename: str, debug: bool = True, pipeline: Pipeline = PIPELINE):
+    """Process a filename through all cleaning stages."""
+    if debug:
+        print(f"\n{'='*50}")
+        print(f"Processing filename: '{filename}'")
+        print(f"{'='*50}")
+
+    ctx = pipeline.run(filename, debug)
+    all_metadata = ctx.metadata()
+
+    # Final results
+    if debug:
+        print(f"\n{'='*50}")
+        print(f"Final results for '{filename}':")
+        print(f"  Cleaned filename: '{ctx.text}'")
+        print(f"  Is anime: {ctx.is_anime}")
+        print(f"  All clues found:")
+        for clue in all_metadata["all_clues_found"]:
+            print(f"    - {clue}")
+        print(f"{'='*50}\n")
+
+    return ctx.text, ctx.is_anime, all_metadata
+
+@contextmanager
+def capture_output():
+    """Context manager to capture stdout."""
+    new_out = io.StringIO()
+    old_out = sys.stdout
+    try:
+        sys.stdout = new_out
+        yield new_out
+    finally:
+        sys.stdout = old_out
+
+# Test function
+def test_parser():
+    test_cases = [
+        "[HorribleSubs] Attack on Titan - 01 [1080p].mkv",
+        "[www.torrentsite.com] Naruto Shippuden - 05 [Crunchyroll].mkv",
+        "[Erai-raws] Re:Zero - 12 [1080p].mkv",
+        "[Nyaa] One Piece - 950 [720p].mkv",
+        "Anime Title [01] [1080p].mkv",
+        "[Punished] Demon Slayer - 07 [WEB-DL 1080p].mkv",
+        "[Funi] My Hero Academia [Season 4] [01] [1080p].mkv",
+        "Regular Movie (2022) [1080p].mkv",
+        "[Unknown] Some Anime - 24 [720p].mkv",
+        "[www.example.co.uk] Another Anime - 03 [HorribleSubs].mkv",
+        "[GM-Team][国漫][太乙仙魔录 灵飞纪 第3季][Magical Legend of Rise to immortality Ⅲ][01-26][AVC][GB][1080P]",
+        "[SweetSub][Mutafukaz / MFKZ][Movie][BDRip][1080P][AVC 8bit][简体内嵌]",
+        "[Erai-raws] Kingdom 3rd Season - 02 [1080p].mkv",
+        "[NC-Raws] 间谍过家家 / SPY×FAMILY - 04 (B-Global 1920x1080 HEVC AAC MKV)",
+        "[Seed-Raws] 劇場版 ペンギン・ハイウェイ Penguin Highway The Movie (BD 1280x720 AVC AACx4 [5.1+2.0+2.0+2.0]).mp4",
+        # Add TV show test cases
+        "Game of Thrones S01E01 1080p.mkv",
+        "Friends S10E12 720p HDTV.mkv",
+        "The Office Season 3 Episode 5 1080p.mkv",
+        "Breaking Bad 1x07 720p.mkv",
+        "Stranger Things S04E08 1080p.mkv",
+    ]
+
+    # Get script name without extension
+    script_name = sys.argv[0]
+    if script_name.endswith('.py'):
+        script_name = script_name[:-3]
+    output_filename = f"{script_name}_output.txt"
+
+    # Capture all output
+    all_output = []
+
+    # Add header
+    header = "\n" + "="*60
+    header += "\nTESTING MEDIA FILENAME PARSER - ALL STAGES"
+    header += "\n" + "="*60
+    all_output.append(header)
+
+    for test in test_cases:
+        with capture_output() as captured:
+            process_filename(test)
+        all_output.append(captured.getvalue())
+
+    # Stage timing over the test cases (timings vary from run to run)
+    PIPELINE.timing = True
+    PIPELINE.reset_stats()
+    for _ in range(200):
+        for test in test_cases:
+            process_filename(test, debug=False)
+    PIPELINE.timing = False
+    timing = "\nStage timing (200 x test cases):\n" + PIPELINE.report()
+    all_output.append(timing)
+
+    # Write to file
+    with open(output_filename, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(all_output))
+
+    print("\n" + "="*60)
+    print("TESTING MEDIA FILENAME PARSER - ALL STAGES")
+    print("="*60)
+
+    for test in test_cases:
+        process_filename(test)
+
+    print(timing)
+
+if __name__ == "__main__":
+    test_parser()
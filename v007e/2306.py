@@ -9,14 +9,18 @@ Enhanced media filename parser with:
 - logging for debug (logger.debug/info)
 - careful heuristics to avoid misclassifying large numbers or years as episodes
 - test harness using your example filenames
+- optional per-extractor timing / hit-rate counters (--stats or EXTRACTOR_STATS=1)
 
 Keep iterating — this file prints detailed notes for each extractor that matches.
 """
 
+import os
 import re
+import sys
+import time
 import logging
 from dataclasses import dataclass, asdict, field
-from typing import Optional, Tuple, List
+from typing import Callable, Dict, Optional, Tuple, List
 
 # -------------------- Logging Setup --------------------
 logger = logging.getLogger(__name__)
@@ -137,8 +141,8 @@ def extract_release_group(left: str, right: str) -> Tuple[Optional[str], str, st
             group = m.group(0)
             logger.info("ReleaseGroupExtractor: matched known group %s", group)
             # remove from left/right if present
-            new_left = re.sub(pat, "", left, flags=re.I).strip()
-            new_right = re.sub(pat, "", right, flags=re.I).strip()
+            new_left = pat.sub("", left).strip()
+            new_right = pat.sub("", right).strip()
             return group, _clean_separators(new_left), _clean_separators(new_right), 'ReleaseGroupExtractor'
     # Bracket heuristics on right
     r_brackets = RE_BRACKET_GROUP.findall(right)
@@ -285,6 +289,64 @@ def extract_movie_year(right_text: str, left_text: str) -> Tuple[Optional[str],
     logger.debug("MovieYearExtractor: no match")
     return None, rt, lt, None
 
+# -------------------- Instrumentation --------------------
+
+class ExtractorStats:
+    """Call counts, hits and per-call times (monotonic ns clock) of wrapped extractors."""
+
+    def __init__(self):
+        self.calls: Dict[str, List[int]] = {}   # name -> per-call durations in ns
+        self.hits: Dict[str, int] = {}
+
+    def wrap(self, name: str, func: Callable) -> Callable:
+        times = self.calls.setdefault(name, [])
+        self.hits.setdefault(name, 0)
+        clock = time.perf_counter_ns
+        hits = self.hits
+
+        def timed(*args, **kwargs):
+            start = clock()
+            result = func(*args, **kwargs)
+            times.append(clock() - start)
+            if result[0] is not None:  # every extractor returns (match or None, ...)
+                hits[name] += 1
+            return result
+        timed.__wrapped__ = func
+        return timed
+
+    def reset(self) -> None:
+        for name, times in self.calls.items():
+            times.clear()  # the wrappers hold these lists
+            self.hits[name] = 0
+
+    def report(self) -> str:
+        """One line per extractor, most total time first."""
+        lines = [f"{'extractor':<26}{'calls':>8}{'hits':>8}{'hit%':>7}{'total ms':>10}"
+                 f"{'mean us':>9}{'p50 us':>8}{'p95 us':>8}{'p99 us':>8}"]
+        for name, times in sorted(self.calls.items(), key=lambda kv: -sum(kv[1])):
+            n = len(times)
+            if not n:
+                continue
+            ordered = sorted(times)
+            pct = lambda q: ordered[int(q * (n - 1))] / 1000
+            lines.append(f"{name:<26}{n:>8}{self.hits[name]:>8}{100 * self.hits[name] / n:>7.1f}"
+                         f"{sum(times) / 1e6:>10.2f}{sum(times) / n / 1000:>9.2f}"
+                         f"{pct(0.5):>8.2f}{pct(0.95):>8.2f}{pct(0.99):>8.2f}")
+        return "\n".join(lines)
+
+
+EXTRACTORS = ("extract_resolution", "extract_release_group", "extract_anime_episode",
+              "extract_tv_show", "extract_movie_year")
+
+
+def enable_stats() -> ExtractorStats:
+    """Replace the module's extractors with timed wrappers (extractor_pipeline looks them up at call time)."""
+    stats = ExtractorStats()
+    g = globals()
+    for name in EXTRACTORS:
+        g[name] = stats.wrap(name, getattr(g[name], "__wrapped__", g[name]))
+    return stats
+
 # -------------------- Main Pipeline --------------------
 
 def extractor_pipeline(filename: str) -> ParseResult:
@@ -374,6 +436,7 @@ def extractor_pipeline(filename: str) -> ParseResult:
 # -------------------- Test harness --------------------
 
 if __name__ == '__main__':
+    stats = enable_stats() if ("--stats" in sys.argv or os.getenv("EXTRACTOR_STATS") == "1") else None
     # set logger to debug for full trace during tests
     logger.setLevel(logging.DEBUG)
 
@@ -405,3 +468,13 @@ if __name__ == '__main__':
         if d['notes']:
             print('Notes: ' + '; '.join(d['notes']))
         print('=' * 80)
+
+    if stats is not None:
+        # time a quiet batch (logging off) so the numbers are the extractors' own cost
+        logger.setLevel(logging.WARNING)
+        stats.reset()
+        for _ in range(500):
+            for t in tests:
+                extractor_pipeline(t)
+        print(f"\nExtractor stats ({500 * len(tests)} names):")
+        print(stats.report())
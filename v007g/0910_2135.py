@@ -26,16 +26,45 @@ def extract_anime_group(name):
     return None, None
 
 
+# Episode forms of extract_anime_episode, best first: the first form found
+# anywhere wins, and its last occurrence is the episode.
+ANIME_EPISODE_FORMS = (
+    re.compile(r"(?:\b|_)(?:EP\.?\s?)(\d{2,3})(?:v\d+)?(?:\b|_)", re.I),     # Ep.20, Ep02v2
+    re.compile(r"[\s\-_.](\d{2,3})(?:v\d+)?(?=\s|\[|\(|$|\.)"),            # " - 05"
+)
+_DIGIT_RUN_RE = re.compile(r"\d{2,}")
+
+
 def extract_anime_episode(name):
     # Match various episode formats: 01, 02, Ep02, Ep.20, Ep02v2, etc.
-    # Use right-to-left search to find the last episode number
-    matches = list(re.finditer(r"(?:\b|_)(?:EP\.?\s?)(\d{2,3})(?:v\d+)?(?:\b|_)", name, re.I))
-    if not matches:
-        matches = list(re.finditer(r"[\s\-_.](\d{2,3})(?:v\d+)?(?=\s|\[|\(|$|\.)", name))
-    
-    if matches:
-        # Get the last match (rightmost episode)
-        last_match = matches[-1]
+    # One right-to-left pass over the runs of 2+ digits: each form is only
+    # tried (anchored) where it can start; the first Ep form found ends it.
+    found, best = None, len(ANIME_EPISODE_FORMS)
+    for run in reversed(list(_DIGIT_RUN_RE.finditer(name))):
+        d, e = run.span()
+        if e - d > 3:
+            continue
+        if "p" in name[max(d - 3, 0):d].lower():
+            for start in range(max(d - 5, 0), d - 1):  # "_Ep. 20" .. "Ep20"
+                match = ANIME_EPISODE_FORMS[0].match(name, start)
+                if match:
+                    found, best = match, 0
+                    break
+            if best == 0:
+                break
+        if found is None and d > 0:
+            found = ANIME_EPISODE_FORMS[1].match(name, d - 1)
+            if found:
+                best = 1
+
+    if found:
+        last_match = found
+        # an Ep form taking a trailing "_" can swallow the next one's leading
+        # "_", so finditer wouldn't end on the rightmost one
+        start = last_match.start()
+        if best == 0 and start > 0 and name[start] == "_" and name[start - 1].isdecimal():
+            for last_match in ANIME_EPISODE_FORMS[0].finditer(name):
+                pass
         ep_str = last_match.group(1)  # Keep original string format
         print(f"[AnimeEpisodeExtractor] Matched: {ep_str}")
         return ep_str, f"found anime episode: {ep_str}"
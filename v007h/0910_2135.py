@@ -26,24 +26,71 @@ def extract_anime_group(name):
     return None, None
 
 
+# Episode forms of extract_anime_episode, best first: the first form found
+# anywhere wins, and its last occurrence is the episode.
+ANIME_EPISODE_FORMS = (
+    (re.compile(r"(?:\b|_)(?:EP\.?\s?)(\d{2,3})(?:v\d+)?(?:\b|_)", re.I), "ep"),     # Ep.20, Ep02v2
+    (re.compile(r"[\s\-_.](\d{2,3})(?:v\d+)?(?=\s|\[|\(|$|\.)"), "sep"),            # " - 05"
+    (re.compile(r"(\d{2,3}-\d{2,3})"), "range"),                                    # 001-500
+    (re.compile(r"(?:EP\.?\s?)(\d{2,3})(v\d+)", re.I), "ep"),                        # xEp02v2
+)
+_DIGIT_RUN_RE = re.compile(r"\d{2,}")
+
+
+def _overlaps_previous(name, start, kind):
+    """
+    Whether an earlier occurrence of a form could cover start, so that
+    finditer wouldn't end on the rightmost one: an ep form taking a
+    trailing "_" that is the next one's leading "_", or ranges sharing
+    digits ("01-02-03").
+    """
+    if start == 0 or kind == "sep":
+        return False
+    if kind == "range":
+        return name[start - 1].isdecimal() or name[start - 1] == "-"
+    return name[start] == "_" and name[start - 1].isdecimal()
+
+
 def extract_anime_episode(name):
-    # Match various episode formats: 01, 02, Ep02, Ep.20, Ep02v2, 001-500, etc.
-    # Use right-to-left search to find the last episode number
-    matches = list(re.finditer(r"(?:\b|_)(?:EP\.?\s?)(\d{2,3})(?:v\d+)?(?:\b|_)", name, re.I))
-    if not matches:
-        matches = list(re.finditer(r"[\s\-_.](\d{2,3})(?:v\d+)?(?=\s|\[|\(|$|\.)", name))
-    
-    # Also check for episode ranges like 001-500
-    if not matches:
-        matches = list(re.finditer(r"(\d{2,3}-\d{2,3})", name))
-    
-    # Also check for versioned episodes like Ep02v2
-    if not matches:
-        matches = list(re.finditer(r"(?:EP\.?\s?)(\d{2,3})(v\d+)", name, re.I))
-    
-    if matches:
-        # Get the last match (rightmost episode)
-        last_match = matches[-1]
+    # Match various episode formats: 01, 02, Ep02, Ep.20, Ep02v2, etc.
+    # One right-to-left pass over the runs of 2+ digits. For each run a form
+    # is only tried (anchored) where it can start, and once one is found only
+    # better forms are still looked for further left.
+    found, best = None, len(ANIME_EPISODE_FORMS)
+    for run in reversed(list(_DIGIT_RUN_RE.finditer(name))):
+        d, e = run.span()
+        after = name[e:e + 1]
+        candidates = []  # (form, start positions), by form
+        if e - d <= 3:
+            ep = "p" in name[max(d - 3, 0):d].lower()
+            if ep:
+                candidates.append((0, range(max(d - 5, 0), d - 1)))  # "_Ep. 20" .. "Ep20"
+            if d > 0:
+                candidates.append((1, (d - 1,)))
+            if after == "-":
+                candidates.append((2, (d, d + 1) if e - d == 3 else (d,)))
+            if ep and after in ("v", "V"):
+                candidates.append((3, range(max(d - 4, 0), d - 1)))
+        elif after == "-":
+            candidates.append((2, (e - 3, e - 2)))  # "1080-200" -> "080-200"
+        for i, starts in candidates:
+            if i >= best:
+                break
+            pattern = ANIME_EPISODE_FORMS[i][0]
+            for start in starts:
+                match = pattern.match(name, start)
+                if match:
+                    found, best = match, i
+                    break
+        if best == 0:
+            break
+
+    if found:
+        last_match = found
+        pattern, kind = ANIME_EPISODE_FORMS[best]
+        if _overlaps_previous(name, last_match.start(), kind):
+            for last_match in pattern.finditer(name):
+                pass
         # Handle versioned episodes (like Ep02v2)
         if len(last_match.groups()) > 1 and last_match.group(2):
             ep_str = last_match.group(1) + last_match.group(2)  # Include version
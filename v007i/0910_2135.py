@@ -1,4 +1,7 @@
+import os
 import re
+import sys
+import time
 
 # --- Extractors ---
 
@@ -26,32 +29,74 @@ def extract_anime_group(name):
     return None, None
 
 
+# Episode forms of extract_anime_episode, best first: the first form found
+# anywhere wins, and its last occurrence is the episode.
+ANIME_EPISODE_FORMS = (
+    (re.compile(r"(?:\b|_)(?:EP\.?\s?)(\d{2,3})(v\d+)(?:\b|_)", re.I), "ep"),        # Ep02v2
+    (re.compile(r"(?:\b|_)(?:EP\.?\s?)(\d{2,3})(?:v\d+)?(?:\b|_)", re.I), "ep"),     # Ep.20
+    (re.compile(r"[\s\-_.](\d{2,3})(?:v\d+)?(?=\s|\[|\(|$|\.)"), "sep"),            # " - 05"
+    (re.compile(r"(\d{2,3}-\d{2,3})"), "range"),                                    # 001-500
+    (re.compile(r"(?:\b|_)(\d{2,3})(v\d+)(?:\b|_)", re.I), "version"),              # 02v2
+)
+_DIGIT_RUN_RE = re.compile(r"\d{2,}")
+
+
+def _overlaps_previous(name, start, kind):
+    """
+    Whether an earlier occurrence of a form could cover start, so that
+    finditer wouldn't end on the rightmost one: an ep/version form taking a
+    trailing "_" that is the next one's leading "_", or ranges sharing
+    digits ("01-02-03").
+    """
+    if start == 0 or kind == "sep":
+        return False
+    if kind == "range":
+        return name[start - 1].isdecimal() or name[start - 1] == "-"
+    return name[start] == "_" and name[start - 1].isdecimal()
+
+
 def extract_anime_episode(name):
     # Match various episode formats: 01, 02, Ep02, Ep.20, Ep02v2, 001-500, etc.
-    # Use right-to-left search to find the last episode number
-    
-    # First try to match versioned episodes like Ep02v2 (capture both episode and version)
-    matches = list(re.finditer(r"(?:\b|_)(?:EP\.?\s?)(\d{2,3})(v\d+)(?:\b|_)", name, re.I))
-    
-    # If no versioned episodes found, try regular episodes with optional version
-    if not matches:
-        matches = list(re.finditer(r"(?:\b|_)(?:EP\.?\s?)(\d{2,3})(?:v\d+)?(?:\b|_)", name, re.I))
-    
-    # If still no matches, try standalone episode numbers
-    if not matches:
-        matches = list(re.finditer(r"[\s\-_.](\d{2,3})(?:v\d+)?(?=\s|\[|\(|$|\.)", name))
-    
-    # Also check for episode ranges like 001-500
-    if not matches:
-        matches = list(re.finditer(r"(\d{2,3}-\d{2,3})", name))
-    
-    # Also check for versioned episodes without Ep prefix
-    if not matches:
-        matches = list(re.finditer(r"(?:\b|_)(\d{2,3})(v\d+)(?:\b|_)", name, re.I))
-    
-    if matches:
-        # Get the last match (rightmost episode)
-        last_match = matches[-1]
+    # One right-to-left pass over the runs of 2+ digits. For each run a form
+    # is only tried (anchored) where it can start, and once one is found only
+    # better forms are still looked for further left.
+    found, best = None, len(ANIME_EPISODE_FORMS)
+    for run in reversed(list(_DIGIT_RUN_RE.finditer(name))):
+        d, e = run.span()
+        after = name[e:e + 1]
+        candidates = []  # (form, start positions), by form
+        if e - d <= 3:
+            versioned = after in ("v", "V")
+            if "p" in name[max(d - 3, 0):d].lower():
+                # starts up to 5 chars before the digits ("_Ep. 20"); with a
+                # version only Ep02v2 is tried, Ep.20 can't match where it doesn't
+                candidates.append((0 if versioned else 1, range(max(d - 5, 0), d - 1)))
+            if d > 0:
+                candidates.append((2, (d - 1,)))
+            if after == "-":
+                candidates.append((3, (d, d + 1) if e - d == 3 else (d,)))
+            if versioned:
+                candidates.append((4, (d - 1, d) if d > 0 else (d,)))
+        elif after == "-":
+            candidates.append((3, (e - 3, e - 2)))  # "1080-200" -> "080-200"
+        for i, starts in candidates:
+            if i >= best:
+                break
+            pattern = ANIME_EPISODE_FORMS[i][0]
+            for start in starts:
+                match = pattern.match(name, start)
+                if match:
+                    found, best = match, i
+                    break
+        if best == 0:
+            break
+
+    if found:
+        last_match = found
+        pattern, kind = ANIME_EPISODE_FORMS[best]
+        if _overlaps_previous(name, last_match.start(), kind):
+            for last_match in pattern.finditer(name):
+                pass
         # Handle versioned episodes (like Ep02v2 or 02v2)
         if len(last_match.groups()) > 1 and last_match.group(2):
             ep_str = last_match.group(1) + last_match.group(2)  # Include version (02v2)
@@ -70,6 +115,63 @@ def extract_tv(name):
     return None, None
 
 
+# --- Instrumentation (python 0910_2135.py --stats, or EXTRACTOR_STATS=1) ---
+
+class ExtractorStats:
+    """Per-extractor call counts, hits and call times from time.perf_counter_ns."""
+
+    def __init__(self):
+        self.calls = {}  # name -> list of call durations (ns)
+        self.hits = {}
+
+    def wrap(self, name, func):
+        times = self.calls.setdefault(name, [])
+        self.hits.setdefault(name, 0)
+        hits = self.hits
+        clock = time.perf_counter_ns
+
+        def timed(*args, **kwargs):
+            start = clock()
+            result = func(*args, **kwargs)
+            times.append(clock() - start)
+            if result[0] is not None:  # extractors return (value or None, note)
+                hits[name] += 1
+            return result
+        timed.__wrapped__ = func
+        return timed
+
+    def reset(self):
+        for name, times in self.calls.items():
+            times.clear()
+            self.hits[name] = 0
+
+    def report(self):
+        lines = [f"{'extractor':<24}{'calls':>8}{'hits':>8}{'hit%':>7}{'total ms':>10}"
+                 f"{'mean us':>9}{'p50 us':>8}{'p95 us':>8}{'p99 us':>8}"]
+        for name, times in sorted(self.calls.items(), key=lambda kv: -sum(kv[1])):
+            n = len(times)
+            if not n:
+                continue
+            ordered = sorted(times)
+            pct = lambda q: ordered[int(q * (n - 1))] / 1000
+            lines.append(f"{name:<24}{n:>8}{self.hits[name]:>8}{100 * self.hits[name] / n:>7.1f}"
+                         f"{sum(times) / 1e6:>10.2f}{sum(times) / n / 1000:>9.2f}"
+                         f"{pct(0.5):>8.2f}{pct(0.95):>8.2f}{pct(0.99):>8.2f}")
+        return "\n".join(lines)
+
+
+EXTRACTORS = ("extract_resolution", "extract_year", "extract_anime_group", "extract_anime_episode", "extract_tv")
+
+
+def enable_stats():
+    """Swap the extractors for timed wrappers; parse_filename picks them up by name."""
+    stats = ExtractorStats()
+    g = globals()
+    for name in EXTRACTORS:
+        g[name] = stats.wrap(name, getattr(g[name], "__wrapped__", g[name]))
+    return stats
+
+
 # --- Main Parser ---
 
 def parse_filename(name):
@@ -250,3 +352,15 @@ if __name__ == "__main__":
     # Also print to console
     for s in samples:
         parse_filename(s)
+
+    if "--stats" in sys.argv or os.getenv("EXTRACTOR_STATS") == "1":
+        stats = enable_stats()
+        # extractors print every hit; send that to devnull so only extractor time is measured
+        with open(os.devnull, "w") as devnull:
+            sys.stdout = devnull
+            for _ in range(500):
+                for s in samples:
+                    parse_filename(s)
+            sys.stdout = original_stdout
+        print(f"\nExtractor stats ({500 * len(samples)} names):")
+        print(stats.report())